@@ -0,0 +1,44 @@
+# Jacques Terblanche
+# 22548602
+
+# Resident Abaqus CAE worker, started once with: abaqus cae -noGUI Abaqus_server.py -- <spool path>
+# The worker claims jobs from the spool directory and runs Abaqus_script.py within each job directory (building,
+# meshing, submitting and extracting the results), resetting the model database between jobs. The CAE startup,
+# license checkout and kernel initialisation are therefore only paid once per worker.
+
+from abaqus import *
+import os
+import sys
+
+# The location of this script (Abaqus does not reliably define __file__) and the spool path (after "--")
+server_path = [arg for arg in sys.argv if arg.endswith('Abaqus_server.py')][0]
+script_dir = os.path.dirname(os.path.abspath(server_path))
+spool_path = sys.argv[-1]
+
+# The spool protocol and the job results are shared with the evolution script
+sys.path.insert(0, os.path.dirname(script_dir))
+import spool
+import fem_results
+
+abaqus_script_path = os.path.join(script_dir, 'Abaqus_script.py')
+with open(abaqus_script_path) as f:
+    abaqus_script = compile(f.read(), abaqus_script_path, 'exec')
+
+
+def evaluate_job(job_dir):
+    # The script works with relative paths, therefore it is run from within the job directory
+    os.chdir(job_dir)
+    try:
+        exec(abaqus_script, {'__name__': '__main__'})
+    finally:
+        # The model database and any open output databases are reset, so that no state is carried over to the next job
+        for name in list(session.odbs.keys()):
+            session.odbs[name].close()
+        Mdb()
+        os.chdir(script_dir)
+
+    # Resultant angle is read from the generated results (the last angle of the recorded trajectory)
+    return fem_results.read_angle(job_dir)
+
+
+spool.serve(spool_path, evaluate_job)
@@ -0,0 +1,209 @@
+# Jacques Terblanche
+# 22548602
+
+# Append-only archive of the exported designs of a run. All coordinates are packed into a single float32 buffer
+# (coords.f32, [x, y] per point) and each stored design is recorded in an index (index.bin) of fixed-size records:
+# (population number, generation number, geometry hash, offset, number of points), where the offset and number of
+# points refer to the coordinate buffer. Identical geometries share their coordinates. Both files are only appended
+# to, therefore an interrupted run leaves a readable archive (a partially written record is ignored). The writes are
+# performed by the artifact writer (see artifacts.py), which is flushed before the archive is read.
+#
+# A single design is written in the JSON format read by Abaqus_script.py with:
+#   python archive.py <archive folder> <population number> <generation number> [output path]
+
+import os
+import sys
+import json
+import hashlib
+import threading
+import numpy as np
+import artifacts
+
+coords_name = 'coords.f32'
+index_name = 'index.bin'
+index_dtype = np.dtype([('pop_number', '<i4'), ('gen_number', '<i4'), ('geometry_hash', 'S20'), ('offset', '<i8'),
+                        ('num_points', '<i4')])
+
+
+class CoordinateArchive:
+    """
+    A CoordinateArchive class that appends exported designs to a run's coordinate archive and provides memory-mapped
+    (zero-copy) access to the stored designs
+
+    Attributes
+    ----------
+    path : str
+        The folder containing the archive's files
+    coords_path : str
+        The packed float32 coordinate buffer
+    index_path : str
+        The index of the stored designs
+
+    Methods
+    ----------
+    load()
+        Reads the stored geometries and the size of the coordinate buffer (removing partially written items)
+    append(pop_number, gen_number, coords)
+        Stores the coordinates of a design and returns its index record
+    map(path, dtype, item_size)
+        Returns a read-only memory map of a file
+    index()
+        Returns the (memory-mapped) index records of all stored designs
+    coordinates()
+        Returns the (memory-mapped) coordinate buffer as an array of points
+    read(pop_number, gen_number)
+        Returns the coordinates of a stored design
+    find(geometry_hash)
+        Returns the index records of all designs with the geometry
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            The folder containing the archive's files (created if it does not exist)
+        """
+        self.path = os.path.abspath(path)
+        self.coords_path = os.path.join(path, coords_name)
+        self.index_path = os.path.join(path, index_name)
+        self.lock = threading.Lock()
+        self.size = None
+        self.offsets = {}
+        self.maps = {}
+
+    def load(self):
+        """
+        Reads the stored geometries (to share the coordinates of identical designs) and the size of the buffer
+        """
+        artifacts.flush()
+        # Points or a record partially written by an interrupted run are removed before anything is appended
+        for path, item_size in ((self.coords_path, 8), (self.index_path, index_dtype.itemsize)):
+            if os.path.exists(path) and os.path.getsize(path) % item_size:
+                os.truncate(path, os.path.getsize(path) - os.path.getsize(path) % item_size)
+        self.offsets = {}
+        for record in self.index():
+            self.offsets[bytes(record['geometry_hash'])] = (int(record['offset']), int(record['num_points']))
+        self.size = os.path.getsize(self.coords_path) if os.path.exists(self.coords_path) else 0
+        self.maps = {}
+
+    def append(self, pop_number, gen_number, coords):
+        """
+        Stores the coordinates (mm) of a design and returns its index record. The coordinates are only appended if
+        the geometry has not been stored before
+        """
+        points = np.ascontiguousarray(coords, dtype='<f4').reshape(-1, 2)
+        geometry_hash = bytes.fromhex(design_hash(points))
+
+        with self.lock:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            # The stored geometries are read once, after which the archive keeps track of its own appends
+            if self.size is None:
+                self.load()
+
+            if geometry_hash not in self.offsets:
+                artifacts.append(self.coords_path, points.tobytes())
+                self.offsets[geometry_hash] = (self.size // points.itemsize // 2, len(points))
+                self.size += points.nbytes
+            offset, num_points = self.offsets[geometry_hash]
+
+            # The record is only written once its coordinates are stored
+            record = np.array([(pop_number, gen_number, geometry_hash, offset, num_points)], dtype=index_dtype)
+            artifacts.append(self.index_path, record.tobytes())
+        return record[0]
+
+    def map(self, path, dtype, item_size):
+        """
+        Returns a read-only memory map of the complete items of a file (mapped again only if the file has grown)
+        """
+        artifacts.flush()
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        count = size // item_size
+        if path not in self.maps or len(self.maps[path]) != count:
+            if count == 0:
+                self.maps[path] = np.zeros(0, dtype=dtype)
+            else:
+                self.maps[path] = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+        return self.maps[path]
+
+    def index(self):
+        """
+        Returns the (memory-mapped) index records of all stored designs, in the order in which they were stored
+        """
+        return self.map(self.index_path, index_dtype, index_dtype.itemsize)
+
+    def coordinates(self):
+        """
+        Returns the (memory-mapped) coordinate buffer as an array of [x, y] points
+        """
+        return self.map(self.coords_path, np.dtype(('<f4', 2)), 8)
+
+    def read(self, pop_number, gen_number):
+        """
+        Returns the coordinates of a stored design as a view of the coordinate buffer (the most recently stored
+        design if the individual was stored more than once, None if it was not stored)
+        """
+        index = self.index()
+        matches = np.flatnonzero((index['pop_number'] == pop_number) & (index['gen_number'] == gen_number))
+        if len(matches) == 0:
+            return None
+        record = index[matches[-1]]
+        return self.coordinates()[record['offset']:record['offset'] + record['num_points']]
+
+    def find(self, geometry_hash):
+        """
+        Returns the index records of all designs with the geometry (a hexadecimal or binary hash)
+        """
+        if isinstance(geometry_hash, str):
+            geometry_hash = bytes.fromhex(geometry_hash)
+        index = self.index()
+        return index[index['geometry_hash'] == geometry_hash]
+
+
+def design_hash(coords):
+    """
+    Returns the (hexadecimal) geometry hash of a design's coordinates, as stored in the archive's index
+    """
+    return hashlib.sha1(np.ascontiguousarray(coords, dtype='<f4').reshape(-1, 2).tobytes()).hexdigest()
+
+
+# Archives opened by this process, shared between threads
+archives = {}
+archives_lock = threading.Lock()
+
+
+def shared_archive(path):
+    """
+    Returns the archive of the folder opened by this process (opening it if necessary)
+    """
+    with archives_lock:
+        if path not in archives:
+            archives[path] = CoordinateArchive(path)
+        return archives[path]
+
+
+def clear_archive(path):
+    """
+    Removes the archive's files from the folder
+    """
+    for name in (coords_name, index_name):
+        if os.path.exists(os.path.join(path, name)):
+            os.remove(os.path.join(path, name))
+
+
+def export_json(path, pop_number, gen_number, output_path):
+    """
+    Writes a stored design to a JSON file in the format read by Abaqus_script.py (input_data.json), where the float32
+    coordinates are rounded to 0.1 micrometre
+    """
+    coords = CoordinateArchive(path).read(pop_number, gen_number)
+    if coords is None:
+        raise KeyError("Individual" + str(pop_number) + "_" + str(gen_number) + " is not stored in " + path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(np.round(coords.astype(float), 4).tolist(), f, ensure_ascii=False, indent=4)
+
+
+if __name__ == '__main__':
+    export_json(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]),
+                sys.argv[4] if len(sys.argv) > 4 else 'input_data.json')
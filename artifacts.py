@@ -0,0 +1,273 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import queue
+import atexit
+import threading
+
+
+class ArtifactWriter:
+    """
+    An ArtifactWriter class that writes artifacts (images, coordinates and log lines) to absolute paths. In the
+    background mode the writes are placed in a bounded queue and performed by a writer thread in batches, therefore
+    the evolution does not wait on the file system (a full queue makes the caller wait until the writer catches up).
+    Otherwise (or in a forked worker process, which has no writer thread) every write is performed immediately.
+
+    Attributes
+    ----------
+    background : bool
+        Whether the writes are performed by a background thread
+    max_pending : int
+        The number of writes that can be queued before the caller waits
+    batch_size : int
+        The largest number of queued writes performed at once (appends to the same file are combined)
+    fsync : str
+        "never" (left to the operating system), "batch" (each file is synced after every batch) or "always" (each
+        file is synced after every write)
+    error : Exception
+        The first error of a background write (raised by the next flush or close)
+
+    Methods
+    ----------
+    write(path, data)
+        Writes the data (bytes or str) to a file, replacing its contents
+    append(path, data)
+        Appends the data (bytes or str) to a file
+    flush()
+        Waits until all queued writes have been performed
+    close()
+        Performs all queued writes and stops the writer thread
+    """
+
+    def __init__(self, background=False, max_pending=256, batch_size=64, fsync="never"):
+        """
+        Parameters
+        ----------
+        background : bool, optional
+            Performs the writes in a background thread (Default is False, every write is performed immediately)
+        max_pending : int, optional
+            The number of writes that can be queued before the caller waits (Default is 256)
+        batch_size : int, optional
+            The largest number of queued writes performed at once (Default is 64)
+        fsync : str, optional
+            The sync policy, "never", "batch" or "always" (Default is "never")
+        """
+        if fsync not in ("never", "batch", "always"):
+            raise ValueError("Unknown fsync policy: " + str(fsync))
+        self.background = background
+        self.max_pending = max_pending
+        self.batch_size = max(1, int(batch_size))
+        self.fsync = fsync
+        self.error = None
+        self.pid = os.getpid()
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self.run, name="artifact-writer", daemon=True)
+            self.thread.start()
+
+    def write(self, path, data):
+        """
+        Writes the data to the file at the absolute path, replacing its contents
+        """
+        self.submit(path, data, "w")
+
+    def append(self, path, data):
+        """
+        Appends the data to the file at the absolute path
+        """
+        self.submit(path, data, "a")
+
+    def submit(self, path, data, mode):
+        """
+        Queues a write (or performs it immediately if there is no writer thread in this process)
+        """
+        if not os.path.isabs(path):
+            raise ValueError("Artifacts are written to absolute paths only: " + str(path))
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self.thread is None or self.pid != os.getpid():
+            self.perform([(path, data, mode)])
+        else:
+            self.queue.put((path, data, mode))
+
+    def run(self):
+        """
+        Performs the queued writes in batches until the writer is closed (a None item)
+        """
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not None]
+            # Any error of a write is kept (to be raised by the next flush or close) rather than ending the thread,
+            # otherwise the queued writes would never be performed and flush (or a full queue) would wait forever
+            try:
+                self.perform(items)
+            except Exception as error:
+                if self.error is None:
+                    self.error = error
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if len(items) < len(batch):
+                return
+
+    def perform(self, items):
+        """
+        Performs a batch of writes. Consecutive appends to the same file are combined into a single write
+        """
+        written = []
+        k = 0
+        while k < len(items):
+            path, data, mode = items[k]
+            k += 1
+            chunks = [data]
+            while mode == "a" and k < len(items) and items[k][0] == path and items[k][2] == "a":
+                chunks.append(items[k][1])
+                k += 1
+
+            with open(path, "ab" if mode == "a" else "wb") as f:
+                f.write(b"".join(chunks))
+                if self.fsync == "always":
+                    f.flush()
+                    os.fsync(f.fileno())
+            if path not in written:
+                written.append(path)
+
+        # Each file written in the batch is synced once
+        if self.fsync == "batch":
+            for path in written:
+                with open(path, "ab") as f:
+                    os.fsync(f.fileno())
+
+    def flush(self):
+        """
+        Waits until all queued writes have been performed and raises the first error of a background write
+        """
+        if self.thread is not None and self.pid == os.getpid():
+            self.queue.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        """
+        Performs all queued writes and stops the writer thread
+        """
+        if self.thread is not None and self.pid == os.getpid():
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
+class LogStream:
+    """
+    A file-like LogStream class that sends the printed output (e.g. sys.stdout) to a log file through the artifact
+    writer, where complete lines are written
+
+    Attributes
+    ----------
+    path : str
+        The absolute path to the log file
+
+    Methods
+    ----------
+    write(text)
+        Writes the text (complete lines are passed to the artifact writer)
+    flush()
+        Passes any incomplete line to the artifact writer
+    close()
+        Passes any incomplete line to the artifact writer
+    """
+
+    def __init__(self, path, append=False):
+        """
+        Parameters
+        ----------
+        path : str
+            The path to the log file
+        append : bool, optional
+            Appends to an existing log file (Default is False, the log file is replaced)
+        """
+        self.path = os.path.abspath(path)
+        self.partial = ""
+        self.lock = threading.Lock()
+        if not append:
+            writer.write(self.path, "")
+
+    def write(self, text):
+        """
+        Writes the text, where complete lines are passed to the artifact writer
+        """
+        with self.lock:
+            lines, _, self.partial = (self.partial + text).rpartition("\n")
+            if lines:
+                writer.append(self.path, lines + "\n")
+        return len(text)
+
+    def flush(self):
+        """
+        Passes any incomplete line to the artifact writer
+        """
+        with self.lock:
+            if self.partial:
+                writer.append(self.path, self.partial)
+                self.partial = ""
+
+    def close(self):
+        """
+        Passes any incomplete line to the artifact writer
+        """
+        self.flush()
+
+
+def configure(background=False, max_pending=256, batch_size=64, fsync="never"):
+    """
+    Replaces the artifact writer used by all modules (performing the writes queued by the previous writer) and
+    returns it
+    """
+    global writer
+    writer.close()
+    writer = ArtifactWriter(background, max_pending, batch_size, fsync)
+    return writer
+
+
+def write(path, data):
+    """
+    Writes the data to the file at the absolute path using the configured writer
+    """
+    writer.write(path, data)
+
+
+def append(path, data):
+    """
+    Appends the data to the file at the absolute path using the configured writer
+    """
+    writer.append(path, data)
+
+
+def flush():
+    """
+    Waits until the configured writer has performed all queued writes
+    """
+    writer.flush()
+
+
+def close():
+    """
+    Performs all queued writes of the configured writer and stops its thread
+    """
+    writer.close()
+
+
+# The artifact writer used by all modules (writing immediately until configured), queued writes are performed at exit
+writer = ArtifactWriter()
+atexit.register(close)
@@ -0,0 +1,99 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import json
+import numpy as np
+
+# Initial shear modulus (MPa) of the Moldstar 15 Ogden model used by Abaqus_script.py (the sum of the mu_i terms),
+# along with the corresponding small-strain Young's modulus of the (incompressible) material
+ogden_mu = np.array([-6.50266e-06, 0.216863, 0.00137158])
+shear_modulus = ogden_mu.sum()
+youngs_modulus = 3 * shear_modulus
+
+# Number of positions along each cell at which the section stiffness is evaluated
+num_samples = 200
+
+
+def estimate_angle(export_data, parameters, stiffness_factor=1.0):
+    """
+    Estimates the bending angle (in degrees) of an actuator with the exported cell contour (mm) and the actuator
+    parameters (as in input_parameters.json), using a strain-limiting-layer beam model:
+
+    The pressure on the end walls of each chamber acts above the neutral axis of the actuator's section, resulting in
+    a moment that is resisted by the bottom (strain-limiting) layer and the chamber side walls. The curvature is
+    integrated along every cell and the angle between the fixed and free end nodes is measured from the resultant
+    circular arc (as done from the FEM results). Gravity acts along the actuator's length and is neglected.
+    """
+    coords = np.asarray(export_data, dtype=float)
+    cavity_total_depth, thickness, num_cells, bottom_cavity_height, bottom_thickness, pressure_load = parameters[:6]
+    num_cells = int(num_cells)
+
+    # The contour starts and ends at the base of the cell (y0), where the cell floor lies bottom_cavity_height below
+    x0, y0 = coords[0]
+    cell_width = coords[-1][0] - x0
+    pitch = cell_width + thickness / 2
+    floor = y0 - bottom_cavity_height
+
+    # The height of the outer contour at each sampled position (the highest contour point of each x value)
+    x = np.linspace(x0, x0 + pitch, num_samples)
+    unique_x, inverse = np.unique(coords[:, 0], return_inverse=True)
+    top = np.full(len(unique_x), -np.inf)
+    np.maximum.at(top, inverse, coords[:, 1])
+    outer = np.interp(x, unique_x, top, left=y0, right=y0)
+
+    # The chamber is offset inwards from the contour by the wall thickness and extends down to the floor. The cavity
+    # depth excludes the two outer side walls (each 1.5 times the wall thickness, see Abaqus_script.py)
+    inside = (x >= x0 + thickness) & (x <= x0 + cell_width - thickness)
+    cavity = np.where(inside, np.maximum(outer - thickness - floor, 0), 0)
+    cavity_depth = cavity_total_depth - 3 * thickness
+    side_walls = cavity_total_depth - cavity_depth
+
+    # The section at each position consists of the bottom layer (full depth), the material above the floor outside
+    # of the chamber (full depth, up to the outer contour) and the side walls next to the chamber (up to the contour)
+    solid_height = np.maximum(outer - floor, 0)
+    bottom = floor - bottom_thickness / 2
+    areas = [np.full(num_samples, cavity_total_depth * bottom_thickness),
+             np.where(inside, side_walls, cavity_total_depth) * solid_height]
+    centroids = [np.full(num_samples, bottom), floor + solid_height / 2]
+    second_moments = [cavity_total_depth * bottom_thickness ** 3 / 12 * np.ones(num_samples),
+                      areas[1] * solid_height ** 2 / 12]
+
+    # Neutral axis and second moment of area of each section (parallel axis theorem)
+    neutral_axis = (areas[0] * centroids[0] + areas[1] * centroids[1]) / (areas[0] + areas[1])
+    inertia = sum([second_moments[k] + areas[k] * (centroids[k] - neutral_axis) ** 2 for k in range(2)])
+
+    # The pressure on a chamber's end wall is uniform over its projected area (from the floor to the top of the
+    # chamber), the resultant moment is taken about the neutral axis of the section through the chamber's centre
+    chamber_height = cavity.max()
+    centre_axis = neutral_axis[np.argmax(cavity)]
+    moment = pressure_load * cavity_depth * ((floor + chamber_height - centre_axis) ** 2 -
+                                             (floor - centre_axis) ** 2) / 2
+
+    # The rotation of each cell is the integral of the curvature along the cell
+    curvature = moment / (stiffness_factor * youngs_modulus * inertia)
+    rotation = num_cells * np.sum((curvature[1:] + curvature[:-1]) / 2 * np.diff(x))
+
+    # The free end node follows a circular arc, the angle is measured between the end nodes
+    length = num_cells * pitch
+    if rotation <= 0:
+        return 0.0
+    dx = length * np.sin(rotation) / rotation
+    dy = length * (1 - np.cos(rotation)) / rotation
+    return float(np.degrees(np.arctan2(abs(dy), abs(dx))))
+
+
+def evaluate_analytical(job_dir):
+    """
+    Evaluates the design within the provided job directory with the beam model (instead of Abaqus CAE). The angle
+    is written to angle.txt, identical to the FEM evaluation
+    """
+    with open(os.path.join(job_dir, 'input_data.json'), 'r', encoding='utf-8') as f:
+        export_data = json.load(f)
+    with open(os.path.join(job_dir, 'input_parameters.json'), 'r', encoding='utf-8') as f:
+        parameters = json.load(f)
+
+    angle = estimate_angle(export_data, parameters)
+    with open(os.path.join(job_dir, 'angle.txt'), 'w') as f:
+        f.write(str(angle))
+    return angle
@@ -0,0 +1,304 @@
+# Jacques Terblanche
+# 22548602
+
+# Benchmarks of the generation pipeline's hot paths. Every benchmark runs on a corpus generated from fixed seeds, and
+# the results are written as JSON so that the timings of different versions can be compared
+
+import os
+import sys
+import json
+import time
+import timeit
+import random
+import platform
+import tempfile
+import subprocess
+import contextlib
+import numpy as np
+import l_syst
+import evolve
+from l_syst import Lsystem
+from l_syst import Interp
+from l_syst import get_repeated
+from l_syst import NoRenderer
+from evolve import Evolution
+from evolve import export_to_json
+from fem_pool import EvaluationPool
+
+###############
+# Parameters
+###############
+corpus_seed = 1000  # First seed of the fixed-seed corpora
+corpus_size = 50  # Number of individuals in each corpus
+target = [80, 160]  # Target of the interpreted cross-sections (width and height in pixels)
+repeat = 5  # Number of times each benchmark is repeated (the minimum and median are reported)
+solver_latency = 0.01  # s - Simulated duration of each stub FEM evaluation
+solver_workers = 1  # Number of stub evaluations run at once
+generation_size = 10  # Number of individuals per generation in the full generation benchmark
+import_modules = ["l_syst", "genetic", "builder", "evolve"]  # Modules whose import time is measured
+output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "benchmark.json")
+baseline_path = None  # Previous benchmark results to compare against (None for no comparison)
+
+
+class StubSolver:
+    """
+    A StubSolver class that stands in for the Abaqus evaluation of a job directory. It waits for the configured
+    latency and returns a repeatable angle derived from the exported design
+
+    Attributes
+    ----------
+    latency : float
+        The simulated duration (in seconds) of each evaluation
+    calls : int
+        The number of evaluations made
+
+    Methods
+    ----------
+    __call__(job_dir)
+        Evaluates the design in the job directory
+    """
+
+    def __init__(self, latency):
+        """
+        Parameters
+        ----------
+        latency : float
+            The simulated duration (in seconds) of each evaluation
+        """
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, job_dir):
+        """
+        Evaluates the design (input_data.json) in the job directory and writes the angle to angle.txt
+        """
+        with open(os.path.join(job_dir, 'input_data.json'), 'r', encoding='utf-8') as f:
+            coords = np.array(json.load(f))
+        time.sleep(self.latency)
+        self.calls += 1
+
+        # Taller and narrower cross-sections bend further
+        angle = 10 * coords[:, 1].mean() / max(coords[:, 0].max() - coords[:, 0].min(), 1e-3) + len(coords) * 0.01
+        with open(os.path.join(job_dir, 'angle.txt'), 'w') as f:
+            f.write(str(angle))
+        return angle
+
+
+def timed(name, function, number=None):
+    """
+    Times the function (repeat times, each with number calls) and returns the timing statistics per call. If the
+    number of calls is not provided, it is increased until a single repetition takes at least 0.2 seconds
+    """
+    timer = timeit.Timer(function)
+    if number is None:
+        number = timer.autorange()[0]
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    result = {"number": number,
+              "repeat": repeat,
+              "min": min(times),
+              "median": float(np.median(times)),
+              "mean": float(np.mean(times)),
+              "times": times}
+    print(name + ": " + str(round(result["min"] * 1000, 4)) + " ms (median " + str(round(result["median"] * 1000, 4))
+          + " ms)")
+    return result
+
+
+def bench_imports():
+    """
+    Benchmarks the import of each module in a fresh interpreter (the start-up cost paid by a spawned worker process
+    or a short-lived script), where the interpreter's own start-up is excluded
+    """
+    results = {}
+    for module in import_modules:
+        code = "import time; start = time.perf_counter(); import " + module + "; print(time.perf_counter() - start)"
+        times = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                    capture_output=True, text=True, check=True)
+            times.append(float(output.stdout.strip().splitlines()[-1]))
+        result = {"number": 1,
+                  "repeat": repeat,
+                  "min": min(times),
+                  "median": float(np.median(times)),
+                  "mean": float(np.mean(times)),
+                  "times": times}
+        print("import " + module + ": " + str(round(result["min"] * 1000, 4)) + " ms (median " +
+              str(round(result["median"] * 1000, 4)) + " ms)")
+        results["import " + module] = result
+    return results
+
+
+def build_corpus():
+    """
+    Generates the fixed-seed corpus of individuals and their interpretations
+    """
+    individuals = [Lsystem("A", corpus_seed + k) for k in range(corpus_size)]
+    positions = []
+    for individual in individuals:
+        temp = Interp(individual.sentence, target, individual.num_f)
+        positions.append(temp.draw(0, 0, NoRenderer()))
+    return individuals, positions
+
+
+def bench_generation(individuals):
+    """
+    Benchmarks the rewriting of the corpus' sentences
+    """
+    results = {}
+
+    def generate():
+        # The shared rewriters are cleared so that every sentence is rewritten from scratch
+        l_syst._cached_rewriter.cache_clear()
+        for individual in individuals:
+            individual.generate(8, individual.rules)
+
+    def form_string():
+        for individual in individuals:
+            Lsystem.form_string(individual.sentence, individual.rules)
+
+    results["Lsystem.generate"] = timed("Lsystem.generate", generate)
+    results["Lsystem.form_string"] = timed("Lsystem.form_string", form_string)
+    # generate() leaves every individual's sentence unchanged (the rules are not modified)
+    sentences = [individual.sentence for individual in individuals]
+    results["get_repeated"] = timed("get_repeated", lambda: [get_repeated(sentence, 3) for sentence in sentences])
+    return results
+
+
+def bench_interpretation(individuals):
+    """
+    Benchmarks the interpretation of the corpus' sentences and the neighbour checks of a single interpretation
+    """
+    results = {}
+    renderer = NoRenderer()
+
+    def draw():
+        for individual in individuals:
+            Interp(individual.sentence, target, individual.num_f).draw(0, 0, renderer)
+
+    results["Interp.draw"] = timed("Interp.draw", draw)
+
+    # Every location of the canvas (and its border) is checked against a fully drawn interpretation
+    temp = Interp(individuals[0].sentence, target, individuals[0].num_f)
+    temp.draw(0, 0, renderer)
+    locations = [(x, y) for x in range(-1, target[0] + 1) for y in range(-1, target[1] + 1)]
+    results["Interp.check_neighbours"] = timed("Interp.check_neighbours",
+                                               lambda: [temp.check_neighbours(pos) for pos in locations])
+    return results
+
+
+def bench_export(positions):
+    """
+    Benchmarks the export (contour simplification and mirroring) of the corpus' interpretations
+    """
+    result = timed("export_to_json", lambda: [export_to_json(list(coords), target, 0, k, report=False)
+                                              for k, coords in enumerate(positions)])
+    return {"export_to_json": result}
+
+
+def bench_variation(individuals):
+    """
+    Benchmarks the selection, crossover and mutation operators on a ranked corpus
+    """
+    results = {}
+    evo = Evolution(2, corpus_seed, target, 40, "A", 0.1, 0.2, render_mode="off")
+    pool = list(individuals)
+    for k, individual in enumerate(pool):
+        individual.angle = float(k % 60)
+    evo.rank(pool, report=False)
+
+    rng = random.Random(corpus_seed)
+    results["select_parents"] = timed("select_parents", lambda: [evo.select_parents(pool, 1 + k % 2, rng)
+                                                                 for k in range(len(pool))])
+    rng = random.Random(corpus_seed)
+    results["crossover"] = timed("crossover", lambda: [evo.crossover(pool[k], pool[-1 - k], rng)
+                                                       for k in range(len(pool))])
+    rng = random.Random(corpus_seed)
+    results["mutate"] = timed("mutate", lambda: [evo.mutate(individual, rng) for individual in pool])
+    return results
+
+
+def bench_evolution():
+    """
+    Benchmarks a full evolution (initial generation and one subsequent generation) against the stub solver, where
+    all files are written to a temporary folder
+    """
+    with tempfile.TemporaryDirectory() as path:
+        parameters_path = os.path.join(path, 'input_parameters.json')
+        with open(parameters_path, 'w', encoding='utf-8') as f:
+            json.dump([20, 1.4, 8, 6, 3, 0.04, 9810.0], f)
+        storage_path = evolve.abs_storage_path
+        evolve.abs_storage_path = path
+        solver = StubSolver(solver_latency)
+
+        def run():
+            evo = Evolution(2, corpus_seed, target, 40, "A", 0.1, 0.2, render_mode="off")
+            evo.pool = EvaluationPool(solver, solver_workers, os.path.join(path, 'Jobs'), parameters_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                evo.evolve(generation_size)
+
+        try:
+            result = timed("Evolution.evolve", run, number=1)
+        finally:
+            evolve.abs_storage_path = storage_path
+
+    result["solver_calls"] = solver.calls // repeat
+    result["solver_latency"] = solver_latency
+    return {"Evolution.evolve": result}
+
+
+def git_commit():
+    """
+    Returns the current git commit of the repository (None if not available)
+    """
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(baseline, current):
+    """
+    Prints the ratio of each benchmark's minimum time to that of the baseline (above 1 is slower)
+    """
+    print("Comparison with " + str(baseline.get("commit")))
+    for name, result in current["results"].items():
+        if name in baseline["results"]:
+            ratio = result["min"] / baseline["results"][name]["min"]
+            print(name + ": " + str(round(ratio, 3)) + "x")
+
+
+def run_benchmarks():
+    """
+    Runs all benchmarks and returns the results along with the environment in which they were run
+    """
+    individuals, positions = build_corpus()
+    results = {}
+    results.update(bench_imports())
+    results.update(bench_generation(individuals))
+    results.update(bench_interpretation(individuals))
+    results.update(bench_export(positions))
+    results.update(bench_variation(individuals))
+    results.update(bench_evolution())
+
+    return {"commit": git_commit(),
+            "created": time.time(),
+            "python": sys.version,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "parameters": {"corpus_seed": corpus_seed, "corpus_size": corpus_size, "target": target,
+                           "repeat": repeat, "solver_latency": solver_latency, "solver_workers": solver_workers,
+                           "generation_size": generation_size, "import_modules": import_modules},
+            "results": results}
+
+
+if __name__ == "__main__":
+    benchmarks = run_benchmarks()
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(benchmarks, f, indent=4)
+
+    if baseline_path is not None:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            compare(json.load(f), benchmarks)
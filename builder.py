@@ -0,0 +1,190 @@
+# Jacques Terblanche
+# 22548602
+
+import time
+import hashlib
+import numpy as np
+from l_syst import Lsystem
+from l_syst import Interp
+from l_syst import NoRenderer
+import tracing
+
+
+class PopulationBuilder:
+    """
+    A PopulationBuilder class that generates and interprets batches of individuals in a pool of worker processes.
+    Every work item is sent to a worker as its rules (or seed, or the sentence of an existing individual) along with
+    the target, and a compact result is returned: the final rules and sentence, the hash of the sentence, the pixel
+    positions, (optionally) the encoded image and the duration of each phase.
+
+    Attributes
+    ----------
+    num_workers : int
+        The number of worker processes (1 builds all individuals in the calling process)
+    chunk_size : int
+        The number of work items sent to a worker at once (None divides the items evenly between the workers)
+    start_method : str
+        The way in which the worker processes are started, "fork" or "spawn" (None chooses fork while no other thread
+        is running and spawn otherwise, e.g. on Windows)
+    executor : ProcessPoolExecutor
+        The pool of worker processes, kept for all batches (None if the items are built in the calling process)
+
+    Methods
+    ----------
+    start()
+        Starts the worker processes
+    build(items, encode, scale, pop_number)
+        Generates and interprets all (axiom, seed, rules, sentence, target) work items and returns their results in
+        order
+    close()
+        Stops the worker processes
+    """
+
+    def __init__(self, num_workers=1, chunk_size=None, start_method=None):
+        """
+        Parameters
+        ----------
+        num_workers : int, optional
+            The number of worker processes (Default is 1, all individuals are built in the calling process)
+        chunk_size : int, optional
+            The number of work items sent to a worker at once (Default divides the items evenly between the
+            workers)
+        start_method : str, optional
+            Starts the worker processes by forking ("fork") or as new interpreters ("spawn") (Default forks the
+            workers while no other thread is running and spawns them otherwise)
+        """
+        if start_method not in (None, "fork", "spawn"):
+            raise ValueError("Unknown start method: " + str(start_method))
+        self.num_workers = max(1, int(num_workers))
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self.executor = None
+
+    def start(self):
+        """
+        Starts the worker processes, which are kept for all later batches. A process forked while other threads are
+        running can inherit a lock held by one of them (e.g. by the artifact writer or the tracer) and wait on it
+        forever, therefore the workers are only forked while the calling thread is the only running thread. Otherwise
+        (and on systems without fork, such as Windows) the workers are spawned, where each worker imports the main
+        script again (which therefore has to run the evolution under an if __name__ == "__main__" guard). Each worker
+        traces to the calling process's trace file. The process pool modules are only imported when they are used
+        """
+        if self.num_workers == 1 or self.executor is not None:
+            return
+        import threading
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        start_method = self.start_method
+        if start_method is None:
+            forkable = "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+            start_method = "fork" if forkable else "spawn"
+        if start_method == "fork" and threading.active_count() > 1:
+            print("Population builder not forked (other threads are running), spawning its workers instead")
+            start_method = "spawn"
+
+        tracer = tracing.tracer
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers,
+                                            mp_context=multiprocessing.get_context(start_method),
+                                            initializer=tracing.configure_worker,
+                                            initargs=(tracer.path, tracer.profile_phase, tracer.profile_path))
+        # A forking pool starts all of its processes on the first submission, before its own management thread
+        self.executor.submit(int).result()
+
+    def build(self, items, encode=False, scale=1, pop_number=None):
+        """
+        Generates and interprets all (axiom, seed, rules, sentence, target) work items. New individuals are generated
+        from their rules (or from the seed if the rules are None), while existing individuals are only interpreted
+        from their sentence. The results are returned in the same order as the items. If encode is set, each result
+        includes the PNG image of the cross-section. The population number (and the position of each item) is only
+        used to label the traced phases
+        """
+        items = [(axiom, seed, rules, sentence, target, encode, scale, pop_number, k)
+                 for k, (axiom, seed, rules, sentence, target) in enumerate(items)]
+        chunk_size = self.chunk_size or max(1, -(-len(items) // (4 * self.num_workers)))
+        chunks = [items[k:k + chunk_size] for k in range(0, len(items), chunk_size)]
+
+        # Worker processes are only used if they were started and there is more than one chunk, otherwise the items
+        # are built in the calling process
+        if self.executor is None or len(chunks) <= 1:
+            return build_chunk(items)
+
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            results = []
+            for chunk_results in self.executor.map(build_chunk, chunks):
+                results += chunk_results
+            return results
+        except (OSError, BrokenProcessPool) as error:
+            # The workers are not re-started (other threads may be running by now)
+            print("Population builder failed (" + str(error) + "), building in the main process")
+            self.close()
+            return build_chunk(items)
+
+    def close(self):
+        """
+        Stops the worker processes (if started)
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def build_item(axiom, seed, rules, sentence, target, encode=False, scale=1, pop_number=None, gen_number=None):
+    """
+    Generates (unless the sentence is provided) and interprets a single individual and returns its rules, sentence
+    (None if it was provided), sentence hash, number of F characters, pixel positions, (optionally) PNG image and the
+    duration of its build and image encoding
+    """
+    timings = {}
+    with tracing.context(pop_number=pop_number, gen_number=gen_number):
+        start = time.time()
+        provided = sentence is not None
+        if not provided:
+            individual = Lsystem(axiom, seed, rules)
+            rules = individual.rules
+            sentence = individual.sentence
+        num_f = sentence.count("F")
+        temp = Interp(sentence, target, num_f)
+        positions = temp.draw(0, 0, NoRenderer())
+        timings["build"] = time.time() - start
+
+        # The rendering backend is only imported by workers that encode images
+        png = None
+        if encode:
+            from render import encode_png
+            start = time.time()
+            with tracing.span("rendering"):
+                png = encode_png(temp.raster, scale)
+            timings["render"] = time.time() - start
+
+    return {"rules": rules,
+            "sentence": None if provided else sentence,
+            "sentence_hash": sentence_hash(sentence),
+            "num_f": num_f,
+            "positions": np.asarray(positions, dtype=np.int32),
+            "png": png,
+            "timings": timings}
+
+
+def build_chunk(items):
+    """
+    Builds every (axiom, seed, rules, sentence, target, encode, scale, pop_number, gen_number) work item of a chunk
+    """
+    return [build_item(*item) for item in items]
+
+
+def sentence_hash(sentence):
+    """
+    Returns the hash of a generated sentence (its genotype's expression)
+    """
+    return hashlib.sha1(sentence.encode("utf-8")).hexdigest()
+
+
+def positions_raster(positions, target):
+    """
+    Re-creates the occupancy raster (indexed [y, x]) of an interpretation from its pixel positions
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    raster = np.zeros((target[1], target[0]), dtype=np.uint8)
+    raster[positions[:, 1], positions[:, 0]] = 1
+    return raster
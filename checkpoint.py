@@ -0,0 +1,103 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import json
+import tempfile
+
+
+def save_checkpoint(path, state):
+    """
+    Writes the checkpoint state to a JSON file. The state is first written to a temporary file (in the same folder)
+    which then replaces the previous checkpoint, an interruption therefore never leaves a partial checkpoint
+    """
+    path = os.path.abspath(path)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path):
+    """
+    Reads the checkpoint state from a JSON file
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def results_path(path):
+    """
+    Returns the path to the results journal of a checkpoint, in which the results of the checkpoint's generation are
+    recorded as they complete (between two checkpoints)
+    """
+    return os.path.splitext(os.path.abspath(path))[0] + '_results.jsonl'
+
+
+def clear_results(path):
+    """
+    Empties the results journal of a checkpoint (once the checkpoint contains all recorded results). The journal is
+    written directly (not through the artifact writer's queue), therefore it is empty once this function returns
+    """
+    with open(results_path(path), 'w', encoding='utf-8') as f:
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def append_result(path, individual):
+    """
+    Appends the result of an individual to the results journal of a checkpoint (a single JSON line). The line is
+    synced to disk before this function returns, therefore a completed result survives an interruption
+    """
+    line = json.dumps({"generation": individual.pop_number,
+                       "gen_number": individual.gen_number,
+                       "angle": individual.angle,
+                       "fidelity": individual.fidelity,
+                       "mesh": individual.mesh})
+    with open(results_path(path), 'a', encoding='utf-8') as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_results(path, generation):
+    """
+    Returns the results recorded in the journal of a checkpoint for the provided generation, keyed by generation
+    number. A partially written last line (an interrupted write) is ignored
+    """
+    results = {}
+    if not os.path.exists(results_path(path)):
+        return results
+    with open(results_path(path), 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result["generation"] == generation:
+                results[result["gen_number"]] = result
+    return results
+
+
+def individual_state(individual):
+    """
+    Returns the state of an individual (excluding its interpretation, which is re-created from the sentence)
+    """
+    return {"rules": individual.rules,
+            "sentence": individual.sentence,
+            "angle": individual.angle,
+            "fidelity": individual.fidelity,
+            "mesh": individual.mesh,
+            "survivor": individual.survivor,
+            "distance": individual.distance,
+            "fitness": individual.fitness,
+            "ranking": individual.ranking,
+            "pop_number": individual.pop_number,
+            "gen_number": individual.gen_number}
@@ -0,0 +1,64 @@
+# Jacques Terblanche
+# 22548602
+
+import numpy as np
+
+
+def segment_distances(points, start, end):
+    """
+    Returns the distance of each point from the line segment between the start and end points
+    """
+    points = np.asarray(points, dtype=float)
+    direction = end - start
+    length = np.dot(direction, direction)
+    if length == 0:
+        return np.hypot(points[:, 0] - start[0], points[:, 1] - start[1])
+    # Each point is projected onto the segment (limited to its end points)
+    t = np.clip((points - start) @ direction / length, 0, 1)
+    projection = start + t[:, None] * direction
+    return np.hypot(points[:, 0] - projection[:, 0], points[:, 1] - projection[:, 1])
+
+
+def simplify(points, tolerance, max_spacing=None):
+    """
+    Simplifies a contour with the Ramer-Douglas-Peucker algorithm and returns the indices of the kept points. A point
+    is only kept if a removed point would otherwise lie further than the tolerance from the simplified contour,
+    therefore straight runs and staircase steps (smaller than the tolerance) are removed while corners and curved
+    regions keep their points. The first and last points are always kept. If a maximum spacing is provided, longer
+    segments are split as well (a spline through the kept points then remains close to the contour at corners)
+    """
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Each segment is split at its furthest point until all points are within the tolerance (without recursion)
+    segments = [(0, len(points) - 1)]
+    while segments:
+        first, last = segments.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        split = int(np.argmax(distances)) + first + 1
+        if distances[split - first - 1] <= tolerance:
+            # A segment within the tolerance is only split (at its middle) if it exceeds the maximum spacing
+            if max_spacing is None or np.hypot(*(points[last] - points[first])) <= max_spacing:
+                continue
+            split = (first + last) // 2
+        keep[split] = True
+        segments += [(first, split), (split, last)]
+
+    return np.flatnonzero(keep)
+
+
+def max_deviation(points, kept):
+    """
+    Returns the largest distance of any point of the original contour from the simplified contour (formed by the
+    kept points)
+    """
+    points = np.asarray(points, dtype=float)
+    deviation = 0.0
+    for first, last in zip(kept[:-1], kept[1:]):
+        if last - first > 1:
+            deviation = max(deviation, float(segment_distances(points[first + 1:last], points[first],
+                                                               points[last]).max()))
+    return deviation
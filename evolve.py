@@ -1,416 +1,1288 @@
-# Jacques Terblanche
-# 22548602
-
-import random
-import math
-import numpy as np
-from l_syst import Lsystem
-from l_syst import Interp
-import subprocess
-import os
-import json
-
-
-class Evolution:
-    """
-    An Evolution class to apply a genetic algorithm to a specified number of individuals accross
-    cycles or to randomly generate 1 population.
-
-    Attributes
-    ----------
-    pop_size : int
-        The number of generations
-    axiom : str
-        The initial axiom used for the l-system
-    population : list
-        A list containing the l-system class objects
-    seed : int
-        The random seed used for the system's initialisation
-    target : list
-        The targeted end-coordinates for the cross-section's grid
-    target_angle : float
-        The target bending angle of the resultant soft bending actuator
-    elitism : float
-        The fraction of best performing individuals to be kept for the next cycle
-    replacement : float
-        The fraction of worst performing individuals to be regenerated for the next cycle
-
-    Methods
-    ----------
-    generate_initial_population(num_individuals, axiom, seed, target)
-        Produces the first generation of individuals
-    evolve(num_individuals)
-        Produces all individuals in all cycles
-    crossover(parent_1, parent_2, i)
-        Applies the cross-over variational operator to two parent individuals
-    evaluate_pop_fitness(individuals, target, pop_number)
-        Determines the fitness of all individuals through calling a FEM script and applying a fitness
-        function
-    select_parents(sel_pool, case)
-        Applies roulette selection to determine parent individuals
-    mutate(parent, i)
-        Produces an individual with a random number of rules re-generated
-    generate_next_gen(individuals, pop_num)
-        Utilises selection rules to determine the composition of the next generation
-    random_gen(num_individuals)
-        Randomly generates a single population with the total number of individuals
-        equal to the number provided
-
-    """
-
-    def __init__(self, population_size, seed, target, target_angle, axiom, elitism, replacement):
-        """
-        Parameters
-        ----------
-        population_size : int
-            The number of generations
-        seed : int
-            The random seed used for the system's initialisation
-        target : list
-            The targeted end-coordinates for the cross-section's grid
-        target_angle : float
-            The target bending angle of the resultant soft bending actuator
-        axiom : str
-            The target bending angle of the resultant soft bending actuator
-        elitism : float
-            The fraction of best performing individuals to be kept for the next cycle
-        replacement : float
-            The fraction of worst performing individuals to be regenerated for the next cycle
-        """
-
-        self.pop_size = population_size
-        self.axiom = axiom
-        self.seed = seed
-        self.target = target
-        self.target_angle = target_angle
-        self.elitism = elitism
-        self.replacement = replacement
-
-        # Initialise an empty population list
-        self.population = []
-
-    @staticmethod
-    def generate_initial_population(num_individuals, axiom, seed, target):
-        """Produces the first generation of individuals for the genetic algorithm"""
-        individuals = list()
-        # Generates L-system classes for the number of individuals specified. Also, interprets
-        # the L-systems' resultant strings into grid-based drawings/images
-        for i in range(num_individuals):
-            individuals.append(Lsystem(axiom, seed + 2 * i))
-            temp = Interp(individuals[i].sentence, target)
-            individuals[i].pop_number = 0
-            individuals[i].coords = temp.draw(0, i)
-
-        return individuals
-
-    def evolve(self, num_individuals):
-        """Produces all individuals in all cycles, through calling the generate_initial_pop function, evaluation
-        functions and generate_next_gen functions"""
-
-        # Generate an initial population and store the seed
-        individuals = self.generate_initial_population(num_individuals, self.axiom, self.seed, self.target)
-        print(self.seed)
-        # Evaluate initial population
-        individuals = self.evaluate_pop_fitness(individuals, self.target, 0)
-        self.population.append(individuals)
-
-        # Generate subsequent generations of individuals and evaluate them
-        new_gen = individuals
-        for i in range(self.pop_size - 1):
-            new_gen = self.generate_next_gen(new_gen, i + 1)
-            new_gen = self.evaluate_pop_fitness(new_gen, self.target, i + 1)
-            self.population.append(new_gen)
-
-    def crossover(self, parent_1, parent_2, i):
-        """Applies the cross-over variational operator to two parent individuals"""
-        # Initialise to specified seed along with population specific variation
-        random.seed(self.seed + i)
-
-        # Randomly select cross-over points
-        cross_over_point_1 = random.randrange(0, 3)
-        cross_over_point_2 = random.randrange(0, 3)
-
-        # Choose child rules based on parents' cross-over points
-        child_1_rules = parent_1.rules[:cross_over_point_1] + parent_2.rules[cross_over_point_1:]
-        child_2_rules = parent_2.rules[:cross_over_point_2] + parent_1.rules[cross_over_point_2:]
-        # Generate L-system with child rules
-        child_1 = Lsystem(self.axiom, self.seed + i, child_1_rules)
-        child_2 = Lsystem(self.axiom, self.seed + i, child_2_rules)
-        # Return new individuals
-
-        return child_1, child_2
-
-    def evaluate_pop_fitness(self, individuals, target, pop_number):
-        """
-         Determines the fitness of all individuals through calling a FEM script and applying a fitness
-        function
-        """
-        # Sets the number of individuals and initialises running sum to zero
-        num_individuals = len(individuals)
-        running_sum = 0  # used for mean angle calculation
-
-        # Each individiauls' coordinates in the current generation is exported to a JSON
-        # file and each new individual is evaluated
-        for i in range(num_individuals):
-            individuals[i].gen_number = i
-            individuals[i].pop_number = pop_number
-            export_to_json(individuals[i].coords, target, pop_number, i)
-
-            # If individual already has an angle, then its evaluation will be skipped (to save
-            # computational costs)
-            if individuals[i].angle:
-                pass
-            else:
-                # The evaluate function is called, this function utilises a subprocess to launch
-                # Abaqus CAE
-                individuals[i].angle = evaluate()
-            # The absolute distance between the target angle and the individual's angle is calculated
-            individuals[i].distance = abs(self.target_angle - individuals[i].angle)
-
-        print("=======")
-        # Current generation individuals are sorted in descending order (according to angle)
-        individuals.sort(key=lambda x: x.distance, reverse=False)
-
-        # The rankings of all individuals are stored and printed
-        for i in range(num_individuals):
-            individuals[i].ranking = (i + 1)
-            print("Individual_" + str(individuals[i].pop_number) + "_" + str(individuals[i].gen_number) + ": " + str(
-                individuals[i].sentence))
-            print("Angle: " + str(round(individuals[i].angle)))
-            running_sum = running_sum + individuals[i].angle
-        # The mean is calculated and printed
-        print("=======" + str(running_sum / num_individuals) + "=======")
-
-        # The fitness function is applied to all individuals. See report for further information
-        for i in range(len(individuals)):
-            individuals[i].fitness = 2 * (num_individuals + 1 - individuals[i].ranking) / (
-                    num_individuals * (num_individuals + 1))
-
-        return individuals
-
-    @staticmethod
-    def select_parents(sel_pool, case):
-        """
-        Applies roulette selection to determine parent individuals
-        """
-        num_individuals = len(sel_pool)
-        # The fitness score for a cycle sums to 1 (with the chosen definition for fitness score)
-        total_sum = 1
-        # A random value is calculated for the initial partial sum
-        partial_sum = random.uniform(0, 1)
-        # Parents 1 and 2 are initialised to the best two performing individuals
-        parent_1 = sel_pool[0]
-        parent_2 = sel_pool[1]
-
-        # Parent selection if cross-over is selected
-        if case == 1:
-            # With roulette selection, all individuals' fitness scores are added to the
-            # partial sum. The individual's who value pushes the partial sum to be greater
-            # than the total sum, is the chosen individual
-
-            # First parent
-            for i in range(num_individuals):
-                partial_sum += sel_pool[i].fitness
-                if partial_sum > total_sum:
-                    parent_1 = sel_pool[i]
-                    break
-
-            # Second parent
-            num_individuals = len(sel_pool)
-            partial_sum = random.uniform(0, 1)
-
-            for i in range(num_individuals):
-                partial_sum += sel_pool[i].fitness
-
-                if partial_sum > total_sum:
-                    parent_2 = sel_pool[i]
-
-                    break
-
-            return parent_1, parent_2, sel_pool
-
-        # Parent selection for other cases
-        elif case == 2:
-            for i in range(num_individuals):
-                partial_sum += sel_pool[i].fitness
-
-                if partial_sum > total_sum:
-                    parent_1 = sel_pool[i]
-
-            return parent_1, sel_pool
-
-    def mutate(self, parent, i):
-        """
-        Produces an individual with a random number of rules re-generated
-        """
-        child = None
-        random.seed(self.seed + i + i * i)
-        num_mutations = random.randrange(1, 3)
-
-        # The random generated number of mutations are each applied
-        for x in range(num_mutations):
-            random.seed(self.seed + i + x)
-            rule_num = random.randrange(0, 6)
-            child_rules = parent.rules
-            child_rules[rule_num] = parent.l_mutate()
-
-            child = Lsystem(self.axiom, self.seed + i, child_rules)
-
-        return child
-
-    def generate_next_gen(self, individuals, pop_num):
-        """
-        Utilises selection rules to determine the composition of the next generation
-        """
-
-        # Variables are initialised and the number of individuals is set
-        new_individuals = []
-        temp_list = []
-        num_individuals = len(individuals)
-
-        # Setup replacement point for next generation
-        replacement_point = (num_individuals - (math.ceil(self.replacement * num_individuals)))
-        final_list = []
-        # Introduce elitism to new generation
-        for i in range(math.ceil(self.elitism * len(individuals))):
-            if i > 0 and individuals[i].sentence == individuals[i - 1].sentence:
-                new_individuals.append(Lsystem(self.axiom, self.seed + 3 * i * pop_num + i + 10))
-            else:
-                new_individuals.append(individuals[i])
-        # Count number of unique individuals in the population
-        for j in range(num_individuals):
-            temp_list.append(individuals[j].sentence)
-        num_unique = len(np.unique(np.array(temp_list)))
-
-        # Apply genetic variation operators to rest of population (not elite/replaced)
-        i = math.ceil(self.elitism * num_individuals)
-        while i < replacement_point:
-            random.seed(self.seed + pop_num * i + i)
-
-            rand_com = random.uniform(0, 2)
-            rand_mut = random.uniform(0, 1)
-            rand_com = rand_com + (1 - num_unique / num_individuals)
-
-            # If angle is within 90% of targeted angle, individual is then kept
-            if round(individuals[i].angle) == round(self.target_angle * 90 / 100) and final_list.count(
-                    individuals[i].sentence) == 0:
-                new_individuals.append(individuals[i])
-
-                i += 1
-
-            # Apply cross-over as long as there are enough individuals available
-            # and if cross-over probability is activated
-            elif rand_com <= 1 and (replacement_point - i != 1):
-                temp = self.select_parents(individuals, 1)
-                temp_object = self.crossover(temp[0], temp[1], pop_num * i)
-                temp_1 = temp_object[0]
-                temp_2 = temp_object[1]
-                # Apply random mutation on cross-over individuals if mutation probability
-                # is activated
-                if rand_mut >= 0.5:
-                    temp_1 = self.mutate(temp_object[0], pop_num * i + i)
-                    temp_2 = self.mutate(temp_object[1], pop_num * i + 2 * i + 1)
-
-                new_individuals.append(temp_1)
-                new_individuals.append(temp_2)
-                i += 2
-
-            # Apply only mutation to individual if mutation probability is activated
-            elif (rand_com > 1) or (replacement_point - i < 2):
-                temp = self.select_parents(individuals, 2)
-                new_individuals.append(self.mutate(temp[0], pop_num * i))
-                i += 1
-
-            # Error-case for development purposes (is used to pass selected parent if above results in error)
-            else:
-                new_individuals.append(self.select_parents(individuals, 2)[0])
-                i += 1
-
-        # Introduce replacement to new generation
-        for k in range(math.ceil(self.replacement * num_individuals)):
-            new_individuals.append(Lsystem(self.axiom, self.seed + 2 * k * pop_num + k + 10))
-
-        # All new individuals are interpreted
-        for j in range(len(new_individuals)):
-            temp = Interp(new_individuals[j].sentence, self.target)
-            new_individuals[j].pop_number = pop_num
-            new_individuals[j].coords = temp.draw(pop_num, j)
-
-        print("")
-        return new_individuals
-
-    def random_gen(self, num_individuals):
-        """
-        Randomly generates a single population with the total number of individuals
-        equal to the number provided
-        """
-
-        individuals = list()
-        # Generates, interprets and evaluates a single population
-        for i in range(num_individuals):
-            individuals.append(Lsystem(self.axiom, self.seed + 2 * i))
-            temp = Interp(individuals[i].sentence, self.target)
-            individuals[i].pop_number = 0
-            individuals[i].coords = temp.draw(0, i)
-
-        self.evaluate_pop_fitness(individuals, self.target, 0)
-
-
-# Storage setup
-script_dir = os.path.dirname(__file__)
-rel_path = "Abaqus"
-abs_file_path = os.path.join(script_dir, rel_path)
-rel_path = "Coordinate_storage"
-abs_storage_path = os.path.join(script_dir, rel_path)
-
-
-def evaluate():
-    """Uses a Windows subprocess to call the Abaqus python script from Abaqus CAE"""
-    os.chdir(abs_file_path)
-    subprocess.run('abaqus cae -noGUI Abaqus_script.py', shell=True)
-
-    # Resultant angle is read from generated txt file
-    with open('angle.txt', 'r') as file:
-        angle = float(file.read())
-    return angle
-
-
-def export_to_json(positions, target, pop_number, gen_number):
-    """Exports the position file, mirrors it and saves it a file accessible by Abaqus"""
-    script_loc = os.path.dirname(__file__)
-    abaqus_path = "Abaqus"
-    abaqus_file_path = os.path.join(script_loc, abaqus_path)
-    export_data = []
-
-    # Select every other data point (a high number of points will lead to complex shapes
-    # which require very refined mesh
-
-    reduced_list = positions[::4]
-    # Append middle point
-    reduced_list.append((target[0], positions[-1][1]))
-
-    # Mirror data points
-    for x in range(len(reduced_list) - 1):
-        export_data.append([2 * target[0] - reduced_list[x][0], reduced_list[x][1]])
-
-    # Add reversed list to reduced list
-    export_data.reverse()
-    export_data = (reduced_list + export_data)
-
-    # Resize coordinates (e.g. from 100 pixels to 10 mm)
-    new_list = list()
-    for x in range(len(export_data)):
-        new_x = export_data[x][0] / 10
-        new_y = export_data[x][1] / 10
-        new_list.append([new_x, new_y])
-
-    export_data = new_list
-
-    # Export data to a JSON file
-    os.chdir(abaqus_file_path)
-    with open('input_data.json', 'w', encoding='utf-8') as f:
-        json.dump(export_data, f, ensure_ascii=False, indent=4)
-    os.chdir(abs_storage_path)
-    with open('Individual' + str(pop_number) + '_' + str(gen_number) + '.json', 'w', encoding='utf-8') as f:
-        json.dump(export_data, f, ensure_ascii=False, indent=4)
-    os.chdir(script_dir)
+# Jacques Terblanche
+# 22548602
+
+import math
+import time
+import numpy as np
+from l_syst import Lsystem
+from l_syst import Interp
+from l_syst import default_renderer
+import genetic
+from genetic import offspring_stream
+from genetic import replacement_stream
+from genetic import elite_stream
+from genetic import screen_stream
+from fem_pool import EvaluationPool
+from fem_pool import SpoolClient
+from fem_cache import ResultCache
+from render import Renderer
+from builder import PopulationBuilder
+from builder import positions_raster
+from surrogate import RidgeSurrogate
+from surrogate import extract_features
+from beam_model import evaluate_analytical
+from fem_results import read_angle
+from fem_results import read_bound
+from job_monitor import write_settings
+from contour import simplify
+from contour import max_deviation
+from feasibility import FeasibilityChecker
+from archive import shared_archive
+from archive import design_hash
+import artifacts
+from checkpoint import save_checkpoint
+from checkpoint import load_checkpoint
+from checkpoint import append_result
+from checkpoint import clear_results
+from checkpoint import load_results
+from checkpoint import individual_state
+import tracing
+import subprocess
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Evolution:
+    """
+    An Evolution class to apply a genetic algorithm to a specified number of individuals accross
+    cycles or to randomly generate 1 population.
+
+    Attributes
+    ----------
+    pop_size : int
+        The number of generations
+    axiom : str
+        The initial axiom used for the l-system
+    population : list
+        A list containing the l-system class objects
+    seed : int
+        The random seed used for the system's initialisation
+    target : list
+        The targeted end-coordinates for the cross-section's grid
+    target_angle : float
+        The target bending angle of the resultant soft bending actuator
+    elitism : float
+        The fraction of best performing individuals to be kept for the next cycle
+    replacement : float
+        The fraction of worst performing individuals to be regenerated for the next cycle
+    pool : EvaluationPool
+        The pool used to run the FEM evaluations of a generation concurrently (each in its own job directory)
+    cache : ResultCache
+        The persistent cache of FEM results, keyed by exported design, actuator parameters and mesh settings
+        (None if results are not cached)
+    renderer : Renderer
+        The rendering stage used to store the interpreted cross-sections as images
+    builder : PopulationBuilder
+        The batched builder used to generate and interpret whole generations in worker processes
+    surrogate : RidgeSurrogate
+        The surrogate model used to pre-screen new individuals before FEM evaluation (None if not screened)
+    screen_fraction : float
+        The fraction of new individuals forwarded to the FEM solver when pre-screening
+    explore_fraction : float
+        The fraction of forwarded individuals that are chosen randomly (rather than by predicted distance)
+    checkpoint_path : str
+        The file to which the state of the run is written at the start and end of each generation's evaluation, where
+        the results completed in between are appended to its results journal (None if no checkpoints are written)
+    duplicate_rates : list
+        The fraction of individuals in each evaluated generation with the same interpretation as another individual
+    mode : str
+        The search mechanism of the run ("evolve", "steady_state" or "random"), stored with the checkpoint
+    fidelity : str
+        The evaluation tier, Abaqus FEM ("fem") or the analytical beam model ("analytical"). Every result is tagged
+        with the tier that produced it
+    server : SpoolClient
+        The client dispatching evaluations to resident Abaqus workers (None if every evaluation starts Abaqus CAE)
+    mesh_schedule : list
+        The mesh level of each generation's new individuals (the last level is used for all later generations)
+    early_abort : bool
+        Whether FEM jobs are monitored and aborted once they cannot beat the worst elite individual of the previous
+        generation (the result of an aborted job is tagged as a "bound" of its angle)
+
+    Methods
+    ----------
+    generate_initial_population(num_individuals, axiom, seed, target, renderer, builder)
+        Produces the first generation of individuals
+    build_population(specs, axiom, target, pop_number, renderer, builder)
+        Generates and interprets a generation of new (seeded) and existing individuals in a single batch
+    evolve(num_individuals)
+        Produces all individuals in all cycles
+    continue_evolution(individuals, pop_number)
+        Evaluates the provided generation and produces all subsequent generations
+    resume()
+        Continues an interrupted run from its checkpoint
+    save_state(stage, pop_number, individuals)
+        Writes a checkpoint of the run (and records completed generations in the run database)
+    start_run(run_id)
+        Registers the run in the run database
+    record_generation(pop_number, individuals)
+        Writes the individuals of a generation to the run database
+    solved(individual, mesh)
+        Determines if the individual has a result of the current evaluation tier (at the mesh level or finer)
+    mesh_level(pop_number)
+        Returns the mesh level of the generation's new individuals
+    cache_settings(mesh)
+        Returns the settings that distinguish the cached results of the current evaluation tier
+    evaluate_on_server(job_dir)
+        Evaluates a job directory on the resident workers
+    close()
+        Stops the resident workers, closes the run database and drains the artifact writer
+    abort_distance(survivors)
+        Returns the distance to the target angle beyond which a monitored job is aborted
+    record_result(individual, angle, job_dir, key, mesh)
+        Stores the result of an individual's evaluation (as a bound if its job was aborted early)
+    restore_individual(state)
+        Re-creates an individual from its checkpoint state
+    evolve_steady_state(num_individuals)
+        Produces the same number of evaluations as evolve, without waiting for generations to complete
+    steady_state(pool, num_evaluations)
+        Schedules the breeding and evaluation of children as solver slots become available
+    breed(pool, index, pop_number, gen_number)
+        Produces and interprets a single child from the pool
+    evaluate_individual(individual, pop_number, gen_number, abort_distance, mesh, archive)
+        Evaluates a single individual within its own job directory
+    repair_design(export_data, parameters)
+        Returns the export data of a design as it is sent to the FEM solver
+    check_design(individual, export_data, parameters, repaired)
+        Checks (and repairs) the geometry of an exported design before it is sent to the FEM solver
+    insert(pool, child, immigrant)
+        Inserts an evaluated child into the pool (with elitism and replacement)
+    crossover(parent_1, parent_2, rng)
+        Applies the cross-over variational operator to two parent individuals
+    evaluate_pop_fitness(individuals, target, pop_number)
+        Determines the fitness of all individuals through calling a FEM script and applying a fitness
+        function
+    screen(pending, pop_number)
+        Selects the new individuals forwarded to the FEM solver, using the surrogate's predicted angles
+    learn(individual)
+        Adds a solved individual to the surrogate's training data
+    rank(individuals, report)
+        Ranks the individuals according to their distance from the target angle and applies the fitness function
+    verify(individuals, pop_number)
+        Re-evaluates the top designs at the full mesh level
+    finish()
+        Verifies the top designs of the final generation before they are reported
+    rng(pop_number, slot, stream)
+        Returns the independent random generator of a slot within a generation
+    select_parents(sel_pool, case, rng)
+        Applies roulette selection to determine parent individuals
+    mutate(parent, rng)
+        Produces an individual with a random number of rules re-generated
+    generate_next_gen(individuals, pop_num)
+        Utilises selection rules to determine the composition of the next generation
+    random_gen(num_individuals)
+        Randomly generates a single population with the total number of individuals
+        equal to the number provided
+
+    """
+
+    def __init__(self, population_size, seed, target, target_angle, axiom, elitism, replacement, num_workers=1,
+                 cache_path=None, render_mode="individual", screen_fraction=1.0, explore_fraction=0.25,
+                 checkpoint_path=None, build_workers=1, fidelity="fem", use_server=False, server_command=None,
+                 early_abort=False, mesh_schedule=None, check_geometry=False, database_path=None, lean_output=True):
+        """
+        Parameters
+        ----------
+        population_size : int
+            The number of generations
+        seed : int
+            The random seed used for the system's initialisation
+        target : list
+            The targeted end-coordinates for the cross-section's grid
+        target_angle : float
+            The target bending angle of the resultant soft bending actuator
+        axiom : str
+            The target bending angle of the resultant soft bending actuator
+        elitism : float
+            The fraction of best performing individuals to be kept for the next cycle
+        replacement : float
+            The fraction of worst performing individuals to be regenerated for the next cycle
+        num_workers : int, optional
+            The maximum number of FEM evaluations that are run concurrently (Default is 1)
+        cache_path : str, optional
+            The folder used to cache FEM results across generations and runs (Default is no cache)
+        render_mode : str, optional
+            Stores an image per individual ("individual"), a contact sheet per generation ("sheet") or no images
+            ("off") of the interpreted cross-sections (Default is "individual")
+        screen_fraction : float, optional
+            The fraction of new individuals forwarded to the FEM solver, where the remaining individuals only receive
+            a surrogate prediction (Default is 1.0, all individuals are solved)
+        explore_fraction : float, optional
+            The fraction of forwarded individuals that are chosen randomly for exploration (Default is 0.25)
+        checkpoint_path : str, optional
+            The file to which the state of the run is written at the start and end of each generation's evaluation
+            (Default is no checkpoints). The steady-state mode has no generation boundaries and cannot be
+            checkpointed
+        build_workers : int, optional
+            The number of worker processes used to generate and interpret each generation (Default is 1, all
+            individuals are built in the main process). The processes are started when the evolution is created, where
+            they are forked if no other thread (e.g. the artifact writer's) is running and spawned otherwise
+        fidelity : str, optional
+            The evaluation tier, Abaqus FEM ("fem") or the analytical beam model ("analytical"), which requires no
+            Abaqus license and takes milliseconds per design (Default is "fem")
+        use_server : bool, optional
+            Starts num_workers resident Abaqus CAE workers (Abaqus_server.py) that each evaluate many designs, instead
+            of starting Abaqus CAE for every evaluation, which requires the "fem" fidelity (Default is False)
+        server_command : str, optional
+            The command that starts a resident worker, to which the spool path is appended (Default starts
+            Abaqus_server.py in Abaqus CAE)
+        early_abort : bool, optional
+            Monitors every FEM job while it solves and aborts it once its predicted angle cannot beat the worst elite
+            individual of the previous generation (Default is False)
+        mesh_schedule : list, optional
+            The mesh level ("coarse" or "fine", see mesh_levels) of the new individuals in each generation, where the
+            last level is used for all later generations. Survivors of a previous generation and the final top
+            designs are always evaluated at the full (finest) level (Default evaluates all individuals at the full
+            level)
+        check_geometry : bool, optional
+            Checks the geometry of every design before it is sent to the FEM solver (see feasibility.py), where
+            infeasible designs are rejected without launching Abaqus (Default is False)
+        database_path : str, optional
+            The SQLite database (see run_database.py) to which every individual of every generation is written
+            (Default is no database)
+        lean_output : bool, optional
+            Requests lean output from every FEM job, which only records the tracked nodes and removes the large job
+            files (e.g. Job-1.odb) once the results are extracted (Default is True)
+        """
+
+        self.pop_size = population_size
+        self.axiom = axiom
+        self.seed = seed
+        self.target = target
+        self.target_angle = target_angle
+        self.elitism = elitism
+        self.replacement = replacement
+
+        # Initialise an empty population list
+        self.population = []
+
+        # Each evaluation receives its own job directory, allowing evaluations to run concurrently
+        if fidelity not in evaluators:
+            raise ValueError("Unknown evaluation tier: " + str(fidelity))
+        self.fidelity = fidelity
+        self.pool = EvaluationPool(evaluators[fidelity], num_workers, abs_jobs_path,
+                                   os.path.join(abs_file_path, 'input_parameters.json'), lean_output)
+
+        # Resident workers are started once and receive the evaluations through a spool directory
+        self.server = None
+        if use_server and fidelity != "fem":
+            raise ValueError("Resident Abaqus workers can only evaluate the FEM tier, not: " + str(fidelity))
+        if use_server:
+            if server_command is None:
+                server_command = 'abaqus cae -noGUI "' + os.path.join(abs_file_path, 'Abaqus_server.py') + '" --'
+            self.server = SpoolClient(abs_spool_path)
+            self.server.start(self.pool.num_workers, server_command)
+            self.pool.evaluator = self.evaluate_on_server
+        # Hopeless FEM jobs are aborted during the solve (see job_monitor.py)
+        self.early_abort = early_abort
+        # FEM jobs of early generations can be solved on coarser meshes
+        if mesh_schedule is None:
+            mesh_schedule = [full_mesh]
+        for level in mesh_schedule:
+            if level not in mesh_levels:
+                raise ValueError("Unknown mesh level: " + str(level))
+        self.mesh_schedule = list(mesh_schedule)
+        # Designs whose geometry cannot be built in Abaqus CAE are rejected before they reach the solver
+        self.check_geometry = check_geometry
+        # Previously solved designs are looked up in the result cache instead of being re-evaluated
+        self.cache = None
+        if cache_path:
+            self.cache = ResultCache(cache_path)
+        self.renderer = Renderer(abs_cross_section_path, render_mode)
+        # Whole generations are generated and interpreted in batches (using worker processes if specified)
+        self.builder = PopulationBuilder(build_workers)
+        self.builder.start()
+
+        # A surrogate model (trained on all solved designs) is used to pre-screen new individuals
+        self.screen_fraction = screen_fraction
+        self.explore_fraction = explore_fraction
+        self.surrogate = None
+        if screen_fraction < 1:
+            self.surrogate = RidgeSurrogate()
+
+        # The fraction of individuals in each generation that duplicate another individual's interpretation
+        self.duplicate_rates = []
+
+        # The state of the run is written to the checkpoint file, allowing an interrupted run to be resumed
+        self.checkpoint_path = checkpoint_path
+        self.mode = "evolve"
+
+        # The individuals of each generation are recorded in the run database, under the identifier of the run (the
+        # database module is only imported if a database is used)
+        self.database = None
+        if database_path:
+            from run_database import RunDatabase
+            self.database = RunDatabase(database_path)
+        self.run_id = None
+
+    @staticmethod
+    def generate_initial_population(num_individuals, axiom, seed, target, renderer=None, builder=None):
+        """Produces the first generation of individuals for the genetic algorithm"""
+        # Generates L-system classes for the number of individuals specified. Also, interprets
+        # the L-systems' resultant strings into grid-based drawings/images
+        return Evolution.build_population([seed + 2 * i for i in range(num_individuals)], axiom, target, 0,
+                                          renderer, builder)
+
+    @staticmethod
+    def build_population(specs, axiom, target, pop_number, renderer=None, builder=None):
+        """
+        Generates and interprets a generation, where each spec is either the seed of a new individual, the (seed,
+        rules) of a bred individual or an existing individual (which is only re-interpreted). All individuals are sent
+        to the population builder as a single batch, after which the returned positions and images are attached and
+        stored in order
+        """
+        if renderer is None:
+            renderer = default_renderer()
+        if builder is None:
+            builder = PopulationBuilder()
+
+        # Existing individuals are sent as their sentences (which are only interpreted), bred individuals as their
+        # rules and new individuals as their seeds
+        items = []
+        for spec in specs:
+            if isinstance(spec, Lsystem):
+                items.append((axiom, 0, spec.rules, spec.sentence, target))
+            elif isinstance(spec, tuple):
+                items.append((axiom, spec[0], spec[1], None, target))
+            else:
+                items.append((axiom, spec, None, None, target))
+        with tracing.span("building", pop_number=pop_number):
+            results = builder.build(items, renderer.mode == "individual", renderer.scale, pop_number)
+
+        individuals = []
+        for j in range(len(specs)):
+            # New individuals are created from the rules and sentence produced by the builder (without rewriting)
+            if isinstance(specs[j], Lsystem):
+                individual = specs[j]
+            else:
+                seed = specs[j][0] if isinstance(specs[j], tuple) else specs[j]
+                individual = Lsystem(axiom, seed, results[j]["rules"], sentence=results[j]["sentence"])
+            individual.pop_number = pop_number
+            individual.coords = results[j]["positions"].tolist()
+            individual.raster = positions_raster(individual.coords, target)
+            # The build (and image encoding) is timed by the builder, the image is stored here
+            individual.timings["build"] = results[j]["timings"]["build"]
+            start = time.time()
+            with tracing.span("rendering", pop_number=pop_number, gen_number=j):
+                renderer.render(individual.raster, pop_number, j, results[j]["png"])
+            individual.timings["render"] = results[j]["timings"].get("render", 0.0) + time.time() - start
+            individuals.append(individual)
+        renderer.flush(pop_number)
+
+        return individuals
+
+    def evolve(self, num_individuals):
+        """Produces all individuals in all cycles, through calling the generate_initial_pop function, evaluation
+        functions and generate_next_gen functions"""
+
+        # Generate an initial population and store the seed
+        individuals = self.generate_initial_population(num_individuals, self.axiom, self.seed, self.target,
+                                                       self.renderer, self.builder)
+        print(self.seed)
+        self.mode = "evolve"
+        self.start_run()
+        # Evaluate initial population and all subsequent generations
+        self.continue_evolution(individuals, 0)
+
+    def continue_evolution(self, individuals, pop_number):
+        """
+        Evaluates the provided generation (skipping solved individuals) and produces all subsequent generations
+        """
+        with tracing.span("evaluation", pop_number=pop_number):
+            new_gen = self.evaluate_pop_fitness(individuals, self.target, pop_number)
+        self.population.append(new_gen)
+        self.save_state("complete", pop_number, new_gen)
+
+        # Generate subsequent generations of individuals and evaluate them (each traced as a generation phase)
+        for i in range(pop_number, self.pop_size - 1):
+            with tracing.span("breeding", pop_number=i + 1):
+                new_gen = self.generate_next_gen(new_gen, i + 1)
+            with tracing.span("evaluation", pop_number=i + 1):
+                new_gen = self.evaluate_pop_fitness(new_gen, self.target, i + 1)
+            self.population.append(new_gen)
+            self.save_state("complete", i + 1, new_gen)
+        self.finish()
+
+    def resume(self):
+        """
+        Continues an interrupted run from its checkpoint. A generation that was interrupted during evaluation is
+        completed, with already solved individuals being skipped
+        """
+        state = load_checkpoint(self.checkpoint_path)
+        self.mode = state["mode"]
+        # Every random draw is derived from the run seed (see genetic.slot_rng), which therefore determines the
+        # remainder of the run
+        self.seed = state["seed"]
+        self.population = [[self.restore_individual(individual) for individual in generation]
+                           for generation in state["population"]]
+        current = [self.restore_individual(individual) for individual in state["current"]]
+        pop_number = state["generation"]
+        if state["stage"] == "evaluating":
+            # The results completed after the checkpoint was written are restored from the results journal
+            results = load_results(self.checkpoint_path, pop_number)
+            for individual in current:
+                result = results.get(individual.gen_number)
+                if result is not None:
+                    individual.angle = result["angle"]
+                    individual.fidelity = result["fidelity"]
+                    individual.mesh = result["mesh"]
+        self.start_run(state.get("run_id"))
+        print("Resumed from generation " + str(pop_number) + " (" + state["stage"] + ")")
+
+        if state["stage"] == "evaluating":
+            # The interrupted generation is evaluated (only unsolved individuals are sent to the solver)
+            if self.mode == "random":
+                self.population.append(self.evaluate_pop_fitness(current, self.target, pop_number))
+                self.save_state("complete", pop_number, self.population[-1])
+                self.finish()
+            else:
+                self.continue_evolution(current, pop_number)
+        elif self.mode == "evolve":
+            # The next generation is produced from the last completed generation
+            self.population.append(current)
+            new_gen = current
+            for i in range(pop_number, self.pop_size - 1):
+                new_gen = self.generate_next_gen(new_gen, i + 1)
+                new_gen = self.evaluate_pop_fitness(new_gen, self.target, i + 1)
+                self.population.append(new_gen)
+                self.save_state("complete", i + 1, new_gen)
+            self.finish()
+        else:
+            self.population.append(current)
+
+    def save_state(self, stage, pop_number, individuals):
+        """
+        Writes a checkpoint of the run (completed generations, the current generation, the run seed and the
+        generation counter), if a checkpoint file is specified. The results journal is emptied, as the checkpoint
+        contains all of its results
+        """
+        if stage == "complete":
+            self.record_generation(pop_number, individuals)
+
+        if not self.checkpoint_path:
+            return
+        # The queued artifacts (images and coordinates) are written before the checkpoint refers to them
+        artifacts.flush()
+        state = {"mode": self.mode,
+                 "run_id": self.run_id,
+                 "seed": self.seed,
+                 "stage": stage,
+                 "generation": pop_number,
+                 "population": [[individual_state(individual) for individual in generation]
+                                for generation in self.population],
+                 "current": [individual_state(individual) for individual in individuals]}
+        # Completed generations already contain the current generation
+        if stage == "complete":
+            state["population"] = state["population"][:-1]
+        save_checkpoint(self.checkpoint_path, state)
+        clear_results(self.checkpoint_path)
+
+    def start_run(self, run_id=None):
+        """
+        Registers the run in the run database (if used). A resumed run keeps the identifier of the interrupted run,
+        while a new run is identified by its start time and seed
+        """
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S") + "_" + str(self.seed)
+        if self.database is not None:
+            self.database.start_run(self.run_id, self.mode, self.seed, self.target_angle,
+                                    {"pop_size": self.pop_size, "target": self.target, "elitism": self.elitism,
+                                     "replacement": self.replacement, "fidelity": self.fidelity,
+                                     "mesh_schedule": self.mesh_schedule, "screen_fraction": self.screen_fraction})
+
+    def record_generation(self, pop_number, individuals):
+        """
+        Writes the individuals of a generation to the run database (if used) in a single batch, replacing a previous
+        record of the generation
+        """
+        if self.database is not None:
+            self.database.record_generation(pop_number, individuals, self.target_angle)
+
+    def solved(self, individual, mesh=None):
+        """
+        Determines if the individual has a (successful) result of the current evaluation tier. If a mesh level is
+        provided, the result also has to be of that level or finer
+        """
+        if not individual.angle or individual.fidelity != self.fidelity:
+            return False
+        return mesh is None or mesh_rank(individual.mesh) >= mesh_rank(mesh)
+
+    def mesh_level(self, pop_number):
+        """
+        Returns the mesh level of the generation's new individuals (None for evaluation tiers without a mesh)
+        """
+        if self.fidelity != "fem":
+            return None
+        return self.mesh_schedule[min(pop_number, len(self.mesh_schedule) - 1)]
+
+    def cache_settings(self, mesh=None):
+        """
+        Returns the settings that distinguish the cached results of the current evaluation tier (the mesh settings
+        of FEM results, at the full level if not provided), therefore results of different tiers and mesh levels are
+        never confused
+        """
+        if self.fidelity == "fem":
+            return mesh_levels[mesh or full_mesh]
+        return [self.fidelity]
+
+    def evaluate_on_server(self, job_dir):
+        """
+        Evaluates a job directory on the resident workers (tracing the phases timed within Abaqus)
+        """
+        start = time.time()
+        with tracing.span("solver_server"):
+            angle = self.server(job_dir)
+        trace_solver_phases(job_dir, start, "server_dispatch")
+        return angle
+
+    def close(self):
+        """
+        Stops the resident workers and builder processes (if started), closes the run database (if used) and waits
+        until all queued artifacts have been written
+        """
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        if self.database is not None:
+            self.database.close()
+            self.database = None
+        self.builder.close()
+        artifacts.flush()
+
+    def abort_distance(self, survivors):
+        """
+        Returns the distance to the target angle beyond which a monitored job is aborted: the distance of the worst
+        survivor with a result of the current evaluation tier (None if jobs are not aborted early)
+        """
+        if not self.early_abort or self.fidelity != "fem":
+            return None
+        distances = [abs(self.target_angle - individual.angle) for individual in survivors if self.solved(individual)]
+        if not distances:
+            return None
+        return max(distances)
+
+    def record_result(self, individual, angle, job_dir, key=None, mesh=None):
+        """
+        Stores the resultant angle (and mesh level) of an individual's evaluation and caches it. The result of a job
+        that was aborted early is only a bound of its angle, therefore it is tagged as a "bound" (which is never
+        cached, and is evaluated again if the individual survives)
+        """
+        individual.angle = angle
+        individual.mesh = mesh
+        individual.timings.update(read_solver_timings(job_dir))
+        if read_bound(job_dir) is not None:
+            individual.fidelity = "bound"
+            return individual
+        individual.fidelity = self.fidelity
+        # Only successful evaluations are cached (a failed evaluation keeps the placeholder angle of 0)
+        if key is not None and angle:
+            self.cache.put(key, angle)
+        return individual
+
+    def repair_design(self, export_data, parameters):
+        """
+        Returns the export data of a design as it is sent to the FEM solver, where designs with too closely spaced
+        points are repaired if the geometry is checked
+        """
+        if not self.check_geometry or self.fidelity != "fem":
+            return export_data
+        return FeasibilityChecker(parameters).repair(export_data)
+
+    def check_design(self, individual, export_data, parameters, repaired=None):
+        """
+        Checks the geometry of an exported design before it is sent to the FEM solver (if enabled). Designs with too
+        closely spaced points are repaired (unless the repaired export data is provided) and the repaired export data
+        is returned. An infeasible design receives the placeholder angle of 0 and is tagged as "infeasible" without
+        being solved, in which case None is returned
+        """
+        if not self.check_geometry or self.fidelity != "fem":
+            return export_data
+        checker = FeasibilityChecker(parameters)
+        if repaired is None:
+            repaired = checker.repair(export_data)
+        problems = checker.check(repaired)
+
+        name = "Individual_" + str(individual.pop_number) + "_" + str(individual.gen_number)
+        if problems:
+            print(name + " rejected (infeasible geometry): " + "; ".join(problems))
+            individual.angle = 0.0
+            individual.fidelity = "infeasible"
+            individual.mesh = None
+            return None
+        if len(repaired) < len(export_data):
+            print(name + " repaired: " + str(len(export_data) - len(repaired)) + " closely spaced points removed")
+        return repaired
+
+    def restore_individual(self, state):
+        """
+        Re-creates an individual (including its interpretation) from its checkpoint state
+        """
+        # The stored sentence is used as it is (the rules are not applied again)
+        individual = Lsystem(self.axiom, self.seed, state["rules"], sentence=state["sentence"])
+        for name in ("angle", "fidelity", "distance", "fitness", "ranking", "pop_number", "gen_number"):
+            setattr(individual, name, state[name])
+        individual.survivor = state.get("survivor", False)
+        # Checkpoints written before mesh levels were scheduled only contain results of the full level
+        individual.mesh = state.get("mesh", full_mesh)
+
+        # The interpretation is deterministic, therefore the coordinates are re-created (without storing images)
+        temp = Interp(individual.sentence, self.target, individual.num_f)
+        individual.coords = temp.draw(individual.pop_number, individual.gen_number, Renderer(abs_cross_section_path,
+                                                                                               "off"))
+        individual.raster = temp.raster
+        return individual
+
+    def evolve_steady_state(self, num_individuals):
+        """
+        Produces the same number of evaluations as evolve, without generation barriers. Whenever a solver slot
+        becomes available, a child is bred from the current pool of evaluated individuals and submitted. The mode has
+        no generation boundaries at which the run could be checkpointed, therefore it cannot be resumed
+        """
+        if self.checkpoint_path:
+            raise ValueError("The steady-state mode cannot be checkpointed, no checkpoint path should be provided")
+
+        # Generate and evaluate an initial population
+        individuals = self.generate_initial_population(num_individuals, self.axiom, self.seed, self.target,
+                                                       self.renderer, self.builder)
+        print(self.seed)
+        self.mode = "steady_state"
+        self.start_run()
+        individuals = self.evaluate_pop_fitness(individuals, self.target, 0)
+        self.population.append(list(individuals))
+        self.record_generation(0, self.population[-1])
+
+        # The asyncio scheduler keeps every solver slot occupied until all evaluations are submitted (asyncio is only
+        # imported by the steady-state mode)
+        import asyncio
+        asyncio.run(self.steady_state(individuals, (self.pop_size - 1) * num_individuals))
+        self.finish()
+
+    async def steady_state(self, pool, num_evaluations):
+        """
+        Runs a worker per solver slot, where each worker repeatedly breeds a child from the pool, evaluates it and
+        inserts it into the pool. A snapshot of the pool is stored (and printed) for every num_individuals
+        evaluations, numbered as a generation
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        num_individuals = len(pool)
+        counter = {"submitted": 0, "completed": 0}
+
+        async def worker(executor):
+            while counter["submitted"] < num_evaluations:
+                # Breeding and insertion run on the event loop, therefore the pool is never modified concurrently
+                index = counter["submitted"]
+                counter["submitted"] += 1
+                pop_number = 1 + index // num_individuals
+                gen_number = index % num_individuals
+                with tracing.context(pop_number=pop_number, gen_number=gen_number):
+                    child, immigrant = self.breed(pool, index, pop_number, gen_number)
+
+                # A child with the same interpretation as a solved pool member receives its result
+                phenotype = phenotype_hash(child.coords)
+                duplicate = [individual for individual in pool if individual.fidelity == self.fidelity and
+                             phenotype_hash(individual.coords) == phenotype]
+                if duplicate:
+                    child.angle = duplicate[0].angle
+                    child.fidelity = duplicate[0].fidelity
+                    child.mesh = duplicate[0].mesh
+                else:
+                    # A bred child is only inserted if it beats the worst pool member, therefore its job is aborted
+                    # once it cannot (immigrants are always inserted)
+                    abort_distance = None if immigrant else self.abort_distance(pool)
+                    await loop.run_in_executor(executor, self.evaluate_individual, child, pop_number, gen_number,
+                                               abort_distance, self.mesh_level(pop_number))
+                    self.learn(child)
+                self.insert(pool, child, immigrant)
+
+                # A generation is recorded whenever num_individuals evaluations have completed
+                counter["completed"] += 1
+                if counter["completed"] % num_individuals == 0 or counter["completed"] == num_evaluations:
+                    self.renderer.flush(1 + (counter["completed"] - 1) // num_individuals)
+                    self.population.append(list(self.rank(pool)))
+                    self.record_generation(len(self.population) - 1, self.population[-1])
+
+        with ThreadPoolExecutor(max_workers=self.pool.num_workers) as executor:
+            await asyncio.gather(*[worker(executor) for _ in range(self.pool.num_workers)])
+        if self.cache is not None:
+            self.cache.evict()
+
+    def breed(self, pool, index, pop_number, gen_number):
+        """
+        Produces a single child from the pool through cross-over and/or mutation (using roulette selection), or a
+        new random individual (replacement). Returns the interpreted child and whether it is a random individual
+        """
+        start = time.time()
+        num_individuals = len(pool)
+        rng = self.rng(pop_number, gen_number)
+
+        # A fraction of all submissions (equal to the replacement fraction) are new random individuals
+        immigrant = rng.uniform(0, 1) < self.replacement
+        rand_com = rng.uniform(0, 2)
+        rand_mut = rng.uniform(0, 1)
+        num_unique = len(set([individual.sentence for individual in pool]))
+        rand_com = rand_com + (1 - num_unique / num_individuals)
+
+        if immigrant:
+            child = Lsystem(self.axiom, rng.getrandbits(63))
+        elif rand_com <= 1:
+            temp = self.select_parents(pool, 1, rng)
+            child = self.crossover(temp[0], temp[1], rng)[0]
+            if rand_mut >= 0.5:
+                child = self.mutate(child, rng)
+        else:
+            temp = self.select_parents(pool, 2, rng)
+            child = self.mutate(temp[0], rng)
+        child.timings["selection"] = time.time() - start
+
+        # The child is interpreted (its image is stored during the interpretation, therefore the build includes it)
+        start = time.time()
+        temp = Interp(child.sentence, self.target, child.num_f)
+        child.pop_number = pop_number
+        child.gen_number = gen_number
+        child.coords = temp.draw(pop_number, gen_number, self.renderer)
+        child.raster = temp.raster
+        child.timings["build"] = time.time() - start
+
+        return child, immigrant
+
+    def evaluate_individual(self, individual, pop_number, gen_number, abort_distance=None, mesh=None, archive=True):
+        """
+        Evaluates a single individual (using the result cache if available) within its own job directory, at the
+        provided mesh level (the full level if not provided). If an abort distance is provided, the job is aborted
+        once it cannot be closer to the target angle. If archive is set, the design (as it is sent to the solver) is
+        appended to the coordinate archive, which is only done for newly produced designs
+        """
+        # FEM jobs are solved at the full mesh level unless another level is requested
+        if mesh is None and self.fidelity == "fem":
+            mesh = full_mesh
+        start = time.time()
+        export_data = export_to_json(individual.coords, self.target, pop_number, gen_number)
+        individual.timings["export"] = time.time() - start
+        individual.geometry_hash = design_hash(export_data)
+
+        parameters = None
+        if self.cache is not None or self.check_geometry:
+            with open(self.pool.parameters_path, 'r', encoding='utf-8') as f:
+                parameters = json.load(f)
+        repaired = self.repair_design(export_data, parameters)
+        if archive:
+            shared_archive(abs_storage_path).append(pop_number, gen_number, repaired)
+        export_data = self.check_design(individual, export_data, parameters, repaired)
+        if export_data is None:
+            return individual
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(export_data, parameters, self.cache_settings(mesh))
+            cached_angle = self.cache.get(key)
+            if cached_angle is not None:
+                individual.angle = cached_angle
+                individual.fidelity = self.fidelity
+                individual.mesh = mesh
+                return individual
+
+        job_dir = self.pool.job_dir(pop_number, gen_number, export_data, mesh_levels[mesh] if mesh else None)
+        if abort_distance is not None:
+            write_settings(job_dir, self.target_angle, abort_distance)
+        return self.record_result(individual, self.pool.evaluate(job_dir), job_dir, key, mesh)
+
+    def insert(self, pool, child, immigrant):
+        """
+        Inserts an evaluated child into the pool, replacing the worst individual. Elite individuals are never
+        replaced, and a bred child only replaces the worst individual if it is at least as close to the target angle
+        """
+        child.distance = genetic.distance(child, self.target_angle)
+        self.rank(pool, report=False)
+
+        worst = pool[-1]
+        num_elite = math.ceil(self.elitism * len(pool))
+        if len(pool) > num_elite and (immigrant or child.distance <= worst.distance):
+            pool[-1] = child
+        self.rank(pool, report=False)
+
+    def crossover(self, parent_1, parent_2, rng):
+        """Applies the cross-over variational operator to two parent individuals (see genetic.crossover)"""
+        return genetic.crossover(self.axiom, parent_1, parent_2, rng)
+
+    def evaluate_pop_fitness(self, individuals, target, pop_number):
+        """
+         Determines the fitness of all individuals through calling a FEM script and applying a fitness
+        function
+        """
+        # Sets the number of individuals
+        num_individuals = len(individuals)
+
+        # Individuals with identical interpretations (phenotypes) are grouped, where only one representative of each
+        # group is evaluated. Already solved individuals are preferred as representatives
+        phenotypes = [phenotype_hash(individual.coords) for individual in individuals]
+
+        # New individuals are evaluated at the generation's mesh level, while survivors (solved in a previous
+        # generation) require a result of the full level
+        level = self.mesh_level(pop_number)
+        meshes = [full_mesh if level is not None and individual.survivor and self.solved(individual) else level
+                  for individual in individuals]
+
+        representatives = {}
+        duplicates = []
+        for i in range(num_individuals):
+            if self.solved(individuals[i], meshes[i]):
+                representatives.setdefault(phenotypes[i], individuals[i])
+
+        # The duplicate rate of the generation is recorded and printed
+        num_duplicates = num_individuals - len(set(phenotypes))
+        self.duplicate_rates.append(num_duplicates / num_individuals)
+        print("Phenotype duplicates: " + str(num_duplicates) + " of " + str(num_individuals) + " individuals")
+
+        # Each individiauls' coordinates in the current generation is exported to a JSON
+        # file and each new individual is prepared for evaluation
+        pending = []
+        exports = []
+        keys = []
+        pending_meshes = []
+        # The actuator parameters form part of each design's cache key (and determine its feasibility)
+        parameters = None
+        if self.cache is not None or self.check_geometry:
+            with open(self.pool.parameters_path, 'r', encoding='utf-8') as f:
+                parameters = json.load(f)
+
+        for i in range(num_individuals):
+            individuals[i].gen_number = i
+            individuals[i].pop_number = pop_number
+            start = time.time()
+            export_data = export_to_json(individuals[i].coords, target, pop_number, i)
+            individuals[i].timings["export"] = time.time() - start
+            individuals[i].geometry_hash = design_hash(export_data)
+
+            # New designs are appended to the coordinate archive as they are sent to the solver (after their repair),
+            # survivors were archived in the generation that produced them
+            repaired = self.repair_design(export_data, parameters)
+            if not individuals[i].survivor:
+                shared_archive(abs_storage_path).append(pop_number, i, repaired)
+
+            # If individual already has an angle, then its evaluation will be skipped (to save
+            # computational costs). Individuals with only a surrogate prediction (or a result of another evaluation
+            # tier or a coarser mesh level) are evaluated again
+            if self.solved(individuals[i], meshes[i]):
+                continue
+
+            # Duplicates receive the result of their group's representative
+            if phenotypes[i] in representatives:
+                duplicates.append((individuals[i], representatives[phenotypes[i]]))
+                continue
+            representatives[phenotypes[i]] = individuals[i]
+
+            # Infeasible designs are rejected before they reach the solver (and their duplicates share the rejection)
+            export_data = self.check_design(individuals[i], export_data, parameters, repaired)
+            if export_data is None:
+                continue
+
+            # If an identical design has been solved before (in this or a previous run), the cached angle is used
+            key = None
+            if self.cache is not None:
+                key = self.cache.key(export_data, parameters, self.cache_settings(meshes[i]))
+                cached_angle = self.cache.get(key)
+                if cached_angle is not None:
+                    individuals[i].angle = cached_angle
+                    individuals[i].fidelity = self.fidelity
+                    individuals[i].mesh = meshes[i]
+                    self.learn(individuals[i])
+                    continue
+
+            pending.append(individuals[i])
+            exports.append(export_data)
+            keys.append(key)
+            pending_meshes.append(meshes[i])
+
+        # Only the most promising individuals (according to the surrogate) are evaluated, each within its own
+        # job directory
+        forwarded = self.screen(pending, pop_number)
+        job_dirs = [self.pool.job_dir(pop_number, pending[k].gen_number, exports[k],
+                                      mesh_levels[pending_meshes[k]] if pending_meshes[k] else None)
+                    for k in forwarded]
+        self.save_state("evaluating", pop_number, individuals)
+
+        # Jobs are aborted once they cannot beat the worst elite individual of the previous generation (the survivors
+        # a new design has to beat)
+        survivors = []
+        if pop_number > 0 and self.population:
+            survivors = self.population[-1][:math.ceil(self.elitism * len(self.population[-1]))]
+        abort_distance = self.abort_distance(survivors)
+        if abort_distance is not None:
+            for path in job_dirs:
+                write_settings(path, self.target_angle, abort_distance)
+
+        def record(index, angle):
+            # Each result is stored as soon as its evaluation has completed (and appended to the checkpoint's results
+            # journal, rather than re-writing the whole checkpoint)
+            k = forwarded[index]
+            self.record_result(pending[k], angle, job_dirs[index], keys[k], pending_meshes[k])
+            self.learn(pending[k])
+            if self.checkpoint_path:
+                append_result(self.checkpoint_path, pending[k])
+
+        # The evaluate function is called for all forwarded individuals, this function utilises a subprocess to
+        # launch Abaqus CAE (several evaluations are run at once if the pool allows more than one worker)
+        self.pool.run(job_dirs, record)
+        if self.cache is not None:
+            self.cache.evict()
+
+        for individual, representative in duplicates:
+            individual.angle = representative.angle
+            individual.fidelity = representative.fidelity
+            individual.mesh = representative.mesh
+
+        return self.rank(individuals)
+
+    def rank(self, individuals, report=True):
+        """
+        Ranks the evaluated individuals according to their distance from the target angle and applies the fitness
+        function (see genetic.rank)
+        """
+        genetic.rank(individuals, self.target_angle)
+
+        # The rankings of all individuals are printed along with the mean angle
+        if report:
+            print("=======")
+            for individual in individuals:
+                print("Individual_" + str(individual.pop_number) + "_" + str(individual.gen_number) + ": " + str(
+                    individual.sentence))
+                if individual.fidelity == "surrogate":
+                    print("Angle: " + str(round(individual.angle)) + " (surrogate prediction)")
+                elif individual.fidelity == "analytical":
+                    print("Angle: " + str(round(individual.angle)) + " (analytical estimate)")
+                elif individual.fidelity == "bound":
+                    print("Angle: " + str(round(individual.angle)) + " (bound, job aborted early)")
+                elif individual.fidelity == "infeasible":
+                    print("Angle: " + str(round(individual.angle)) + " (infeasible geometry)")
+                elif individual.mesh not in (None, full_mesh):
+                    print("Angle: " + str(round(individual.angle)) + " (" + individual.mesh + " mesh)")
+                else:
+                    print("Angle: " + str(round(individual.angle)))
+            print("=======" + str(sum(individual.angle for individual in individuals) / len(individuals)) +
+                  "=======")
+
+        return individuals
+
+    def verify(self, individuals, pop_number):
+        """
+        Re-evaluates the top designs (the elite individuals, at least one) without a result of the full mesh level,
+        until every top design has been verified at the full level (or failed to be). The individuals are ranked
+        again afterwards
+        """
+        if self.fidelity != "fem":
+            return individuals
+        num_verified = max(1, math.ceil(self.elitism * len(individuals)))
+        attempted = set()
+        unverified = [individual for individual in individuals[:num_verified]
+                      if not self.solved(individual, full_mesh)]
+        if not unverified:
+            return individuals
+
+        while unverified:
+            # The top designs were archived in the generation that produced them
+            with ThreadPoolExecutor(max_workers=self.pool.num_workers) as executor:
+                list(executor.map(lambda individual: self.evaluate_individual(individual, pop_number,
+                                                                              individual.gen_number, None, full_mesh,
+                                                                              archive=False),
+                                  unverified))
+            attempted.update([id(individual) for individual in unverified])
+            print("Verified " + str(len(unverified)) + " top designs at the full mesh level")
+            self.rank(individuals, report=False)
+            unverified = [individual for individual in individuals[:num_verified]
+                          if not self.solved(individual, full_mesh) and id(individual) not in attempted]
+        return self.rank(individuals)
+
+    def finish(self):
+        """
+        Verifies the top designs of the final generation at the full mesh level before they are reported
+        """
+        pop_number = len(self.population) - 1
+        self.population[-1] = self.verify(self.population[-1], pop_number)
+        self.save_state("complete", pop_number, self.population[-1])
+
+    def screen(self, pending, pop_number):
+        """
+        Selects the new individuals forwarded to the FEM solver. The surrogate's predicted angles are used to select
+        the individuals closest to the target angle (along with randomly chosen individuals for exploration), while
+        the remaining individuals receive the predicted angle
+        """
+        # All individuals are forwarded if pre-screening is disabled or the surrogate has too little training data
+        if self.surrogate is None or not self.surrogate.ready() or len(pending) < 2:
+            return list(range(len(pending)))
+
+        self.surrogate.fit()
+        predicted = self.surrogate.predict([extract_features(individual.coords, self.target)
+                                            for individual in pending])
+
+        # The individuals with the smallest predicted distance are forwarded, along with the exploration quota
+        num_forwarded = math.ceil(self.screen_fraction * len(pending))
+        num_explore = int(round(self.explore_fraction * num_forwarded))
+        order = [int(k) for k in np.argsort(np.abs(self.target_angle - predicted), kind="stable")]
+        forwarded = order[:num_forwarded - num_explore]
+        forwarded += self.rng(pop_number, 0, screen_stream).sample(order[num_forwarded - num_explore:], num_explore)
+
+        # The remaining individuals are tagged as surrogate predictions (these are never used as training data)
+        for k in range(len(pending)):
+            if k not in forwarded:
+                pending[k].angle = float(predicted[k])
+                pending[k].fidelity = "surrogate"
+        print("Surrogate screening: " + str(len(forwarded)) + " of " + str(len(pending)) + " individuals evaluated")
+
+        return sorted(forwarded)
+
+    def learn(self, individual):
+        """
+        Adds a solved individual to the surrogate's training data
+        """
+        # Failed evaluations (placeholder angle of 0) and bounds of aborted jobs are not used as training data
+        if self.surrogate is not None and self.solved(individual):
+            self.surrogate.add(extract_features(individual.coords, self.target), individual.angle)
+
+    def rng(self, pop_number, slot, stream=offspring_stream):
+        """
+        Returns the random generator of a slot within a generation, derived from the run seed (see genetic.slot_rng)
+        """
+        return genetic.slot_rng(self.seed, pop_number, slot, stream)
+
+    @staticmethod
+    def select_parents(sel_pool, case, rng):
+        """
+        Applies roulette selection (using the provided generator) to determine parent individuals
+        """
+        return genetic.select_parents(sel_pool, case, rng)
+
+    def mutate(self, parent, rng):
+        """
+        Produces an individual with a random number of rules re-generated (see genetic.mutate)
+        """
+        return genetic.mutate(self.axiom, parent, rng)
+
+    def generate_next_gen(self, individuals, pop_num):
+        """
+        Utilises selection rules to determine the composition of the next generation. Individuals that are carried
+        over are kept as they are, while new individuals are only specified (by their seed, or the seed and rules of a
+        bred individual) and generated by the population builder
+        """
+
+        # Variables are initialised and the number of individuals is set
+        new_individuals = []
+        temp_list = []
+        num_individuals = len(individuals)
+        selection_times = {}
+
+        # Setup replacement point for next generation
+        replacement_point = (num_individuals - (math.ceil(self.replacement * num_individuals)))
+        final_list = []
+        # Introduce elitism to new generation
+        for i in range(math.ceil(self.elitism * len(individuals))):
+            if i > 0 and individuals[i].sentence == individuals[i - 1].sentence:
+                new_individuals.append(self.rng(pop_num, i, elite_stream).getrandbits(63))
+            else:
+                new_individuals.append(individuals[i])
+        # Count number of unique individuals in the population
+        for j in range(num_individuals):
+            temp_list.append(individuals[j].sentence)
+        num_unique = len(np.unique(np.array(temp_list)))
+
+        # Apply genetic variation operators to rest of population (not elite/replaced)
+        i = math.ceil(self.elitism * num_individuals)
+        while i < replacement_point:
+            start = time.time()
+            num_produced = len(new_individuals)
+            # Every slot of the generation has its own generator, derived from the run seed, generation and slot
+            rng = self.rng(pop_num, i)
+
+            rand_com = rng.uniform(0, 2)
+            rand_mut = rng.uniform(0, 1)
+            rand_com = rand_com + (1 - num_unique / num_individuals)
+
+            # If angle is within 90% of targeted angle, individual is then kept
+            if round(individuals[i].angle) == round(self.target_angle * 90 / 100) and final_list.count(
+                    individuals[i].sentence) == 0:
+                new_individuals.append(individuals[i])
+
+                i += 1
+
+            # Apply cross-over as long as there are enough individuals available
+            # and if cross-over probability is activated
+            elif rand_com <= 1 and (replacement_point - i != 1):
+                temp = self.select_parents(individuals, 1, rng)
+                temp_object = genetic.crossover_specs(temp[0], temp[1], rng)
+                temp_1 = temp_object[0]
+                temp_2 = temp_object[1]
+                # Apply random mutation on cross-over individuals if mutation probability
+                # is activated
+                if rand_mut >= 0.5:
+                    temp_1 = genetic.mutate_spec(temp[0], rng, temp_object[0][1])
+                    temp_2 = genetic.mutate_spec(temp[0], rng, temp_object[1][1])
+
+                new_individuals.append(temp_1)
+                new_individuals.append(temp_2)
+                i += 2
+
+            # Apply only mutation to individual if mutation probability is activated
+            elif (rand_com > 1) or (replacement_point - i < 2):
+                temp = self.select_parents(individuals, 2, rng)
+                new_individuals.append(genetic.mutate_spec(temp[0], rng))
+                i += 1
+
+            # Error-case for development purposes (is used to pass selected parent if above results in error)
+            else:
+                new_individuals.append(self.select_parents(individuals, 2, rng)[0])
+                i += 1
+
+            # The individuals produced by selection and variation record the duration of their production (the
+            # children of a cross-over share it)
+            for k in range(num_produced, len(new_individuals)):
+                if isinstance(new_individuals[k], tuple):
+                    selection_times[k] = time.time() - start
+
+        # Introduce replacement to new generation
+        for k in range(math.ceil(self.replacement * num_individuals)):
+            new_individuals.append(self.rng(pop_num, k, replacement_stream).getrandbits(63))
+
+        # Individuals carried over from the previous generation are marked as survivors (their results are only
+        # re-used if they are of the full mesh level)
+        for individual in new_individuals:
+            if isinstance(individual, Lsystem):
+                individual.survivor = True
+
+        # All new individuals are generated and interpreted (as a single batch)
+        new_individuals = self.build_population(new_individuals, self.axiom, self.target, pop_num, self.renderer,
+                                                self.builder)
+        for k in selection_times:
+            new_individuals[k].timings["selection"] = selection_times[k]
+
+        print("")
+        return new_individuals
+
+    def random_gen(self, num_individuals):
+        """
+        Randomly generates a single population with the total number of individuals
+        equal to the number provided
+        """
+
+        # Generates, interprets and evaluates a single population
+        individuals = self.build_population([self.seed + 2 * i for i in range(num_individuals)], self.axiom,
+                                            self.target, 0, self.renderer, self.builder)
+
+        self.mode = "random"
+        self.start_run()
+        with tracing.span("evaluation", pop_number=0):
+            self.population.append(self.evaluate_pop_fitness(individuals, self.target, 0))
+        self.save_state("complete", 0, self.population[-1])
+        self.finish()
+
+
+# Storage setup
+script_dir = os.path.dirname(os.path.abspath(__file__))
+rel_path = "Abaqus"
+abs_file_path = os.path.join(script_dir, rel_path)
+rel_path = "Coordinate_storage"
+abs_storage_path = os.path.join(script_dir, rel_path)
+rel_path = "Cross-sections"
+abs_cross_section_path = os.path.join(script_dir, rel_path)
+rel_path = os.path.join("Abaqus", "Jobs")
+abs_jobs_path = os.path.join(script_dir, rel_path)
+rel_path = os.path.join("Abaqus", "Spool")
+abs_spool_path = os.path.join(script_dir, rel_path)
+
+# Tolerance (mm) of the exported contour's simplification, the largest distance of any interpreted pixel from the
+# simplified contour, and the largest spacing (mm) between the exported points of the contour
+contour_tolerance = 0.1
+contour_spacing = 1.0
+
+# Mesh settings (mesh_size and mesh_min) used by Abaqus_script.py at each mesh level, from the coarsest to the finest
+# level. The finest level is the full fidelity, at which the final results are reported
+mesh_levels = {"coarse": [6, 1.0], "fine": [3, 0.5]}
+full_mesh = "fine"
+
+
+def mesh_rank(mesh):
+    """Returns the position of a mesh level from the coarsest level (-1 for results without a mesh level)"""
+    if mesh not in mesh_levels:
+        return -1
+    return list(mesh_levels).index(mesh)
+
+
+def phenotype_hash(positions):
+    """Returns the hash of an interpreted cross-section's pixel positions (its phenotype)"""
+    return hashlib.sha1(np.asarray(positions, dtype=np.int32).tobytes()).hexdigest()
+
+
+def evaluate(job_dir=abs_file_path):
+    """Uses a subprocess to call the Abaqus python script from Abaqus CAE within the provided job directory"""
+    # The job directory is passed to the subprocess as its working directory, the process-wide working
+    # directory is therefore never changed (allowing several evaluations to run at once)
+    script_path = os.path.join(abs_file_path, 'Abaqus_script.py')
+    start = time.time()
+    with tracing.span("solver_process"):
+        subprocess.run('abaqus cae -noGUI "' + script_path + '"', shell=True, cwd=job_dir)
+    trace_solver_phases(job_dir, start)
+
+    # Resultant angle is read from the generated results (the last angle of the recorded trajectory)
+    return read_angle(job_dir)
+
+
+# The evaluator of each evaluation tier
+evaluators = {"fem": evaluate, "analytical": evaluate_analytical}
+
+
+def trace_solver_phases(job_dir, start, first_phase="cae_startup"):
+    """
+    Records the phases timed within Abaqus (written to timings.json by Abaqus_script.py) as spans, where the time
+    between starting the process (or submitting the job to a resident worker) and the start of preprocessing is
+    recorded as the first phase
+    """
+    timings = read_timings(job_dir)
+    if "cae_preprocessing" in timings:
+        tracing.record(first_phase, start, timings["cae_preprocessing"][0])
+    for phase in ("cae_preprocessing", "solve", "result_extraction"):
+        if phase in timings:
+            tracing.record(phase, timings[phase][0], timings[phase][1])
+
+
+def read_timings(job_dir):
+    """
+    Returns the (start, end) times of the phases timed within Abaqus (timings.json), empty if no timings were written
+    """
+    try:
+        with open(os.path.join(job_dir, 'timings.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_solver_timings(job_dir):
+    """
+    Returns the duration (in seconds) of each phase timed within Abaqus
+    """
+    return {phase: end - start for phase, (start, end) in read_timings(job_dir).items()}
+
+
+def export_to_json(positions, target, pop_number, gen_number, report=True):
+    """
+    Simplifies the contour of the position file, mirrors it and returns the data for Abaqus (which is appended to the
+    coordinate archive by the caller, once it has been repaired). If report is set, the reduction in the number of
+    points and the largest deviation of the simplified contour are printed
+    """
+    with tracing.span("export", pop_number=pop_number, gen_number=gen_number):
+        # The contour runs from the first position to the middle point (on the plane of symmetry)
+        half = np.vstack([np.asarray(positions, dtype=float).reshape(-1, 2), [[target[0], positions[-1][1]]]])
+
+        # The contour is simplified within the tolerance (a high number of points, such as the pixel steps of the
+        # interpretation, leads to complex shapes which require very refined mesh)
+        kept = simplify(half, contour_tolerance * 10, contour_spacing * 10)
+        deviation = max_deviation(half, kept) / 10
+        reduced = half[kept]
+
+        # Mirror data points (the middle point is not repeated) and resize coordinates (e.g. from 100 pixels to 10 mm)
+        mirrored = np.column_stack([2 * target[0] - reduced[-2::-1, 0], reduced[-2::-1, 1]])
+        export_data = (np.vstack([reduced, mirrored]) / 10).tolist()
+
+        if report:
+            print("Individual" + str(pop_number) + "_" + str(gen_number) + " contour: " + str(len(half)) + " -> " +
+                  str(len(reduced)) + " points (max deviation " + str(round(deviation, 3)) + " mm)")
+
+        return export_data
@@ -0,0 +1,200 @@
+# Jacques Terblanche
+# 22548602
+
+import numpy as np
+
+
+class FeasibilityChecker:
+    """
+    A FeasibilityChecker class that reproduces the geometry constructed by Abaqus_script.py from an exported design
+    (the outer contour of sketch A and the offset cavity contour of sketch B) and checks it before the design is sent
+    to the FEM solver. Designs whose geometry would fail in Abaqus CAE (or only return the placeholder angle) are
+    rejected, while designs with too closely spaced points are repaired.
+
+    Attributes
+    ----------
+    thickness : float
+        The thickness of the walls (mm), by which the cavity contour is offset from the outer contour
+    bottom_cavity_height : float
+        The distance between the start of the contour and the cavity floor (mm)
+    bottom_thickness : float
+        The thickness of the bottom layer (mm)
+    min_wall : float
+        The smallest allowed distance between the outer and cavity contours (mm)
+    min_cavity : float
+        The smallest allowed width of the cavity (mm)
+    min_spacing : float
+        The smallest allowed distance between consecutive points of the contours (mm)
+
+    Methods
+    ----------
+    cavity_contour(coords)
+        Returns the offset cavity contour and its closed outline (down to the cavity floor)
+    check(export_data)
+        Returns the reasons why the design's geometry is infeasible (empty if it is feasible)
+    repair(export_data)
+        Removes points of the exported design that are closer together than the minimum spacing
+    """
+
+    def __init__(self, parameters, min_wall_fraction=0.5, min_spacing=0.05):
+        """
+        Parameters
+        ----------
+        parameters : list
+            The actuator parameters (as in input_parameters.json)
+        min_wall_fraction : float, optional
+            The smallest allowed distance between the outer and cavity contours, as a fraction of the wall thickness
+            (Default is 0.5)
+        min_spacing : float, optional
+            The smallest allowed distance between consecutive points of the contours (Default is 0.05 mm)
+        """
+        self.thickness = parameters[1]
+        self.bottom_cavity_height = parameters[3]
+        self.bottom_thickness = parameters[4]
+        self.min_wall = min_wall_fraction * self.thickness
+        # A cavity may not be narrower than the walls surrounding it
+        self.min_cavity = self.thickness
+        self.min_spacing = min_spacing
+
+    def cavity_contour(self, coords):
+        """
+        Returns the cavity contour of the first cell as constructed by Abaqus_script.py (sketch B): the points of the
+        left half that remain left of the middle point after the offset are shifted inwards and down by the wall
+        thickness, followed by the middle point and the matching points of the right half. The outline closes the
+        contour with lines down to the cavity floor. None is returned if no point remains (the script fails)
+        """
+        middle = len(coords) // 2
+        left = coords[:middle]
+        left = left[left[:, 0] + self.thickness < coords[middle, 0]]
+        if len(left) == 0:
+            return None, None
+        right = coords[middle + (middle - len(left) + 1):]
+
+        half_width = (coords[-1, 0] - coords[0, 0]) / 2
+        contour = np.vstack([left + [self.thickness, -self.thickness], [[half_width, left[-1, 1] - self.thickness]],
+                             right + [-self.thickness, -self.thickness]])
+        floor = coords[0, 1] - self.bottom_cavity_height
+        outline = np.vstack([contour, [[contour[-1, 0], floor], [contour[0, 0], floor]]])
+        return contour, outline
+
+    def check(self, export_data):
+        """
+        Returns the reasons why the geometry of the exported design (mm) is infeasible, or an empty list if the design
+        can be built
+        """
+        coords = np.asarray(export_data, dtype=float)
+        problems = []
+        if len(coords) < 3:
+            return ["fewer than 3 contour points"]
+        contour, outline = self.cavity_contour(coords)
+        if contour is None:
+            return ["no cavity contour remains after the wall offset"]
+
+        # Consecutive points of the splines have to be distinct
+        for name, points in (("outer", coords), ("cavity", contour)):
+            spacing = np.hypot(*np.diff(points, axis=0).T)
+            if spacing.min() < self.min_spacing:
+                problems.append(name + " contour points closer than " + str(self.min_spacing) + " mm")
+
+        # The sketched contours may not cross themselves
+        if self_intersects(coords, closed=False):
+            problems.append("outer contour intersects itself")
+        if self_intersects(outline, closed=True):
+            problems.append("cavity contour intersects itself (offset walls cross)")
+
+        # The walls between the outer and cavity contours, and the cavity itself, have to be wide enough
+        wall = min(point_segment_distances(outline, coords[:-1], coords[1:]).min(),
+                   point_segment_distances(coords, outline, np.roll(outline, -1, axis=0)).min())
+        if wall < self.min_wall:
+            problems.append("wall thinner than " + str(round(self.min_wall, 3)) + " mm (" + str(round(wall, 3)) + ")")
+        cavity = min_gap(outline, 2 * self.thickness)
+        if cavity < self.min_cavity:
+            problems.append("cavity narrower than the wall thickness (" + str(round(cavity, 3)) + " mm)")
+
+        # The symmetry plane is found (findAt) within the bottom layer, one wall thickness below the cavity floor
+        if self.thickness >= self.bottom_thickness:
+            problems.append("symmetry plane lookup falls outside the bottom layer")
+        return problems
+
+    def repair(self, export_data):
+        """
+        Removes points of the exported design's contour that are closer than the minimum spacing to the previous kept
+        point. The first and middle points are always kept, and the contour remains symmetric
+        """
+        coords = np.asarray(export_data, dtype=float)
+        middle = len(coords) // 2
+        half = coords[:middle + 1]
+        kept = [0]
+        for k in range(1, len(half)):
+            if np.hypot(*(half[k] - half[kept[-1]])) >= self.min_spacing:
+                kept.append(k)
+            elif k == len(half) - 1:
+                # The middle point replaces the previous point
+                kept[-1] = k if len(kept) > 1 else kept[-1]
+        if kept[-1] != len(half) - 1:
+            kept.append(len(half) - 1)
+        if len(kept) == len(half):
+            return export_data
+
+        reduced = half[kept]
+        mirrored = np.column_stack([2 * reduced[-1, 0] - reduced[-2::-1, 0], reduced[-2::-1, 1]])
+        return np.vstack([reduced, mirrored]).tolist()
+
+
+def point_segment_distances(points, starts, ends):
+    """
+    Returns the distance of every point (rows) to every line segment (columns) between the start and end points
+    """
+    points = np.asarray(points, dtype=float)[:, None, :]
+    direction = ends - starts
+    length = np.einsum('ij,ij->i', direction, direction)
+    t = np.einsum('nij,ij->ni', points - starts, direction) / np.where(length == 0, 1, length)
+    projection = starts + np.clip(t, 0, 1)[:, :, None] * direction
+    return np.hypot(points[:, :, 0] - projection[:, :, 0], points[:, :, 1] - projection[:, :, 1])
+
+
+def self_intersects(points, closed=False):
+    """
+    Determines if any two non-adjacent segments of a polyline (or closed polygon) cross each other
+    """
+    points = np.asarray(points, dtype=float)
+    ends = np.roll(points, -1, axis=0) if closed else points[1:]
+    starts = points if closed else points[:-1]
+    num_segments = len(starts)
+
+    def orientation(a, b, c):
+        return np.sign((b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1]) -
+                       (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0]))
+
+    # Every pair of segments is tested at once: two segments cross if each separates the end points of the other
+    a, b = starts[:, None], ends[:, None]
+    c, d = starts[None, :], ends[None, :]
+    crossing = (orientation(a, b, c) * orientation(a, b, d) < 0) & (orientation(c, d, a) * orientation(c, d, b) < 0)
+
+    # Adjacent segments share an end point and are not tested
+    i, j = np.triu_indices(num_segments, k=2)
+    non_adjacent = ~(closed & (i == 0) & (j == num_segments - 1))
+    return bool(crossing[i[non_adjacent], j[non_adjacent]].any())
+
+
+def min_gap(points, separation):
+    """
+    Returns the narrowest width of a closed polygon: the smallest distance between a vertex and a segment that is
+    further than the separation away from it along the outline (nearby segments always form the vertex's corner)
+    """
+    points = np.asarray(points, dtype=float)
+    ends = np.roll(points, -1, axis=0)
+    distances = point_segment_distances(points, points, ends)
+
+    # The distance along the outline between each vertex and each segment (in either direction). A vertex at the end
+    # of a segment may be placed (almost) a full perimeter away by rounding errors, which is treated as no distance
+    lengths = np.hypot(*(ends - points).T)
+    position = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    perimeter = lengths.sum()
+    ahead = (position[None, :] - position[:, None]) % perimeter
+    behind = (position[:, None] - position[None, :] - lengths[None, :]) % perimeter
+    ahead[perimeter - ahead < 1e-9] = 0
+    behind[perimeter - behind < 1e-9] = 0
+    along = np.minimum(ahead, behind)
+    distances[along <= separation] = np.inf
+    return float(distances.min())
@@ -0,0 +1,142 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+
+class ResultCache:
+    """
+    A ResultCache class that persistently stores FEM results on disk, keyed by the content of the evaluated design.
+    Every result is stored in its own file which is written atomically, allowing several processes to read and
+    write to the same cache at once.
+
+    Attributes
+    ----------
+    path : str
+        The absolute path to the folder containing the cached results
+    max_entries : int
+        The maximum number of results kept in the cache (None for no limit)
+    max_age : float
+        The maximum age (in seconds) of a result, since it was stored, before it is evicted (None for no limit)
+
+    Methods
+    ----------
+    key(export_data, parameters, mesh_settings)
+        Determines the hash of an exported design along with the actuator parameters and mesh settings
+    get(key)
+        Returns the cached angle of the key, or None if the key has not been solved before
+    put(key, angle)
+        Stores the angle of the key
+    evict()
+        Removes results that are too old, followed by the least recently used results above the size limit
+    """
+
+    def __init__(self, path, max_entries=10000, max_age=None):
+        """
+        Parameters
+        ----------
+        path : str
+            The path to the folder containing the cached results (created if it does not exist)
+        max_entries : int, optional
+            The maximum number of results kept in the cache (Default is 10000)
+        max_age : float, optional
+            The maximum age (in seconds) of a result, since it was stored, before it is evicted (Default is no limit)
+        """
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def key(export_data, parameters, mesh_settings):
+        """
+        Determines the hash of an exported design (as written to input_data.json) along with the actuator
+        parameters and mesh settings used to evaluate it
+        """
+        # The content is serialised in a compact and repeatable format before hashing
+        content = json.dumps([export_data, parameters, mesh_settings], separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached angle of the key, or None if the key has not been solved before
+        """
+        file_path = self._file_path(key)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                angle = json.load(f)['angle']
+        except (OSError, ValueError, KeyError):
+            # Missing (or concurrently evicted) results are treated as not solved
+            return None
+
+        # The access time is recorded (as the file's modification time) so that least recently used results are
+        # evicted first
+        try:
+            os.utime(file_path)
+        except OSError:
+            pass
+        return angle
+
+    def put(self, key, angle):
+        """
+        Stores the angle of the key. The result is first written to a temporary file and then moved into place,
+        a reader therefore never sees a partially written result
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as f:
+                json.dump({'angle': angle, 'created': time.time()}, f)
+            os.replace(temp_path, self._file_path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def evict(self):
+        """
+        Removes results stored more than max_age ago, followed by the least recently used results above max_entries
+        """
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.path):
+            if not name.endswith('.json'):
+                continue
+            file_path = os.path.join(self.path, name)
+            try:
+                accessed = os.path.getmtime(file_path)
+            except OSError:
+                continue
+            if self.max_age is not None and now - self._created(file_path, accessed) > self.max_age:
+                self._remove(file_path)
+            else:
+                entries.append((accessed, file_path))
+
+        # The least recently accessed results are removed until the size limit is met
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            entries.sort()
+            for accessed, file_path in entries[:len(entries) - self.max_entries]:
+                self._remove(file_path)
+
+    def _file_path(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    @staticmethod
+    def _created(file_path, accessed):
+        # The time at which the result was stored (the access time if the result cannot be read)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['created']
+        except (OSError, ValueError, KeyError):
+            return accessed
+
+    @staticmethod
+    def _remove(file_path):
+        # Another process may already have removed the same result
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
@@ -0,0 +1,222 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import json
+import time
+import shutil
+import subprocess
+import spool
+import tracing
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+
+class EvaluationPool:
+    """
+    An EvaluationPool class to run several FEM evaluations at once, where each evaluation (job) is given its own
+    scratch directory containing its own input, parameter and result files.
+
+    Attributes
+    ----------
+    evaluator : function
+        The function called with a job directory that runs the FEM evaluation and returns the resultant angle
+    num_workers : int
+        The maximum number of evaluations that are run concurrently
+    scratch_root : str
+        The absolute path to the folder in which all job directories are created
+    parameters_path : str
+        The absolute path to the input_parameters.json file copied into every job directory
+    lean_output : bool
+        Requests lean output (only the tracked nodes are recorded and the large job files are removed) from every job
+    labels : dict
+        The population and generation number of the individual in each job directory (used for tracing)
+
+    Methods
+    ----------
+    job_dir(pop_number, gen_number, export_data, mesh_settings)
+        Creates a job directory containing the design and parameters of an individual and returns its absolute path
+    evaluate(path, submitted)
+        Evaluates a single job directory, tracing the time it waited for a worker
+    run(job_dirs, callback)
+        Evaluates all provided job directories using at most num_workers concurrent evaluations
+    """
+
+    def __init__(self, evaluator, num_workers, scratch_root, parameters_path, lean_output=False):
+        """
+        Parameters
+        ----------
+        evaluator : function
+            The function called with a job directory that runs the FEM evaluation and returns the resultant angle
+        num_workers : int
+            The maximum number of evaluations that are run concurrently
+        scratch_root : str
+            The absolute path to the folder in which all job directories are created
+        parameters_path : str
+            The absolute path to the input_parameters.json file copied into every job directory
+        lean_output : bool, optional
+            Requests lean output from every job (Default is False, the full output of Abaqus_script.py)
+        """
+        self.evaluator = evaluator
+        self.num_workers = max(1, int(num_workers))
+        self.scratch_root = os.path.abspath(scratch_root)
+        self.parameters_path = os.path.abspath(parameters_path)
+        self.lean_output = lean_output
+        self.labels = {}
+
+    def job_dir(self, pop_number, gen_number, export_data, mesh_settings=None):
+        """
+        Creates a job directory containing the exported design (input_data.json) and a copy of the actuator
+        parameters (input_parameters.json) for the specified individual. If provided, the mesh settings (mesh_size
+        and mesh_min) are appended to the parameters, followed by the lean output flag if lean output is requested
+        """
+        path = os.path.join(self.scratch_root, 'Individual' + str(pop_number) + '_' + str(gen_number))
+        # Results of a previous run are removed so that stale results (angle.txt or trajectory.json) are never read
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        if mesh_settings is None and not self.lean_output:
+            shutil.copyfile(self.parameters_path, os.path.join(path, 'input_parameters.json'))
+        else:
+            with open(self.parameters_path, 'r', encoding='utf-8') as f:
+                parameters = json.load(f)[:7]
+            # Without mesh settings, the script's own (full level) mesh settings are used
+            parameters += list(mesh_settings) if mesh_settings is not None else [None, None]
+            if self.lean_output:
+                parameters.append(True)
+            with open(os.path.join(path, 'input_parameters.json'), 'w', encoding='utf-8') as f:
+                json.dump(parameters, f, ensure_ascii=False, indent=4)
+        with open(os.path.join(path, 'input_data.json'), 'w', encoding='utf-8') as f:
+            json.dump(export_data, f, ensure_ascii=False, indent=4)
+        self.labels[path] = (pop_number, gen_number)
+
+        return path
+
+    def evaluate(self, path, submitted=None):
+        """
+        Evaluates a single job directory. If the time at which the job was submitted is provided, the time it waited
+        for a worker is traced
+        """
+        pop_number, gen_number = self.labels.get(path, (None, None))
+        with tracing.context(pop_number=pop_number, gen_number=gen_number):
+            if submitted is not None:
+                tracing.record("queue_wait", submitted, time.time())
+            return self.evaluator(path)
+
+    def run(self, job_dirs, callback=None):
+        """
+        Evaluates all provided job directories and returns the angles in the same order as the job directories.
+        If provided, callback(index, angle) is called (in the calling thread) as soon as each job has completed
+        """
+        angles = [None] * len(job_dirs)
+        submitted = time.time()
+
+        # A single worker is run in the calling thread (identical to the sequential behaviour)
+        if self.num_workers == 1 or len(job_dirs) <= 1:
+            for index, path in enumerate(job_dirs):
+                angles[index] = self.evaluate(path, submitted)
+                if callback is not None:
+                    callback(index, angles[index])
+            return angles
+
+        # Each job only uses its own directory, therefore the jobs can safely run in separate threads
+        # (the heavy lifting is done within the solver's own process)
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = {executor.submit(self.evaluate, path, submitted): index for index, path in enumerate(job_dirs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                angles[index] = future.result()
+                if callback is not None:
+                    callback(index, angles[index])
+        return angles
+
+
+class SpoolClient:
+    """
+    A SpoolClient class that dispatches job directories to resident evaluation workers (see spool.py) through a
+    spool directory. An instance is used as the evaluator of an EvaluationPool, where every pool thread waits on the
+    result of its own job.
+
+    Attributes
+    ----------
+    path : str
+        The absolute path to the spool directory
+    poll : float
+        The interval (in seconds) at which the spool is checked for results
+    timeout : float
+        The maximum time (in seconds) to wait for a result before the job is failed (None for no limit)
+    processes : list
+        The worker processes started by the client
+
+    Methods
+    ----------
+    start(num_workers, command)
+        Starts the provided number of worker processes
+    __call__(job_dir)
+        Evaluates the job directory on the workers and returns the resultant angle
+    close()
+        Requests all workers to exit and waits for the started processes
+    """
+
+    def __init__(self, path, poll=0.1, timeout=None):
+        """
+        Parameters
+        ----------
+        path : str
+            The path to the spool directory (created if it does not exist)
+        poll : float, optional
+            The interval (in seconds) at which the spool is checked for results (Default is 0.1)
+        timeout : float, optional
+            The maximum time (in seconds) to wait for a result before the job is failed (Default is no limit)
+        """
+        self.path = os.path.abspath(path)
+        self.poll = poll
+        self.timeout = timeout
+        self.processes = []
+        spool.make_spool(self.path)
+
+    def start(self, num_workers, command):
+        """
+        Starts the provided number of worker processes, where the quoted spool path is appended to the command
+        """
+        for k in range(num_workers):
+            self.processes.append(subprocess.Popen(command + ' "' + self.path + '"', shell=True,
+                                                   cwd=os.path.dirname(self.path)))
+
+    def __call__(self, job_dir):
+        """
+        Submits the job directory to the spool and waits for its result. A failed (or timed out) job returns the
+        placeholder angle of 0, identical to a failed Abaqus run
+        """
+        ticket = spool.submit(self.path, job_dir)
+        start = time.time()
+        while True:
+            result = spool.collect(self.path, ticket)
+            if result is not None:
+                break
+            # The job can never complete if all started workers have exited (e.g. after a license failure)
+            if self.processes and all([process.poll() is not None for process in self.processes]):
+                print("Job " + os.path.basename(job_dir) + " failed: all workers have exited")
+                return 0.0
+            if self.timeout is not None and time.time() - start > self.timeout:
+                # A job that has not been claimed yet is withdrawn from the queue
+                try:
+                    os.remove(os.path.join(self.path, 'queue', ticket + '.job'))
+                except OSError:
+                    pass
+                print("Job " + os.path.basename(job_dir) + " timed out")
+                return 0.0
+            time.sleep(self.poll)
+
+        if result['error']:
+            print("Job " + os.path.basename(job_dir) + " failed: " + result['error'])
+        return float(result['angle'])
+
+    def close(self):
+        """
+        Requests all workers to exit (after their current job) and waits for the started processes
+        """
+        spool.stop(self.path)
+        for process in self.processes:
+            process.wait()
+        self.processes = []
@@ -0,0 +1,68 @@
+# Jacques Terblanche
+# 22548602
+
+# Results written by Abaqus_script.py within a job directory. The module is also used by the Abaqus CAE server
+# (Abaqus/Abaqus_server.py), therefore it remains compatible with Abaqus's Python 2 kernel.
+#
+#   trajectory.json   The angle at every recorded increment ({"time": [...], "angle": [...], "step": [...],
+#                     "completed": bool}), where the resultant angle is that of the last increment. A job that was
+#                     aborted early (see job_monitor.py) also records the bound of its final angle ("bound": {"angle":
+#                     float, "side": "upper" or "lower", "load_fraction": float}), which is its resultant angle
+#   angle.txt         The resultant angle only (written by the other evaluators, or 0 if the job failed before its
+#                     results were extracted)
+#
+# A job whose solve did not complete (and was not aborted with a bound) failed, its partial trajectory is not used
+
+import os
+import json
+
+
+def read_trajectory(job_dir):
+    """
+    Returns the recorded trajectory of a job directory (None if the job did not write a trajectory or the trajectory
+    is incomplete, e.g. truncated when the job was interrupted)
+    """
+    path = os.path.join(job_dir, 'trajectory.json')
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except ValueError as error:
+        print("Job " + os.path.basename(os.path.normpath(job_dir)) + " wrote an unreadable trajectory (" +
+              str(error) + ")")
+        return None
+
+
+def read_bound(job_dir):
+    """
+    Returns the bound of the final angle of a job that was aborted early (None if the job was not aborted)
+    """
+    trajectory = read_trajectory(job_dir)
+    if trajectory is None:
+        return None
+    return trajectory.get('bound')
+
+
+def read_angle(job_dir):
+    """
+    Returns the resultant angle of a job directory: the bound of an aborted job's final angle, the last angle of the
+    trajectory (if it was recorded) or otherwise the angle in angle.txt. A job that did not write any results (e.g.
+    Abaqus could not be started, the license checkout failed or the solver crashed) or whose solve did not complete
+    returns the placeholder angle of 0, identical to a job that failed before its results were extracted
+    """
+    trajectory = read_trajectory(job_dir)
+    if trajectory is not None and trajectory.get('bound') is not None:
+        return float(trajectory['bound']['angle'])
+    if trajectory is not None and not trajectory.get('completed', True):
+        print("Job " + os.path.basename(os.path.normpath(job_dir)) + " did not complete, its angle is set to 0")
+        return 0.0
+    if trajectory is not None and trajectory['angle']:
+        return float(trajectory['angle'][-1])
+    try:
+        with open(os.path.join(job_dir, 'angle.txt'), 'r') as f:
+            return float(f.read())
+    except (IOError, ValueError) as error:
+        print("Job " + os.path.basename(os.path.normpath(job_dir)) + " wrote no results (" + str(error) +
+              "), its angle is set to 0")
+        return 0.0
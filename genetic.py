@@ -0,0 +1,159 @@
+# Jacques Terblanche
+# 22548602
+
+# The genetic operators of the evolution (ranking, selection, cross-over and mutation) and the derivation of each
+# slot's random generator. Together with l_syst.py (rewriting and interpretation) this forms the core of the
+# evolution, which only depends on the standard library and NumPy, therefore worker processes and short-lived scripts
+# can import it without loading the FEM, storage and rendering modules
+
+import random
+import numpy as np
+from l_syst import Lsystem
+
+# Random streams of each slot (offspring variation, replacement individuals, re-generated elites and the
+# surrogate's exploration quota)
+offspring_stream = 0
+replacement_stream = 1
+elite_stream = 2
+screen_stream = 3
+
+
+def slot_rng(seed, pop_number, slot, stream=offspring_stream):
+    """
+    Returns the random generator of a slot within a generation. Each generator is derived from the run seed,
+    generation, slot and stream through a seed sequence, therefore the generators are independent of each other
+    and of the order in which they are used
+    """
+    sequence = np.random.SeedSequence(seed, spawn_key=(pop_number, slot, stream))
+    return random.Random(int.from_bytes(sequence.generate_state(4).tobytes(), "little"))
+
+
+def distance(individual, target_angle):
+    """
+    Returns the absolute distance between the target angle and the individual's angle. Designs rejected for their
+    infeasible geometry have no angle (only the placeholder of 0) and receive the worst possible distance
+    """
+    if individual.fidelity == "infeasible":
+        return float("inf")
+    return abs(target_angle - individual.angle)
+
+
+def rank(individuals, target_angle):
+    """
+    Sorts the evaluated individuals according to their distance from the target angle and applies the fitness
+    function (the fitness scores of a generation sum to 1), where infeasible designs are ranked last
+    """
+    num_individuals = len(individuals)
+
+    # The absolute distance between the target angle and the individual's angle is calculated
+    for individual in individuals:
+        individual.distance = distance(individual, target_angle)
+
+    # Individuals are sorted in ascending order of distance
+    individuals.sort(key=lambda x: x.distance, reverse=False)
+
+    # The fitness function is applied to all individuals. See report for further information
+    for i in range(num_individuals):
+        individuals[i].ranking = (i + 1)
+        individuals[i].fitness = 2 * (num_individuals + 1 - individuals[i].ranking) / (
+                num_individuals * (num_individuals + 1))
+
+    return individuals
+
+
+def select_parents(sel_pool, case, rng):
+    """
+    Applies roulette selection (using the provided generator) to determine parent individuals
+    """
+    num_individuals = len(sel_pool)
+    # The fitness score for a cycle sums to 1 (with the chosen definition for fitness score)
+    total_sum = 1
+    # A random value is calculated for the initial partial sum
+    partial_sum = rng.uniform(0, 1)
+    # Parents 1 and 2 are initialised to the best two performing individuals
+    parent_1 = sel_pool[0]
+    parent_2 = sel_pool[1]
+
+    # Parent selection if cross-over is selected
+    if case == 1:
+        # With roulette selection, all individuals' fitness scores are added to the
+        # partial sum. The individual's who value pushes the partial sum to be greater
+        # than the total sum, is the chosen individual
+
+        # First parent
+        for i in range(num_individuals):
+            partial_sum += sel_pool[i].fitness
+            if partial_sum > total_sum:
+                parent_1 = sel_pool[i]
+                break
+
+        # Second parent
+        num_individuals = len(sel_pool)
+        partial_sum = rng.uniform(0, 1)
+
+        for i in range(num_individuals):
+            partial_sum += sel_pool[i].fitness
+
+            if partial_sum > total_sum:
+                parent_2 = sel_pool[i]
+
+                break
+
+        return parent_1, parent_2, sel_pool
+
+    # Parent selection for other cases
+    elif case == 2:
+        for i in range(num_individuals):
+            partial_sum += sel_pool[i].fitness
+
+            if partial_sum > total_sum:
+                parent_1 = sel_pool[i]
+
+        return parent_1, sel_pool
+
+
+def crossover_specs(parent_1, parent_2, rng):
+    """
+    Applies the cross-over variational operator to two parent individuals (using the provided generator) and returns
+    the (seed, rules) of both children, from which the children are generated (e.g. by the population builder)
+    """
+    # Randomly select cross-over points
+    cross_over_point_1 = rng.randrange(0, 3)
+    cross_over_point_2 = rng.randrange(0, 3)
+
+    # Choose child rules based on parents' cross-over points
+    child_1_rules = parent_1.rules[:cross_over_point_1] + parent_2.rules[cross_over_point_1:]
+    child_2_rules = parent_2.rules[:cross_over_point_2] + parent_1.rules[cross_over_point_2:]
+    # The seed of each child is only used if its rules have to be re-generated
+    return (rng.getrandbits(63), child_1_rules), (rng.getrandbits(63), child_2_rules)
+
+
+def mutate_spec(parent, rng, rules=None):
+    """
+    Returns the (seed, rules) of a child with a random number of the parent's rules (or of the provided rules, e.g.
+    of a cross-over child) re-generated (using the provided generator)
+    """
+    num_mutations = rng.randrange(1, 3)
+
+    # The random generated number of mutations are each applied to a copy of the parent's rules
+    # (the parent's rules are left unchanged)
+    child_rules = list(parent.rules if rules is None else rules)
+    for x in range(num_mutations):
+        rule_num = rng.randrange(0, 6)
+        child_rules[rule_num] = parent.l_mutate(rng)
+
+    return rng.getrandbits(63), child_rules
+
+
+def crossover(axiom, parent_1, parent_2, rng):
+    """Applies the cross-over variational operator to two parent individuals (using the provided generator)"""
+    (seed_1, rules_1), (seed_2, rules_2) = crossover_specs(parent_1, parent_2, rng)
+    return Lsystem(axiom, seed_1, rules_1), Lsystem(axiom, seed_2, rules_2)
+
+
+def mutate(axiom, parent, rng):
+    """
+    Produces an individual with a random number of rules re-generated (using the provided generator)
+    """
+    seed, rules = mutate_spec(parent, rng)
+    return Lsystem(axiom, seed, rules)
@@ -0,0 +1,231 @@
+# Jacques Terblanche
+# 22548602
+
+# Early abort of Abaqus jobs that cannot reach the target angle. The monitor is run by Abaqus_script.py while the job
+# is solving (therefore it remains compatible with Abaqus's Python 2 kernel): it tails the job's status file (.sta),
+# reads the tracked nodes' angle whenever a new increment of the Pressure step has converged and extrapolates the
+# angle to the full pressure load. The job is killed once even this (optimistic) prediction is further from the target
+# angle than the worst surviving individual, in which case the prediction is recorded as a bound of the final angle.
+#
+# The evolution requests monitoring by writing monitor.json ({"target_angle": float, "worst_distance": float,
+# "monitor_path": str}) to the job directory, where the monitor path is the folder of this module (imported from there
+# by Abaqus_script.py). Jobs without this file are never aborted
+
+import os
+import json
+import time
+from math import log
+
+# Number (in the .sta file) of the step during which the pressure load is ramped up
+pressure_step = 2
+
+
+def write_settings(job_dir, target_angle, worst_distance):
+    """
+    Requests monitoring of the job in the job directory, aborting it once it cannot be closer to the target angle
+    than the worst distance
+    """
+    with open(os.path.join(job_dir, 'monitor.json'), 'w') as f:
+        json.dump({'target_angle': target_angle, 'worst_distance': worst_distance,
+                   'monitor_path': os.path.dirname(os.path.abspath(__file__))}, f)
+
+
+def read_settings(job_dir):
+    """
+    Returns the monitoring settings of the job directory (None if the job is not monitored)
+    """
+    path = os.path.join(job_dir, 'monitor.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def parse_status_line(line):
+    """
+    Returns the step, increment, total time and step time of a converged increment in a line of the .sta file (None
+    for any other line, including attempts that were cut back)
+    """
+    fields = line.split()
+    if len(fields) < 9:
+        return None
+    try:
+        increment = {'step': int(fields[0]), 'increment': int(fields[1]), 'attempt': int(fields[2]),
+                     'total_time': float(fields[6]), 'step_time': float(fields[7])}
+    except ValueError:
+        return None
+    return increment
+
+
+def predict_angle(samples, max_exponent=3.0):
+    """
+    Extrapolates the angle to the full pressure load from the (load fraction, angle) samples of the Pressure step. The
+    growth of the angle since the first sample is fitted with a power law through the last two samples, where the
+    exponent is limited to [1, max_exponent] so that the prediction errs on the side of a larger angle
+    """
+    fraction, angle = samples[-1]
+    first_fraction, first_angle = samples[0]
+    growth = angle - first_angle
+    if fraction >= 1 or fraction <= first_fraction or growth <= 0:
+        return min(angle, 90.0)
+
+    exponent = 1.0
+    if len(samples) > 2:
+        previous_fraction, previous_angle = samples[-2]
+        previous_growth = previous_angle - first_angle
+        if previous_growth > 0 and growth > previous_growth and first_fraction < previous_fraction < fraction:
+            exponent = log(growth / previous_growth) / log((fraction - first_fraction) /
+                                                           (previous_fraction - first_fraction))
+    exponent = min(max(exponent, 1.0), max_exponent)
+
+    # The angle is measured between the end nodes and can therefore not exceed 90 degrees
+    return min(first_angle + growth * ((1 - first_fraction) / (fraction - first_fraction)) ** exponent, 90.0)
+
+
+class JobMonitor:
+    """
+    A JobMonitor class that follows a running job through its .sta file and decides whether it should be aborted
+
+    Attributes
+    ----------
+    job_dir : str
+        The directory in which the job is run
+    job_name : str
+        The name of the job (the .sta and .log files are named after it)
+    target_angle : float
+        The targeted bending angle
+    worst_distance : float
+        The distance to the target angle of the worst surviving individual
+    read_angles : function
+        Returns the (step time, angle) of every recorded increment of the Pressure step
+    min_fraction : float
+        The fraction of the pressure load that has to be applied before a job may be aborted
+    poll : float
+        The time (in seconds) between reads of the status file
+    increments : list
+        The converged increments of the job
+    samples : list
+        The (load fraction, angle) of the Pressure step's recorded increments
+    status : str
+        "running", "completed" or "failed" (as reported at the end of the .sta or .log file)
+    bound : dict
+        The bound of the final angle if the job was aborted (None otherwise)
+
+    Methods
+    ----------
+    read_status()
+        Reads the lines added to the .sta file and returns the newly converged increments
+    check()
+        Updates the angle samples and returns the bound of the final angle if the job should be aborted
+    watch(kill)
+        Checks the job until it has finished, killing it if it should be aborted
+    """
+
+    def __init__(self, job_dir, settings, read_angles, job_name='Job-1', min_fraction=0.2, poll=1.0):
+        """
+        Parameters
+        ----------
+        job_dir : str
+            The directory in which the job is run
+        settings : dict
+            The monitoring settings of the job (target_angle and worst_distance)
+        read_angles : function
+            Returns the (step time, angle) of every recorded increment of the Pressure step
+        job_name : str, optional
+            The name of the job (Default is Job-1)
+        min_fraction : float, optional
+            The fraction of the pressure load that has to be applied before a job may be aborted (Default is 0.2)
+        poll : float, optional
+            The time (in seconds) between reads of the status file (Default is 1)
+        """
+        self.job_dir = job_dir
+        self.job_name = job_name
+        self.target_angle = settings['target_angle']
+        self.worst_distance = settings['worst_distance']
+        self.read_angles = read_angles
+        self.min_fraction = min_fraction
+        self.poll = poll
+        self.increments = []
+        self.samples = []
+        self.status = 'running'
+        self.bound = None
+        self.offset = 0
+        self.partial = ''
+
+    def read_status(self):
+        """
+        Reads the lines added to the .sta file since the previous read and returns the newly converged increments. A
+        line that is still being written is kept until it is completed
+        """
+        path = os.path.join(self.job_dir, self.job_name + '.sta')
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        lines = (self.partial + data.decode('ascii', 'ignore')).split('\n')
+        self.partial = lines.pop()
+
+        new_increments = []
+        for line in lines:
+            if 'COMPLETED SUCCESSFULLY' in line:
+                self.status = 'completed'
+            elif 'NOT BEEN COMPLETED' in line:
+                self.status = 'failed'
+            increment = parse_status_line(line)
+            if increment is not None:
+                new_increments.append(increment)
+        self.increments += new_increments
+        return new_increments
+
+    def finished(self):
+        """
+        Returns whether the job has finished, according to its .sta file or (for jobs that stopped before the
+        analysis started) the end of its .log file
+        """
+        if self.status != 'running':
+            return True
+        path = os.path.join(self.job_dir, self.job_name + '.log')
+        if not os.path.exists(path):
+            return False
+        with open(path, 'r') as f:
+            log_end = f.read()[-200:]
+        return 'COMPLETED' in log_end or 'exited with error' in log_end
+
+    def check(self):
+        """
+        Reads the job's progress and returns the bound of the final angle if the job can no longer be closer to the
+        target angle than the worst surviving individual (None otherwise). The angle only grows with the pressure load,
+        therefore a job that already overshoots the target by too much is bounded from below by its current angle and
+        a job whose predicted final angle falls too short is bounded from above by the prediction
+        """
+        new_increments = self.read_status()
+        if not [increment for increment in new_increments if increment['step'] == pressure_step]:
+            return None
+
+        self.samples = [(step_time, angle) for step_time, angle in self.read_angles()]
+        if len(self.samples) < 2 or self.samples[-1][0] < self.min_fraction:
+            return None
+        fraction, angle = self.samples[-1]
+
+        if angle - self.target_angle > self.worst_distance:
+            return {'angle': angle, 'side': 'lower', 'load_fraction': fraction}
+        predicted = predict_angle(self.samples)
+        if self.target_angle - predicted > self.worst_distance:
+            return {'angle': predicted, 'side': 'upper', 'load_fraction': fraction}
+        return None
+
+    def watch(self, kill):
+        """
+        Checks the job until it has finished. If the job should be aborted, kill() is called and the bound of its
+        final angle is kept
+        """
+        while not self.finished():
+            bound = self.check()
+            if bound is not None:
+                self.bound = bound
+                kill()
+                return bound
+            time.sleep(self.poll)
+        return None
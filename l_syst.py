@@ -1,579 +1,850 @@
-# Jacques Terblanche
-# 22548602
-
-import matplotlib.pyplot as plt
-import random
-from PIL import Image
-import math
-import numpy as np
-import os
-
-
-class Lsystem:
-    """
-    A Lsystem class for each individual in the generated population
-
-    Attributes
-    ----------
-    axiom : str
-        The starting character of the L-system
-    seed : int
-        A number to initialise the program's randomness
-    alphabet : list
-        The characters available for rule successor creation
-    alphabet_pred : list
-        The characters available for rule predecessor creation
-    rules : list
-        The set of rules generated for each individual
-    sentence : str
-        The resultant sentence from applying the rules to the axiom
-    gen_number : int
-        The individual's storage number within the current generation
-    pop_number : int
-        The population number which constraints this individual
-    angle : float
-        The evaluated angle result from this cross-section at current actuator parameters
-    fitness : float
-        The fitness score of the individual's angle against the population
-    ranking : int
-        The ranked position (according to the fitness score) of this individual within the population
-    distance : float
-        A distance metric calculated relative against the population used in the calculation of the fitness score
-
-    Methods
-    ----------
-    gen_rules(seed, num_rules)
-        Generate rules through combining random pre-deccessor and successor selections
-    form_string(sentence, rules)
-        Apply the rules to the current sentence to receive the new sentence
-    generate(iterations, rules)
-        Call the form_string method recursively for the specified number of iterations
-    l_mutate(individual, seed)
-        Re-generate a random rule from the rules-set
-    random_succ()
-        Produce a random combination of alphabet letters
-    """
-
-    def __init__(self, axiom, seed, generated_rules=None):
-        """
-        Parameters
-        ----------
-        axiom : str
-            The starting character of the L-system
-        seed : int
-            A number to initialise the program's randomness
-        generated_rules : list, optional
-            The rules to create the individual (Default is empty)
-        """
-        num_rules = 6  # The number of rule sets per individual
-        iterations = 8  # The number of iterations that the rules will be applied to the sentence
-        self.axiom = axiom
-        self.alphabet = ["A", "B", "C", "D", "F", "E", "F", "H", "G", "-", "+", "F", "-", "+", "F", "-", "+", "", "{",
-                         "}"]
-        self.alphabet_pred = ["A", "B", "C", "D", "E", "F", "H", "G"]
-        self.rules = []
-
-        # Initialise class attributes modified by evolve script
-        self.gen_number = int()
-        self.pop_number = int()
-        self.angle = float()
-        self.fitness = []
-        self.ranking = []
-        self.distance = float()
-        self.coords = list()
-
-        # Generates rules if not provided
-        if not generated_rules:
-            self.gen_rules(seed, num_rules)
-        else:
-            self.rules = generated_rules
-
-        # Apply rules to receive sentence
-        self.sentence = self.generate(iterations, self.rules)  # Number of iterations
-
-        # Ensure that sentence is viable (contains F characters) and if not to re-generate the sentence
-        j = 0
-        while self.sentence == -1001:
-            j += 1
-            self.rules = []
-            self.gen_rules(j + seed, num_rules)
-            self.sentence = self.generate(iterations, self.rules)
-        # Add additional "F" at end of sentence - > lowers number of straight line cross-sections generated
-        self.sentence = self.sentence + "F"
-
-    def gen_rules(self, seed, num_rules):
-        """
-        Based on the number of rules and seed specified, this randomly combines this number of rules
-        """
-        # Initialise following string variables
-        pred = str()
-        succ = str()
-        # Initialise RNG with seed
-        random.seed(seed)
-        np.random.seed(seed)
-
-        # Create the specified number of rules (pre-determined)
-        for i in range(num_rules):
-            if i == 0:
-                pred = "A"
-                # For each successor, a random combination of defined alphabet characters are chosen
-                succ = random.choice(self.alphabet) + random.choice(self.alphabet) + random.choice(
-                    self.alphabet_pred) + random.choice(
-                    self.alphabet)
-            elif i == 1:
-                pred = "B"
-                succ = self.random_succ()
-            elif i == 2:
-                pred = "C"
-                succ = self.random_succ()
-            elif i == 3:
-                pred = "D"
-                succ = self.random_succ()
-            elif i == 4:
-                pred = "E"
-                succ = self.random_succ()
-            elif i == 5:
-                pred = "G"
-                succ = self.random_succ()
-            elif i == 6:
-                pred = "H"
-                succ = self.random_succ()
-
-            self.rules.append([pred, succ])
-
-    def generate(self, iterations, rules):
-        """
-        Recursively calls form_string to apply the rules for the specified iterations
-        """
-        # Assigns the axiom to the initial sentence
-        self.sentence = self.axiom
-        # Initialises the number of F's in the string to zero
-        num_f = 0
-
-        # Recursively calls the form_string function for the specified number of iterations
-        for count in range(iterations - 1):
-            self.sentence = self.form_string(self.sentence, rules)
-        # Counts the number of F's in the string
-        for j in range(len(self.sentence)):
-            if self.sentence[j] == "F":
-                num_f += 1
-        if num_f > 0:
-            return self.sentence
-        else:
-            # If no F's are present in the string, an error code is returned
-            return -1001
-
-    def l_mutate(self):
-        """
-        Generates random new rule to replace old rule
-        """
-        new_rule = random.choice(self.alphabet) + random.choice(self.alphabet) + random.choice(
-            self.alphabet) + random.choice(self.alphabet) + random.choice(self.alphabet)
-
-        return new_rule
-
-    def random_succ(self):
-        """
-        Randomly generates a combination of characters selected from a pre-defined alphabet
-        """
-        return random.choice(self.alphabet) + random.choice(self.alphabet) + random.choice(
-            self.alphabet) + random.choice(self.alphabet) + random.choice(self.alphabet)
-
-    @staticmethod
-    def form_string(sentence, rules):
-        """
-        Applies the rules to each character in the sentence
-        """
-        # Initialise the new sentence string
-        new_sentence = str()
-        # Each character in the provided sentence string is compared to each rule.
-        # If the rule is applicable, then the sentence's ith character is replaced by the
-        # rules' successor.
-        for i in range(len(sentence)):
-
-            if sentence[i] == rules[0][0]:
-                new_sentence += rules[0][1]
-            elif sentence[i] == rules[1][0]:
-                new_sentence += rules[1][1]
-            elif sentence[i] == rules[2][0]:
-                new_sentence += rules[2][1]
-            elif sentence[i] == rules[3][0]:
-                new_sentence += rules[3][1]
-            elif sentence[i] == rules[4][0]:
-                new_sentence += rules[4][1]
-            elif sentence[i] == rules[5][0]:
-                new_sentence += rules[5][1]
-            else:
-                new_sentence += sentence[i]
-        return new_sentence
-
-
-class Interp:
-    """
-    A Interp class for each interpreted individual in the generated population.
-
-    Attributes
-    ----------
-    sentence : str
-        The generated string from the l-system
-    target : list
-        A list containing the x and y user-specified targeted coordinates
-    img : list
-        A list of lists containing each pixel position and colour (255,255,255)
-    positions : list
-        A list of floats containing all pixel positions that will be exported to Abaqus CAE
-
-    Methods
-    ----------
-    direction_change(operator, direction, last_operator)
-        Changes the direction according to the user's target parameters. Ensures that pixel placement does
-        not occur outside of boundaries (condition) and that it adheres to defined direction limitations.
-    draw(pop_number, gen_number)
-        Interprets all characters in the generated sentence string, and places appropriate pixels
-    get_temp_pos(direction, current_pos)
-        Obtains the next possible pixel placement location according to the current position and direction
-    check_neighbours(pos)
-        Checks if the provided pixel placement location is viable according to the defined placement rules
-
-    """
-
-    def __init__(self, sentence, target):  # Initialises the class with the input parameters
-        """
-        Parameters
-        ----------
-        sentence : str
-            The generated string from the l-system
-        target : list
-            A list containing the x and y user-specified targeted coordinates
-
-        """
-        self.sentence = sentence
-        self.target = target
-
-        # Initialises the cross-section image/grid with the dimensions of the target
-        # and the position list with a starting entry
-        self.img = Image.new('RGB', (self.target[0], self.target[1]), (255, 255, 255))
-        self.positions = [[0, 0]]
-
-        # Recounts the number of F's in the sentence string
-        num_f = 0
-        for j in range(len(self.sentence)):
-            if self.sentence[j] == "F":
-                num_f += 1
-        # Determines the number of pixels placed per instance of character interpretation
-
-        self.num_pixel_placement = math.ceil(self.target[0] / num_f)  # The width is divided by the number
-        # of pixel placement operators (F)
-
-    @staticmethod
-    def direction_change(operator, direction, last_operator):
-        """
-        Determines the new direction and last operator used based on the current direction and operator
-        """
-        if operator == "-":
-            direction -= 1
-            last_operator = "-"
-        if operator == "+":
-            direction += 1
-            last_operator = "+"
-
-        if direction < 1:
-            direction = 3
-        if direction > 3:
-            direction = 1
-        return direction, last_operator
-
-    def draw(self, pop_number, gen_number):
-        """
-        Uses the generated sentence to plot pixels according to their determined positions
-        """
-        # The current direction, number of "F"s and last_operator is initialised
-        num_f = 0
-        last_operator = "+"
-        current_dir = 1
-        # An initial pixel is placed at (0,0)
-        self.img.putpixel((0, 0), (0, 0, 0))  # Always starts with a pixel at 0,0
-
-        # The content between curly braces is repeated 3 times (number can be optimised)
-        self.sentence = get_repeated(self.sentence, 3)
-
-        # A while loop is implemented as a custom for loop (this is to allow loop decrements)
-        # Initialise the for loop with i = 0
-        i = 0
-        while not i == len(self.sentence):
-
-            # Direction change operators
-            if self.sentence[i] == "-" or self.sentence[i] == "+":
-                current_dir, last_operator = self.direction_change(self.sentence[i], current_dir, last_operator)
-            # Pixel placement operator
-            if self.sentence[i] == "F":
-
-                # The pixel is placed at the determined position and repeated for num_pixel_placement times
-                for k in range(self.num_pixel_placement):
-                    temp_pos = self.get_temp_pos(current_dir, self.positions[num_f])
-                    check = self.check_neighbours(temp_pos, self.target, self.img)
-
-                    # If the pixel placement borders a valid number of neighbours, then the pixel is placed and the
-                    # position is recorded
-                    if check == 1:
-                        num_f += 1
-                        self.positions.append(temp_pos)
-                        self.img.putpixel((self.positions[num_f][0], self.positions[num_f][1]), (0, 0, 0))
-
-                    # If the number of neighbours is invalid, then the previous operator is re-applied and the process
-                    # repeats
-                    elif check == 4:
-                        current_dir, last_operator = self.direction_change(last_operator, current_dir, last_operator)
-                        i -= 1
-                    # If the current operators and location is completely invalid, then the system passes the current
-                    # placement
-                    elif check == 3:
-                        pass
-            i += 1
-
-        # If the grid still has space in the x-direction, then this is filled with the following
-        # for loop
-
-        for j in range(self.target[0] - self.positions[-1][0]):
-            self.img.putpixel((self.positions[num_f][0] + j, self.positions[num_f][1]), (0, 0, 0))
-            self.positions.append((self.positions[num_f][0] + j, self.positions[num_f][1]))
-
-        # The grid is shown, named and stored in a folder
-        plt.imshow(self.img)
-        ax = plt.gca()
-        ax.invert_yaxis()
-        plt.axis("off")
-
-        script_dir = os.path.dirname(__file__)
-        rel_path = "Cross-sections"
-        abs_file_path = os.path.join(script_dir, rel_path)
-
-        os.chdir(abs_file_path)
-        filename = 'Individual_' + str(pop_number) + '_' + str(gen_number) + '.png'
-
-        plt.savefig(filename, format="png", dpi=10)
-        plt.show()
-        plt.close()
-        os.chdir(script_dir)
-
-        return self.positions
-
-    @staticmethod
-    def get_temp_pos(direction, current_pos):
-        """
-        Determines the next possible pixel placement location based on th current direction and position
-        """
-        x = current_pos[0]
-        y = current_pos[1]
-
-        # The directions are pre-defined. See the final report for an illustration of the
-        # direction placement.
-
-        if direction == 0:
-            x += 1
-            y -= 1
-        elif direction == 1:
-            x += 1
-        elif direction == 2:
-            x += 1
-            y += 1
-        elif direction == 3:
-            y += 1
-
-        return x, y
-
-    @staticmethod
-    def check_neighbours(pos, target, img):
-        """
-        Determines if the provided position is valid according to pre-defined rules (based on target)
-        """
-        internal = 1  # condition to indicate if internal or edge case
-        condition = 0  # condition to track number of interactions
-        # Check canvas size limitations
-        if pos[0] < 0:
-            return 3
-        elif pos[1] < 0:
-            return 3
-        elif pos[0] >= target[0]:
-            return 3
-        elif pos[1] >= target[1]:
-            return 3
-
-        # The following logic first checks all edge cases for potential pixel neighbours,
-        # if an internal case is identified, then all internal cases are similarly checked
-
-        # Check sides on edge cases
-
-        if pos[0] == 0 and (0 < pos[1] < target[1] - 1):  # Left limit case only
-            # Check top
-            condition += 1
-            internal = 0
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-
-        elif pos[0] == target[0] - 1 and (0 < pos[1] < target[1] - 1):  # Right limit case only
-            condition += 1
-            internal = 0
-            # Check top
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-
-        elif pos[1] == 0 and (0 < pos[0] < target[0] - 1):  # Bottom limit case only
-            condition += 1
-            internal = 0
-            # Check top
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-        elif pos[1] == target[1] - 1 and (0 < pos[0] < target[0] - 1):  # Top limit case only
-            condition += 1
-            internal = 0
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-
-        elif pos[0] == 0 and pos[1] == 0:  # Left limit and Bottom limit case
-            condition += 1
-            internal = 0
-            # Check top
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-
-        elif pos[0] == target[0] - 1 and pos[1] == 0:  # Right limit and Bottom limit case
-            condition += 1
-            internal = 0
-            # Check top
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-
-        elif pos[0] == 0 and pos[1] == target[1] - 1:  # Left limit and Top limit case
-            condition += 1
-            internal = 0
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-
-        elif pos[0] == target[0] - 1 and pos[1] == target[1] - 1:  # Right limit and Top limit case
-            condition += 1
-            internal = 0
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-
-        # If one of the above cases is not true, then internal will equal to 1. Resulting
-        # in the following logic being executed
-
-        # Check sides on internal cases
-        if not internal == 0:
-            # Check top
-            if img.getpixel((pos[0], pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check left
-            if img.getpixel((pos[0] - 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check right
-            if img.getpixel((pos[0] + 1, pos[1])) == (0, 0, 0):
-                condition += 1
-            # Check below
-            if img.getpixel((pos[0], pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-            # Check below left
-            if img.getpixel((pos[0] - 1, pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-            # Check below right
-            if img.getpixel((pos[0] + 1, pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-            # Check top right
-            if img.getpixel((pos[0] + 1, pos[1] + 1)) == (0, 0, 0):
-                condition += 1
-            # Check top left
-            if img.getpixel((pos[0] + 1, pos[1] - 1)) == (0, 0, 0):
-                condition += 1
-
-            # If the interior case pixel location has 2 or fewer neighbours,
-            # then the programs return a successful code (1). Otherwise, an
-            # unsuccessful code (4) is returned
-
-            if condition <= 2:
-                return 1
-            else:
-                return 4
-
-        # If the exterior case pixel location has 2 neighbours,
-        # then the programs return a successful code (1). Otherwise, an
-        # unsuccessful code (4) is returned
-
-        if condition == 2:
-            return 1
-        else:
-            return 4
-
-
-def get_in_brackets(sen):
-    """
-    Returns each level of content located within curly brackets. Note this function is modified
-    from a stackoverflow user's response :
-    https://stackoverflow.com/questions/4284991/parsing-nested-parentheses-in-python-grab-content-by-level
-    """
-
-    # A push/pop is implemented, with a list, to locate the content within nested curly braces
-    stack = []
-
-    for i, c in enumerate(sen):
-        if c == '{':
-            stack.append(i)
-        elif c == '}' and stack:
-            start = stack.pop()
-            yield sen[start + 1: i]
-
-
-def get_repeated(content, n):
-    """
-    Multiplies nested levels of content within curly brackets
-    """
-    inner = list(get_in_brackets(content))
-    sen = content
-
-    # The inner sentence content of each layer is multiplied by n.
-    j = len(inner) - 1
-    new_sen = sen
-    while j != -1:
-        new_sen = new_sen.replace("{" + inner[j] + "}", n * inner[j])
-        j -= 1
-
-    return new_sen
+# Jacques Terblanche
+# 22548602
+
+# The rewriting and interpretation of the L-systems, which only depend on the standard library and NumPy (the
+# rendering backend, render.py, is imported on first use)
+
+import random
+import math
+import numpy as np
+import os
+from functools import lru_cache
+import tracing
+
+# By default, interpreted cross-sections are stored as images in the Cross-sections folder (see default_renderer)
+cross_section_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cross-sections")
+_default_renderer = None
+
+# The maximum sentence length (in characters, once the content of its curly braces is repeated) allowed by default,
+# rules producing longer sentences are re-generated
+sentence_budget = 1000000
+# The maximum nesting depth of repeated curly braces allowed by default (a symbol nested 13 levels deep is repeated
+# more than sentence_budget times)
+depth_budget = 12
+# The number of times the content of each curly brace pair is repeated when a sentence is interpreted
+brace_repeats = 3
+
+
+class Lsystem:
+    """
+    A Lsystem class for each individual in the generated population
+
+    Attributes
+    ----------
+    axiom : str
+        The starting character of the L-system
+    seed : int
+        A number to initialise the program's randomness
+    alphabet : list
+        The characters available for rule successor creation
+    alphabet_pred : list
+        The characters available for rule predecessor creation
+    rules : list
+        The set of rules generated for each individual
+    sentence : str
+        The resultant sentence from applying the rules to the axiom
+    analysis : RuleAnalysis
+        The symbolic analysis (length, symbol counts and brace depth) of the sentence (None if the sentence was
+        provided)
+    num_f : int
+        The number of F characters in the sentence
+    gen_number : int
+        The individual's storage number within the current generation
+    pop_number : int
+        The population number which constraints this individual
+    angle : float
+        The evaluated angle result from this cross-section at current actuator parameters
+    fidelity : str
+        The source of the angle, "fem" for a FEM evaluation, "analytical" for the beam model, "surrogate" for a
+        surrogate prediction, "bound" for the bound of an aborted FEM evaluation or "infeasible" for a design whose
+        geometry was rejected before the FEM evaluation
+    mesh : str
+        The mesh level of a FEM result ("coarse" or "fine", None if the angle is not a FEM result)
+    survivor : bool
+        Whether the individual was carried over from a previous generation (rather than produced for this one)
+    fitness : float
+        The fitness score of the individual's angle against the population
+    ranking : int
+        The ranked position (according to the fitness score) of this individual within the population
+    distance : float
+        A distance metric calculated relative against the population used in the calculation of the fitness score
+    geometry_hash : str
+        The hash of the exported design's coordinates (as stored in the coordinate archive)
+    timings : dict
+        The duration (in seconds) of each timed phase of the individual's production (selection, build and render),
+        export and evaluation
+    coords : list
+        The pixel positions of the interpreted cross-section
+    raster : numpy.ndarray
+        The occupancy grid (indexed [y, x]) of the interpreted cross-section
+
+    Methods
+    ----------
+    gen_rules(seed, num_rules)
+        Generate rules through combining random pre-deccessor and successor selections (using a generator
+        initialised with the seed)
+    form_string(sentence, rules)
+        Apply the rules to the current sentence to receive the new sentence
+    generate(iterations, rules)
+        Call the form_string method recursively for the specified number of iterations
+    l_mutate(rng)
+        Re-generate a random rule from the rules-set using the provided random generator
+    random_succ(rng)
+        Produce a random combination of alphabet letters using the provided random generator
+    """
+
+    def __init__(self, axiom, seed, generated_rules=None, max_length=None, max_depth=None, sentence=None):
+        """
+        Parameters
+        ----------
+        axiom : str
+            The starting character of the L-system
+        seed : int
+            A number to initialise the program's randomness
+        generated_rules : list, optional
+            The rules to create the individual (Default is empty)
+        max_length : int, optional
+            The maximum length of the resultant sentence once the content of its curly braces is repeated, rules
+            exceeding it are re-generated (Default is sentence_budget)
+        max_depth : int, optional
+            The maximum nesting depth of repeated curly braces in the resultant sentence (Default is depth_budget)
+        sentence : str, optional
+            The sentence already produced by the provided rules (e.g. by a worker process), which is used without
+            analysing or applying the rules (Default is None, the sentence is produced from the rules)
+        """
+        num_rules = 6  # The number of rule sets per individual
+        iterations = 8  # The number of iterations that the rules will be applied to the sentence
+        self.axiom = axiom
+        self.alphabet = ["A", "B", "C", "D", "F", "E", "F", "H", "G", "-", "+", "F", "-", "+", "F", "-", "+", "", "{",
+                         "}"]
+        self.alphabet_pred = ["A", "B", "C", "D", "E", "F", "H", "G"]
+        self.rules = []
+
+        # Initialise class attributes modified by evolve script
+        self.gen_number = int()
+        self.pop_number = int()
+        self.angle = float()
+        self.fidelity = str()
+        self.mesh = None
+        self.survivor = False
+        self.fitness = []
+        self.ranking = []
+        self.distance = float()
+        self.geometry_hash = None
+        self.timings = {}
+        self.coords = list()
+        self.raster = None
+
+        # A sentence that was already produced by the rules is not produced again
+        if sentence is not None:
+            self.rules = generated_rules
+            self.sentence = sentence
+            self.analysis = None
+            self.num_f = sentence.count("F")
+            return
+
+        # Rule generation and analysis are traced as a single phase
+        with tracing.span("rule_generation"):
+            # Generates rules if not provided
+            if not generated_rules:
+                self.gen_rules(seed, num_rules)
+            else:
+                self.rules = generated_rules
+
+            if max_length is None:
+                max_length = sentence_budget
+            if max_depth is None:
+                max_depth = depth_budget
+            self.analysis = RuleAnalysis(self.rules, self.axiom, iterations - 1)
+
+        j = 0
+        while True:
+            # Ensure that sentence is viable (contains F characters and is within the length and depth budget) and if
+            # not to re-generate the rules. The rules are analysed symbolically, without building the sentence
+            with tracing.span("rule_generation"):
+                while not self.analysis.viable(max_length, max_depth):
+                    j += 1
+                    self.rules = []
+                    self.gen_rules(j + seed, num_rules)
+                    self.analysis = RuleAnalysis(self.rules, self.axiom, iterations - 1)
+
+            # Apply rules to receive sentence
+            with tracing.span("rewriting"):
+                self.sentence = self.generate(iterations, self.rules)  # Number of iterations
+            # Add additional "F" at end of sentence - > lowers number of straight line cross-sections generated
+            self.sentence = self.sentence + "F"
+
+            # The content of the curly braces is only repeated when the sentence is interpreted, therefore the length
+            # of the repeated sentence is determined without building it (only if the symbolic bound exceeds the
+            # budget)
+            if self.analysis.repeated_bound(brace_repeats) + 1 <= max_length or \
+                    repeated_length(self.sentence, brace_repeats) <= max_length:
+                break
+            j += 1
+            self.rules = []
+            self.gen_rules(j + seed, num_rules)
+            self.analysis = RuleAnalysis(self.rules, self.axiom, iterations - 1)
+        self.num_f = self.analysis.count("F") + 1
+
+    def gen_rules(self, seed, num_rules):
+        """
+        Based on the number of rules and seed specified, this randomly combines this number of rules
+        """
+        # Initialise following string variables
+        pred = str()
+        succ = str()
+        # Initialise a RNG with seed (the global random state is not used, allowing individuals to be created
+        # concurrently)
+        rng = random.Random(seed)
+
+        # Create the specified number of rules (pre-determined)
+        for i in range(num_rules):
+            if i == 0:
+                pred = "A"
+                # For each successor, a random combination of defined alphabet characters are chosen
+                succ = rng.choice(self.alphabet) + rng.choice(self.alphabet) + rng.choice(
+                    self.alphabet_pred) + rng.choice(
+                    self.alphabet)
+            elif i == 1:
+                pred = "B"
+                succ = self.random_succ(rng)
+            elif i == 2:
+                pred = "C"
+                succ = self.random_succ(rng)
+            elif i == 3:
+                pred = "D"
+                succ = self.random_succ(rng)
+            elif i == 4:
+                pred = "E"
+                succ = self.random_succ(rng)
+            elif i == 5:
+                pred = "G"
+                succ = self.random_succ(rng)
+            elif i == 6:
+                pred = "H"
+                succ = self.random_succ(rng)
+
+            self.rules.append([pred, succ])
+
+    def generate(self, iterations, rules):
+        """
+        Applies the rules to the axiom for the specified iterations (using the shared, memoized rewriter)
+        """
+        # Assigns the axiom to the initial sentence
+        self.sentence = self.axiom
+
+        # The rules are applied iterations - 1 times, with each symbol's expansion being re-used from the
+        # rewriter shared by all individuals with the same rules
+        self.sentence = get_rewriter(rules).expand(self.sentence, iterations - 1)
+
+        # Counts the number of F's in the string
+        if "F" in self.sentence:
+            return self.sentence
+        else:
+            # If no F's are present in the string, an error code is returned
+            return -1001
+
+    def l_mutate(self, rng):
+        """
+        Generates random new rule to replace old rule
+        """
+        new_rule = rng.choice(self.alphabet) + rng.choice(self.alphabet) + rng.choice(
+            self.alphabet) + rng.choice(self.alphabet) + rng.choice(self.alphabet)
+
+        return new_rule
+
+    def random_succ(self, rng):
+        """
+        Randomly generates a combination of characters selected from a pre-defined alphabet
+        """
+        return rng.choice(self.alphabet) + rng.choice(self.alphabet) + rng.choice(
+            self.alphabet) + rng.choice(self.alphabet) + rng.choice(self.alphabet)
+
+    @staticmethod
+    def form_string(sentence, rules):
+        """
+        Applies the rules to each character in the sentence
+        """
+        # Each character in the provided sentence string is replaced by its rule's successor (if a rule is
+        # applicable), using the rewriter of the provided rules
+        return get_rewriter(rules).expand(sentence, 1)
+
+
+class Rewriter:
+    """
+    A Rewriter class that applies a set of L-system rules, where the expansion of each symbol at each depth is
+    memoized. A sentence is therefore built by joining previously expanded chunks rather than one character at a
+    time. A single rewriter is shared by all individuals with the same rules (see get_rewriter).
+
+    Attributes
+    ----------
+    productions : dict
+        The successor of each predecessor character
+    memo : dict
+        The expanded string of each (symbol, depth) pair determined so far
+
+    Methods
+    ----------
+    expand(sentence, depth)
+        Applies the rules to the sentence for the specified number of iterations
+    expand_symbol(symbol, depth)
+        Applies the rules to a single symbol for the specified number of iterations
+    """
+
+    def __init__(self, productions):
+        """
+        Parameters
+        ----------
+        productions : dict
+            The successor of each predecessor character
+        """
+        self.productions = productions
+        self.memo = {}
+
+    def expand(self, sentence, depth):
+        """
+        Applies the rules to the sentence for the specified number of iterations
+        """
+        if depth <= 0:
+            return sentence
+        return "".join([self.expand_symbol(symbol, depth) for symbol in sentence])
+
+    def expand_symbol(self, symbol, depth):
+        """
+        Applies the rules to a single symbol for the specified number of iterations
+        """
+        # Characters without a rule remain unchanged
+        if depth <= 0 or symbol not in self.productions:
+            return symbol
+
+        expansion = self.memo.get((symbol, depth))
+        if expansion is None:
+            # The successor's characters are each expanded to one level less
+            expansion = "".join([self.expand_symbol(c, depth - 1) for c in self.productions[symbol]])
+            self.memo[(symbol, depth)] = expansion
+        return expansion
+
+
+class RuleAnalysis:
+    """
+    A RuleAnalysis class that determines the length, symbol counts and curly brace nesting depth of the sentence
+    produced by a set of rules, without building the sentence. The symbol counts are determined through raising
+    the symbol substitution matrix to the power of the number of iterations. Only matched curly braces are repeated
+    when the sentence is interpreted, therefore the depth is bounded by the lower of the nesting depths determined
+    forwards (unclosed braces included) and backwards (unopened braces included).
+
+    Attributes
+    ----------
+    symbols : list
+        The symbols that can appear in the sentence
+    matrix : numpy.ndarray
+        The substitution matrix, where entry [i, j] is the number of symbol j's produced by one symbol i
+    counts : dict
+        The number of each symbol in the resultant sentence
+    length : int
+        The length of the resultant sentence
+    depth : int
+        The maximum nesting depth (an upper bound) of the repeated curly braces in the resultant sentence
+
+    Methods
+    ----------
+    count(symbol)
+        Returns the number of the provided symbol in the resultant sentence
+    repeated_bound(repeats)
+        Returns an upper bound of the sentence's length once the content of its curly braces is repeated
+    viable(max_length, max_depth)
+        Determines if the resultant sentence contains F characters and is within the provided budget
+    """
+
+    def __init__(self, rules, axiom, iterations):
+        """
+        Parameters
+        ----------
+        rules : list
+            The set of rules applied to the axiom
+        axiom : str
+            The starting character of the L-system
+        iterations : int
+            The number of times the rules are applied to the axiom
+        """
+        productions = dict(get_productions(rules))
+        self.symbols = sorted(set(axiom) | set(productions) | set("".join(productions.values())))
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        # Python integers (object arrays) are used so that the counts of long sentences can never overflow
+        self.matrix = np.zeros((len(self.symbols), len(self.symbols)), dtype=object)
+        for symbol in self.symbols:
+            if symbol in productions:
+                for c in productions[symbol]:
+                    self.matrix[index[symbol], index[c]] += 1
+            else:
+                self.matrix[index[symbol], index[symbol]] = 1
+
+        axiom_counts = np.zeros(len(self.symbols), dtype=object)
+        for c in axiom:
+            axiom_counts[index[c]] += 1
+        final_counts = axiom_counts.dot(np.linalg.matrix_power(self.matrix, max(iterations, 0)))
+        self.counts = {symbol: int(final_counts[index[symbol]]) for symbol in self.symbols}
+        self.length = sum(self.counts.values())
+
+        # The brace depth is not linear in the symbol counts (see brace_depth). The backward depth is that of the
+        # reversed sentence, produced by the reversed successors
+        reversed_productions = {symbol: successor[::-1] for symbol, successor in productions.items()}
+        self.depth = min(brace_depth(productions, self.symbols, axiom, iterations),
+                         brace_depth(reversed_productions, self.symbols, axiom[::-1], iterations, backwards=True))
+
+    def count(self, symbol):
+        """
+        Returns the number of the provided symbol in the resultant sentence
+        """
+        return self.counts.get(symbol, 0)
+
+    def repeated_bound(self, repeats):
+        """
+        Returns an upper bound of the length of the resultant sentence once the content of its curly braces is
+        repeated (every symbol is assumed to be nested at the maximum depth)
+        """
+        return self.length * repeats ** self.depth
+
+    def viable(self, max_length, max_depth=None):
+        """
+        Determines if the resultant sentence contains F characters and is within the provided length and brace
+        depth budget
+        """
+        if self.count("F") == 0:
+            return False
+        if max_length is not None and self.length > max_length:
+            return False
+        if max_depth is not None and self.depth > max_depth:
+            return False
+        return True
+
+
+class Interp:
+    """
+    A Interp class for each interpreted individual in the generated population.
+
+    Attributes
+    ----------
+    sentence : str
+        The generated string from the l-system
+    target : list
+        A list containing the x and y user-specified targeted coordinates
+    grid : numpy.ndarray
+        The occupancy grid (indexed [y + 1, x + 1]) padded by one cell on each side, where placed pixels are 1
+    raster : numpy.ndarray
+        The unpadded view of the occupancy grid (indexed [y, x])
+    neighbours : numpy.ndarray
+        The neighbour count of each grid cell, updated as each pixel is placed
+    outside : numpy.ndarray
+        The grid cells located outside of the canvas
+    lower : numpy.ndarray
+        The minimum valid neighbour count of each grid cell
+    upper : numpy.ndarray
+        The maximum valid neighbour count of each grid cell
+    contributions : numpy.ndarray
+        The contribution of a pixel placed at each grid cell to the neighbour counts of the surrounding 3x3 cells
+    positions : list
+        A list of floats containing all pixel positions that will be exported to Abaqus CAE
+
+    Methods
+    ----------
+    direction_change(operator, direction, last_operator)
+        Changes the direction according to the user's target parameters. Ensures that pixel placement does
+        not occur outside of boundaries (condition) and that it adheres to defined direction limitations.
+    draw(pop_number, gen_number, renderer)
+        Interprets all characters in the generated sentence string, and places appropriate pixels
+    get_temp_pos(direction, current_pos)
+        Obtains the next possible pixel placement location according to the current position and direction
+    check_neighbours(pos)
+        Checks if the provided pixel placement location is viable according to the defined placement rules
+    place(pos)
+        Places a pixel at the provided location and updates the neighbour counts of the surrounding cells
+
+    """
+
+    def __init__(self, sentence, target, num_f=None):  # Initialises the class with the input parameters
+        """
+        Parameters
+        ----------
+        sentence : str
+            The generated string from the l-system
+        target : list
+            A list containing the x and y user-specified targeted coordinates
+        num_f : int, optional
+            The number of F characters in the sentence, if already known (Default is counted from the sentence)
+
+        """
+        self.sentence = sentence
+        self.target = target
+
+        # Initialises the cross-section grid with the dimensions of the target (padded by one cell on each side,
+        # so that the neighbours of any candidate location can be updated without edge cases)
+        # and the position list with a starting entry
+        self.grid = np.zeros((self.target[1] + 2, self.target[0] + 2), dtype=np.uint8)
+        self.raster = self.grid[1:-1, 1:-1]
+        self.neighbours = np.zeros(self.grid.shape, dtype=np.int16)
+        self.positions = [[0, 0]]
+
+        # The edge/interior layout of the canvas is shared by all interpretations with the same target
+        self.outside, self.lower, self.upper, self.contributions = get_canvas(self.target[0], self.target[1])
+
+        # Counts the number of F's in the sentence string (unless provided by the L-system's analysis)
+        if num_f is None:
+            num_f = self.sentence.count("F")
+        # Determines the number of pixels placed per instance of character interpretation
+
+        self.num_pixel_placement = math.ceil(self.target[0] / num_f)  # The width is divided by the number
+        # of pixel placement operators (F)
+
+    @staticmethod
+    def direction_change(operator, direction, last_operator):
+        """
+        Determines the new direction and last operator used based on the current direction and operator
+        """
+        if operator == "-":
+            direction -= 1
+            last_operator = "-"
+        if operator == "+":
+            direction += 1
+            last_operator = "+"
+
+        if direction < 1:
+            direction = 3
+        if direction > 3:
+            direction = 1
+        return direction, last_operator
+
+    def draw(self, pop_number, gen_number, renderer=None):
+        """
+        Uses the generated sentence to plot pixels according to their determined positions. The resultant grid is
+        passed to the renderer (Default stores an image per individual in the Cross-sections folder)
+        """
+        # The current direction, number of "F"s and last_operator is initialised
+        num_f = 0
+        last_operator = "+"
+        current_dir = 1
+        # An initial pixel is placed at (0,0)
+        self.place((0, 0))  # Always starts with a pixel at 0,0
+
+        # The content between curly braces is repeated brace_repeats times (number can be optimised)
+        with tracing.span("brace_expansion"):
+            self.sentence = get_repeated(self.sentence, brace_repeats)
+
+        with tracing.span("interpretation"):
+            # A while loop is implemented as a custom for loop (this is to allow loop decrements)
+            # Initialise the for loop with i = 0
+            i = 0
+            while not i == len(self.sentence):
+
+                # Direction change operators
+                if self.sentence[i] == "-" or self.sentence[i] == "+":
+                    current_dir, last_operator = self.direction_change(self.sentence[i], current_dir, last_operator)
+                # Pixel placement operator
+                if self.sentence[i] == "F":
+
+                    # The pixel is placed at the determined position and repeated for num_pixel_placement times
+                    for k in range(self.num_pixel_placement):
+                        temp_pos = self.get_temp_pos(current_dir, self.positions[num_f])
+                        check = self.check_neighbours(temp_pos)
+
+                        # If the pixel placement borders a valid number of neighbours, then the pixel is placed and
+                        # the position is recorded
+                        if check == 1:
+                            num_f += 1
+                            self.positions.append(temp_pos)
+                            self.place(temp_pos)
+
+                        # If the number of neighbours is invalid, then the previous operator is re-applied and the
+                        # process repeats
+                        elif check == 4:
+                            current_dir, last_operator = self.direction_change(last_operator, current_dir,
+                                                                               last_operator)
+                            i -= 1
+                        # If the current operators and location is completely invalid, then the system passes the
+                        # current placement
+                        elif check == 3:
+                            pass
+                i += 1
+
+            # If the grid still has space in the x-direction, then this is filled with the following
+            # for loop
+
+            for j in range(self.target[0] - self.positions[-1][0]):
+                self.place((self.positions[num_f][0] + j, self.positions[num_f][1]))
+                self.positions.append((self.positions[num_f][0] + j, self.positions[num_f][1]))
+
+        # The grid is encoded as an image, named and stored in a folder (or kept for the generation's contact sheet)
+        if renderer is None:
+            renderer = default_renderer()
+        with tracing.span("rendering"):
+            renderer.render(self.raster, pop_number, gen_number)
+
+        return self.positions
+
+    @staticmethod
+    def get_temp_pos(direction, current_pos):
+        """
+        Determines the next possible pixel placement location based on th current direction and position
+        """
+        x = current_pos[0]
+        y = current_pos[1]
+
+        # The directions are pre-defined. See the final report for an illustration of the
+        # direction placement.
+
+        if direction == 0:
+            x += 1
+            y -= 1
+        elif direction == 1:
+            x += 1
+        elif direction == 2:
+            x += 1
+            y += 1
+        elif direction == 3:
+            y += 1
+
+        return x, y
+
+    def check_neighbours(self, pos):
+        """
+        Determines if the provided position is valid according to pre-defined rules (based on target)
+        """
+        # Check canvas size limitations (candidate locations are at most one cell outside the canvas)
+        cell = (pos[1] + 1, pos[0] + 1)
+        if self.outside[cell]:
+            return 3
+
+        # The neighbour count of the location is compared against the limits of an edge or interior location.
+        # If the count is valid, then the programs return a successful code (1). Otherwise, an
+        # unsuccessful code (4) is returned
+        if self.lower[cell] <= self.neighbours[cell] <= self.upper[cell]:
+            return 1
+        else:
+            return 4
+
+    def place(self, pos):
+        """
+        Places a pixel at the provided position and adds it to the neighbour counts of the surrounding cells
+        """
+        cell = (pos[1] + 1, pos[0] + 1)
+        # A pixel placed over an existing pixel does not change the grid
+        if self.grid[cell]:
+            return
+        self.grid[cell] = 1
+
+        # The pixel's contribution to each surrounding cell depends on whether that cell is an edge or interior cell
+        self.neighbours[cell[0] - 1:cell[0] + 2, cell[1] - 1:cell[1] + 2] += self.contributions[cell]
+
+
+# The contribution of a placed pixel to the neighbour count of the surrounding cells (indexed [dy + 1, dx + 1] from
+# the pixel). Edge cells only count orthogonal neighbours. Interior cells count all neighbours, except that the pixel
+# below and to the right of an interior cell is counted twice and the pixel above and to the left is not counted.
+edge_kernel = np.array([[0, 1, 0],
+                        [1, 0, 1],
+                        [0, 1, 0]], dtype=np.int16)
+interior_kernel = np.array([[1, 1, 0],
+                            [1, 0, 1],
+                            [2, 1, 1]], dtype=np.int16)
+
+
+class NoRenderer:
+    """
+    A NoRenderer class that discards the interpreted cross-sections, used where no images are stored (e.g. by the
+    population builder's workers) without loading the rendering backend
+
+    Methods
+    ----------
+    render(raster, pop_number, gen_number, png)
+        Discards the raster of an individual
+    flush(pop_number)
+        Does nothing (no rasters are kept)
+    """
+
+    def render(self, raster, pop_number, gen_number, png=None):
+        """
+        Discards the raster of an individual
+        """
+
+    def flush(self, pop_number):
+        """
+        Does nothing, as no rasters are kept
+        """
+
+
+@lru_cache(maxsize=16)
+def get_canvas(width, height):
+    """
+    Determines the padded canvas layout of the provided target dimensions. Cells on the canvas edge count their
+    orthogonal neighbours (along with the edge itself) and are valid with exactly 1 counted neighbour, while
+    interior cells count all neighbours and are valid with up to 2 counted neighbours.
+    """
+    shape = (height + 2, width + 2)
+    edge = np.zeros(shape, dtype=bool)
+    edge[1:-1, 1:-1] = True
+    edge[2:-2, 2:-2] = False
+    outside = np.ones(shape, dtype=bool)
+    outside[1:-1, 1:-1] = False
+    lower = np.where(edge, 1, 0).astype(np.int16)
+    upper = np.where(edge, 1, 2).astype(np.int16)
+
+    # The contribution of a pixel at each cell to the surrounding cells (based on each surrounding cell's type)
+    padded_edge = np.pad(edge, 1)
+    contributions = np.zeros(shape + (3, 3), dtype=np.int16)
+    for dy in range(3):
+        for dx in range(3):
+            contributions[:, :, dy, dx] = np.where(padded_edge[dy:dy + shape[0], dx:dx + shape[1]],
+                                                   edge_kernel[dy, dx], interior_kernel[dy, dx])
+
+    # The layout is shared, therefore it is made read-only
+    for array in (outside, lower, upper, contributions):
+        array.flags.writeable = False
+    return outside, lower, upper, contributions
+
+
+def get_in_brackets(sen):
+    """
+    Returns each level of content located within curly brackets. Note this function is modified
+    from a stackoverflow user's response :
+    https://stackoverflow.com/questions/4284991/parsing-nested-parentheses-in-python-grab-content-by-level
+    """
+
+    # A push/pop is implemented, with a list, to locate the content within nested curly braces
+    stack = []
+
+    for i, c in enumerate(sen):
+        if c == '{':
+            stack.append(i)
+        elif c == '}' and stack:
+            start = stack.pop()
+            yield sen[start + 1: i]
+
+
+def get_repeated(content, n):
+    """
+    Multiplies nested levels of content within curly brackets
+    """
+    inner = list(get_in_brackets(content))
+    sen = content
+
+    # The inner sentence content of each layer is multiplied by n.
+    j = len(inner) - 1
+    new_sen = sen
+    while j != -1:
+        new_sen = new_sen.replace("{" + inner[j] + "}", n * inner[j])
+        j -= 1
+
+    return new_sen
+
+
+def repeated_length(sentence, n):
+    """
+    Returns the length of the sentence once the content of each level of curly brackets is multiplied by n, without
+    building it. Brackets that are not matched are kept as characters. This is an upper bound of the length returned
+    by get_repeated, whose replacements can also remove repeated empty brackets
+    """
+    braces = [(i, c) for i, c in enumerate(sentence) if c == "{" or c == "}"]
+
+    # The brackets are matched with a push/pop (identical to get_in_brackets)
+    matched = [False] * len(braces)
+    stack = []
+    for k, (i, c) in enumerate(braces):
+        if c == "{":
+            stack.append(k)
+        elif stack:
+            matched[stack.pop()] = True
+            matched[k] = True
+
+    # Every character between consecutive brackets (and every unmatched bracket) is repeated once per level
+    length = 0
+    level = 0
+    previous = -1
+    for k, (i, c) in enumerate(braces):
+        length += (i - previous - 1) * n ** level
+        if not matched[k]:
+            length += n ** level
+        elif c == "{":
+            level += 1
+        else:
+            level -= 1
+        previous = i
+    return length + (len(sentence) - previous - 1) * n ** level
+
+
+def brace_depth(productions, symbols, axiom, iterations, backwards=False):
+    """
+    Returns the maximum curly brace nesting depth of the sentence produced by the productions, without building the
+    sentence. A summary of the brace levels of each symbol's expansion is combined from the summaries of one iteration
+    less. Backwards, the sentence is read in reverse (the productions and axiom are reversed), where the roles of the
+    opening and closing braces are swapped
+    """
+    swapped = {"{": "}", "}": "{"}
+    summaries = {symbol: brace_summary(swapped.get(symbol, symbol) if backwards else symbol) for symbol in symbols}
+    for _ in range(max(iterations, 0)):
+        summaries = {symbol: join_summaries([summaries[c] for c in productions[symbol]])
+                     if symbol in productions else summaries[symbol] for symbol in symbols}
+    return join_summaries([summaries[c] for c in axiom])[3]
+
+
+def brace_summary(symbol):
+    """
+    Returns the curly brace summary (net level change, lowest level, highest level and deepest nesting) of a
+    single symbol
+    """
+    if symbol == "{":
+        return 1, 0, 1, 1
+    elif symbol == "}":
+        return -1, -1, 0, 0
+    return 0, 0, 0, 0
+
+
+def join_summaries(summaries):
+    """
+    Combines the curly brace summaries of consecutive strings. The deepest nesting follows the push/pop of
+    get_in_brackets, where a closing brace without an opening brace is ignored
+    """
+    net, lowest, highest, deepest = 0, 0, 0, 0
+    for part in summaries:
+        deepest = max(deepest, part[3], net + part[2] - lowest)
+        lowest = min(lowest, net + part[1])
+        highest = max(highest, net + part[2])
+        net += part[0]
+    return net, lowest, highest, deepest
+
+
+def get_productions(rules):
+    """
+    Converts the rules to (predecessor, successor) pairs. As with the original rule application, only the first
+    six rules are applied and the first rule of a predecessor takes precedence.
+    """
+    productions = []
+    predecessors = set()
+    for rule in rules[:6]:
+        if rule[0] not in predecessors:
+            predecessors.add(rule[0])
+            productions.append((rule[0], rule[1]))
+    return tuple(productions)
+
+
+def get_rewriter(rules):
+    """
+    Returns the memoized rewriter for the provided rules (shared by all individuals with the same rules)
+    """
+    return _cached_rewriter(get_productions(rules))
+
+
+@lru_cache(maxsize=256)
+def _cached_rewriter(productions):
+    return Rewriter(dict(productions))
+
+
+def default_renderer():
+    """
+    Returns the renderer used when none is provided, which stores an image per individual in the Cross-sections
+    folder. The rendering backend is imported (and the renderer created) on first use
+    """
+    global _default_renderer
+    if _default_renderer is None:
+        from render import Renderer
+        _default_renderer = Renderer(cross_section_path)
+    return _default_renderer
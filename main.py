@@ -1,90 +1,139 @@
-# Jacques Terblanche
-# 22548602
-
-import sys
-import time
-import os
-import glob
-from evolve import Evolution
-import json
-
-###############
-# Parameters
-###############
-# Random (0), generative (1)
-search_type = 1
-
-# Actuator
-height = 16  # mm - Maximum cross-section height
-width = 8  # mm - Maximum cross-section width
-target_angle = 40 # degrees - User requested angle
-
-cavity_total_depth = 20 # mm - Distance between inner walls (depth)
-thickness = 1.4 # mm - Thickness of walls
-num_cells = 8 # Number of cells
-bottom_cavity_height = 6 # mm - The distance between the start of the generated cross-section and the bottom layer
-bottom_thickness = 3 # mm - The thickness of the bottom layer
-
-pressure_load = 0.04 # MPa
-gravity_load = 9810.0 # mm/s^2
-
-# L-system
-iterations = 8  # Number of iterations of l-string rewriting
-axiom = "A"
-
-# Evolution settings
-seed = 6546
-num_cycles = 3
-num_individuals = 3
-elitism = 0.1
-replacement = 0.2
-
-###############
-# Set-up
-###############
-
-# Start measuring program clock time
-start = time.time()
-
-# Set directories for clearing files and exporting parameters
-script_dir = os.path.dirname(__file__)
-data_path = "data//log.txt"
-data_output_path = os.path.join(script_dir, data_path)
-sys.stdout = open(data_output_path, 'w')
-cross_storage = os.path.join(script_dir, "Cross-sections//*.png")
-coord_storage = os.path.join(script_dir, "Coordinate_storage//*.json")
-abaqus_file_path = os.path.join(script_dir, "Abaqus")
-files = glob.glob(coord_storage)
-
-# Clear files
-for f in files:
-    os.remove(f)
-files = glob.glob(cross_storage)
-for f in files:
-    os.remove(f)
-
-# Export Abaqus parameters
-abaqus_parameters = [cavity_total_depth,thickness,num_cells,bottom_cavity_height,bottom_thickness,pressure_load,gravity_load]
-os.chdir(abaqus_file_path)
-with open('input_parameters.json', 'w', encoding='utf-8') as f:
-    json.dump(abaqus_parameters, f, ensure_ascii=False, indent=4)
-os.chdir(script_dir)
-
-
-# Number of pixels based on coordinates is increased by factor of 10
-# number can vary for program optimisation
-pixel_factor = 10
-target = [width * pixel_factor, height * pixel_factor]
-
-# Call evolution algorithm and specify search mechanism
-Evo1 = Evolution(num_cycles, seed, target, target_angle, axiom,elitism,replacement)  # cycles, seed, seed
-if search_type == 0:
-    Evo1.random_gen(num_individuals)
-else:
-    Evo1.evolve(num_individuals)
-
-# End program, display total system run time
-print("Done")
-end = time.time()
-print("This program ran for: " + str(end - start) + " seconds")
-sys.stdout.close()
+# Jacques Terblanche
+# 22548602
+
+import sys
+import time
+import os
+import glob
+from evolve import Evolution
+from archive import clear_archive
+import tracing
+import artifacts
+import json
+
+###############
+# Parameters
+###############
+# Random (0), generative (1), steady-state generative (2)
+search_type = 1
+
+# Actuator
+height = 16  # mm - Maximum cross-section height
+width = 8  # mm - Maximum cross-section width
+target_angle = 40 # degrees - User requested angle
+
+cavity_total_depth = 20 # mm - Distance between inner walls (depth)
+thickness = 1.4 # mm - Thickness of walls
+num_cells = 8 # Number of cells
+bottom_cavity_height = 6 # mm - The distance between the start of the generated cross-section and the bottom layer
+bottom_thickness = 3 # mm - The thickness of the bottom layer
+
+pressure_load = 0.04 # MPa
+gravity_load = 9810.0 # mm/s^2
+
+# L-system
+iterations = 8  # Number of iterations of l-string rewriting
+axiom = "A"
+
+# Evolution settings
+seed = 6546
+num_cycles = 3
+num_individuals = 3
+elitism = 0.1
+replacement = 0.2
+num_workers = 1  # Number of Abaqus evaluations run at once (limited by available licenses/cores)
+use_server = False  # Keep num_workers Abaqus CAE sessions running, each evaluating many designs (Abaqus_server.py)
+mesh_schedule = None  # Mesh level of each generation's new designs, e.g. ["coarse", "coarse", "fine"] (None: all fine)
+early_abort = False  # Abort Abaqus jobs whose predicted angle cannot beat the worst elite individual
+check_geometry = False  # Reject designs whose cavity/walls cannot be built in Abaqus before they are submitted
+lean_output = True  # Only record the tracked nodes of Abaqus jobs and remove their job files (False keeps Job-1.odb)
+fidelity = "fem"  # Evaluation tier: Abaqus FEM ("fem") or the analytical beam model ("analytical", no license needed)
+use_cache = False  # Re-use the FEM results of identical designs across generations and runs
+render_mode = "individual"  # Cross-section images: per individual ("individual"), per generation ("sheet") or "off"
+screen_fraction = 1.0  # Fraction of new individuals sent to Abaqus (< 1 pre-screens the rest with a surrogate model)
+build_workers = 1  # Number of processes used to generate and interpret each generation
+trace = False  # Record the duration of each phase per individual and generation (data/trace.jsonl and data/trace.json)
+profile_phase = None  # Phase profiled with cProfile, e.g. "rewriting" (data/trace.prof, workers: trace_<pid>.prof)
+background_writes = True  # Write images, coordinates and the log on a background thread (drained at checkpoints)
+fsync_policy = "never"  # Sync written artifacts to disk: "never" (left to the OS), after every "batch" or "always"
+resume = False  # Continue an interrupted run from its checkpoint (data/checkpoint.json) instead of starting a new run
+
+###############
+# Set-up
+###############
+
+# The run is only started when main.py is executed (not when it is imported, e.g. by the population builder's
+# spawned worker processes)
+if __name__ == "__main__":
+    # Start measuring program clock time
+    start = time.time()
+
+    # Set directories for clearing files and exporting parameters
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_path = "data//log.txt"
+    data_output_path = os.path.join(script_dir, data_path)
+    # The steady-state mode has no generation boundaries, therefore it is not checkpointed (and cannot be resumed)
+    checkpoint_path = os.path.join(script_dir, "data//checkpoint.json") if search_type != 2 else None
+    database_path = os.path.join(script_dir, "data//runs.sqlite")
+    resume = resume and checkpoint_path is not None and os.path.exists(checkpoint_path)
+    cross_storage = os.path.join(script_dir, "Cross-sections//*.png")
+    coord_storage = os.path.join(script_dir, "Coordinate_storage")
+    abaqus_file_path = os.path.join(script_dir, "Abaqus")
+    cache_path = os.path.join(script_dir, "Abaqus//Cache") if use_cache else None
+    trace_path = os.path.join(script_dir, "data//trace.jsonl")
+
+    # Clear files (the files of an interrupted run are kept when it is resumed)
+    if not resume:
+        clear_archive(coord_storage)
+        files = glob.glob(cross_storage)
+        for f in files:
+            os.remove(f)
+        if os.path.exists(trace_path):
+            os.remove(trace_path)
+
+    # Set up tracing of each phase (and profiling of a single phase)
+    if trace or profile_phase:
+        tracing.configure(trace_path if trace else None, profile_phase, os.path.join(script_dir, "data//trace.prof"))
+
+    # Export Abaqus parameters
+    abaqus_parameters = [cavity_total_depth,thickness,num_cells,bottom_cavity_height,bottom_thickness,pressure_load,
+                         gravity_load]
+    with open(os.path.join(abaqus_file_path, 'input_parameters.json'), 'w', encoding='utf-8') as f:
+        json.dump(abaqus_parameters, f, ensure_ascii=False, indent=4)
+
+
+    # Number of pixels based on coordinates is increased by factor of 10
+    # number can vary for program optimisation
+    pixel_factor = 10
+    target = [width * pixel_factor, height * pixel_factor]
+
+    # Call evolution algorithm and specify search mechanism
+    Evo1 = Evolution(num_cycles, seed, target, target_angle, axiom,elitism,replacement,num_workers,cache_path,
+                     render_mode,screen_fraction,checkpoint_path=checkpoint_path,build_workers=build_workers,
+                     fidelity=fidelity,use_server=use_server,early_abort=early_abort,
+                     mesh_schedule=mesh_schedule,check_geometry=check_geometry,
+                     database_path=database_path,lean_output=lean_output)  # cycles, seed, seed
+
+    # The artifact writer's thread is started once the population builder's worker processes have been forked (see
+    # builder.py), from which point the output is also written to the log
+    artifacts.configure(background_writes, fsync=fsync_policy)
+    sys.stdout = artifacts.LogStream(data_output_path, append=resume)
+    if resume:
+        Evo1.resume()
+    elif search_type == 0:
+        Evo1.random_gen(num_individuals)
+    elif search_type == 2:
+        Evo1.evolve_steady_state(num_individuals)
+    else:
+        Evo1.evolve(num_individuals)
+    Evo1.close()
+
+    # End program, display total system run time
+    print("Done")
+    end = time.time()
+    print("This program ran for: " + str(end - start) + " seconds")
+    tracing.tracer.close()
+    if trace:
+        tracing.chrome_trace(trace_path, os.path.join(script_dir, "data//trace.json"))
+    sys.stdout.close()
+    artifacts.close()
@@ -0,0 +1,137 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import zlib
+import struct
+import numpy as np
+import artifacts
+
+
+class Renderer:
+    """
+    A Renderer class that stores the interpreted cross-sections as PNG images, encoded directly from the
+    occupancy raster (without a plotting library). The images are written by the artifact writer (see artifacts.py)
+
+    Attributes
+    ----------
+    mode : str
+        The rendering mode, "individual" (one image per individual), "sheet" (one tiled contact sheet per
+        generation) or "off" (no images are stored)
+    path : str
+        The absolute path to the folder in which the images are stored
+    columns : int
+        The number of cross-sections per row of a contact sheet
+    scale : int
+        The number of image pixels per raster cell
+    pending : dict
+        The rasters waiting to be added to a contact sheet (keyed by population and generation number)
+
+    Methods
+    ----------
+    render(raster, pop_number, gen_number, png)
+        Stores the raster of an individual (or keeps it for the generation's contact sheet)
+    flush(pop_number)
+        Stores the contact sheet of all rasters kept for the generation
+    """
+
+    def __init__(self, path, mode="individual", columns=10, scale=1):
+        """
+        Parameters
+        ----------
+        path : str
+            The path to the folder in which the images are stored
+        mode : str, optional
+            The rendering mode, "individual", "sheet" or "off" (Default is "individual")
+        columns : int, optional
+            The number of cross-sections per row of a contact sheet (Default is 10)
+        scale : int, optional
+            The number of image pixels per raster cell (Default is 1)
+        """
+        if mode not in ("individual", "sheet", "off"):
+            raise ValueError("Unknown rendering mode: " + str(mode))
+        self.mode = mode
+        self.path = os.path.abspath(path)
+        self.columns = columns
+        self.scale = scale
+        self.pending = {}
+
+    def render(self, raster, pop_number, gen_number, png=None):
+        """
+        Stores the raster of an individual as Individual_{pop_number}_{gen_number}.png, or keeps it for the
+        generation's contact sheet. An image that has already been encoded (e.g. by a worker process) is stored as is
+        """
+        if self.mode == "individual":
+            filename = 'Individual_' + str(pop_number) + '_' + str(gen_number) + '.png'
+            if png is None:
+                write_png(os.path.join(self.path, filename), raster, self.scale)
+            else:
+                artifacts.write(os.path.join(self.path, filename), png)
+        elif self.mode == "sheet":
+            # A copy is kept, as the raster may still be modified by its interpretation
+            self.pending[(pop_number, gen_number)] = np.array(raster, copy=True)
+
+    def flush(self, pop_number):
+        """
+        Stores all rasters kept for the generation as a single contact sheet, Generation_{pop_number}.png
+        """
+        keys = sorted([key for key in self.pending if key[0] == pop_number])
+        if keys:
+            rasters = [self.pending.pop(key) for key in keys]
+            filename = 'Generation_' + str(pop_number) + '.png'
+            write_png(os.path.join(self.path, filename), contact_sheet(rasters, self.columns), self.scale)
+
+
+def contact_sheet(rasters, columns):
+    """
+    Tiles the provided rasters (indexed [y, x]) into a single raster, with a one cell border around each tile
+    """
+    columns = max(1, min(columns, len(rasters)))
+    rows = -(-len(rasters) // columns)
+    height = max(raster.shape[0] for raster in rasters) + 1
+    width = max(raster.shape[1] for raster in rasters) + 1
+
+    # The borders are drawn as filled cells. The rows are stacked from the top of the image downwards (the raster
+    # is flipped when encoded, therefore the first tile is placed in the last raster rows)
+    sheet = np.ones((rows * height + 1, columns * width + 1), dtype=np.uint8)
+    for k, raster in enumerate(rasters):
+        row = rows - 1 - k // columns
+        column = k % columns
+        tile = np.zeros((height - 1, width - 1), dtype=np.uint8)
+        tile[:raster.shape[0], :raster.shape[1]] = raster
+        sheet[row * height + 1:(row + 1) * height, column * width + 1:(column + 1) * width] = tile
+    return sheet
+
+
+def encode_png(raster, scale=1):
+    """
+    Encodes a raster (indexed [y, x], with filled cells being non-zero) as a greyscale PNG image with black pixels
+    on a white background. The y-axis points upwards in the image.
+    """
+    # Flip the y-axis and convert filled cells to black pixels
+    image = np.where(np.asarray(raster)[::-1] != 0, 0, 255).astype(np.uint8)
+    if scale > 1:
+        image = np.repeat(np.repeat(image, scale, axis=0), scale, axis=1)
+    height, width = image.shape
+
+    # Every scanline starts with a filter type byte (0 - no filtering)
+    scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), image])
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) +
+            png_chunk(b'IDAT', zlib.compress(scanlines.tobytes(), 6)) + png_chunk(b'IEND', b''))
+
+
+def png_chunk(chunk_type, data):
+    """
+    Returns a PNG chunk (length, type, data and checksum)
+    """
+    checksum = zlib.crc32(chunk_type + data) & 0xffffffff
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', checksum)
+
+
+def write_png(file_path, raster, scale=1):
+    """
+    Encodes the raster as a PNG image and writes it to the provided path (through the artifact writer)
+    """
+    artifacts.write(os.path.abspath(file_path), encode_png(raster, scale))
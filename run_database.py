@@ -0,0 +1,203 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+from builder import sentence_hash
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started REAL,
+    mode TEXT,
+    seed INTEGER,
+    target_angle REAL,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS individuals (
+    run_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    pop_number INTEGER NOT NULL,
+    gen_number INTEGER NOT NULL,
+    rules TEXT,
+    sentence_hash TEXT,
+    sentence_length INTEGER,
+    geometry_hash TEXT,
+    angle REAL,
+    distance REAL,
+    fitness REAL,
+    ranking INTEGER,
+    fidelity TEXT,
+    mesh TEXT,
+    timings TEXT,
+    PRIMARY KEY (run_id, generation, pop_number, gen_number)
+);
+CREATE INDEX IF NOT EXISTS individuals_distance ON individuals (run_id, distance);
+CREATE INDEX IF NOT EXISTS individuals_sentence ON individuals (sentence_hash);
+CREATE INDEX IF NOT EXISTS individuals_geometry ON individuals (geometry_hash);
+"""
+
+# Results that are only estimates (or placeholders) of an angle are excluded from the best designs
+estimated_fidelities = ("surrogate", "bound", "infeasible")
+
+
+class RunDatabase:
+    """
+    A RunDatabase class that stores every individual of every generation of one or more runs in an indexed SQLite
+    database, replacing the parsing of log.txt. The individuals of a generation are written in a single transaction,
+    where a generation that is recorded again (e.g. after its top designs were verified) replaces the previous rows.
+
+    Attributes
+    ----------
+    path : str
+        The path to the SQLite database file
+    run_id : str
+        The identifier of the run whose generations are recorded
+
+    Methods
+    ----------
+    start_run(run_id, mode, seed, target_angle, settings)
+        Registers a run (an existing run, e.g. a resumed run, keeps its start time)
+    record_generation(generation, individuals, target_angle)
+        Writes all individuals of a generation in a single transaction
+    query(sql, parameters)
+        Returns the rows of a query as dictionaries
+    runs()
+        Returns all recorded runs
+    best_designs(limit, run_id)
+        Returns the individuals closest to the target angle (of a run or of all runs)
+    convergence(run_id)
+        Returns the best, mean and worst distance of each generation of a run
+    compare_runs(run_ids)
+        Returns a summary of each run (best distance, number of generations and evaluations and mean timings)
+    close()
+        Closes the database connection
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            The path to the SQLite database file (created if it does not exist)
+        """
+        self.path = path
+        self.run_id = None
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript(schema)
+
+    def start_run(self, run_id, mode, seed, target_angle, settings=None):
+        """
+        Registers a run and records its generations from now on. A run that already exists (a resumed run) keeps its
+        start time and rows
+        """
+        self.run_id = run_id
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                                    (run_id, time.time(), mode, seed, target_angle, json.dumps(settings or {})))
+            self.connection.execute("UPDATE runs SET mode = ? WHERE run_id = ?", (mode, run_id))
+
+    def record_generation(self, generation, individuals, target_angle):
+        """
+        Writes all individuals of a generation (a snapshot of the pool in the steady-state mode) in a single
+        transaction, replacing any previously recorded rows of the generation
+        """
+        rows = [(self.run_id, generation, individual.pop_number, individual.gen_number, json.dumps(individual.rules),
+                 sentence_hash(individual.sentence), len(individual.sentence),
+                 individual.geometry_hash, individual.angle,
+                 abs(target_angle - individual.angle), individual.fitness or None, individual.ranking or None,
+                 individual.fidelity or None, individual.mesh, json.dumps(individual.timings))
+                for individual in individuals]
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM individuals WHERE run_id = ? AND generation = ?",
+                                    (self.run_id, generation))
+            self.connection.executemany("INSERT OR REPLACE INTO individuals VALUES "
+                                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def query(self, sql, parameters=()):
+        """
+        Returns the rows of a query as dictionaries
+        """
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(sql, parameters).fetchall()]
+
+    def runs(self):
+        """
+        Returns all recorded runs, from the oldest to the newest
+        """
+        return self.query("SELECT * FROM runs ORDER BY started")
+
+    def best_designs(self, limit=10, run_id=None):
+        """
+        Returns the distinct designs (by sentence) closest to the target angle, of the run or of all runs if no run is
+        provided. Estimated angles (surrogate predictions, bounds and rejected designs) are excluded
+        """
+        run_filter = "AND run_id = ?" if run_id is not None else ""
+        parameters = ((run_id,) if run_id is not None else ()) + estimated_fidelities + (limit,)
+        return self.query("SELECT run_id, sentence_hash, MIN(distance) AS distance, angle, fidelity, mesh, "
+                          "generation, pop_number, gen_number, rules, sentence_length, geometry_hash "
+                          "FROM individuals WHERE angle > 0 " + run_filter + " AND fidelity NOT IN (?, ?, ?) "
+                          "GROUP BY run_id, sentence_hash ORDER BY distance LIMIT ?", parameters)
+
+    def convergence(self, run_id=None):
+        """
+        Returns the best, mean and worst distance (and the mean angle) of each generation of the run (the current run
+        if not provided)
+        """
+        return self.query("SELECT generation, MIN(distance) AS best_distance, AVG(distance) AS mean_distance, "
+                          "MAX(distance) AS worst_distance, AVG(angle) AS mean_angle, COUNT(*) AS num_individuals "
+                          "FROM individuals WHERE run_id = ? GROUP BY generation ORDER BY generation",
+                          (run_id or self.run_id,))
+
+    def compare_runs(self, run_ids=None):
+        """
+        Returns a summary of each run (all runs if not provided): its settings, best distance, number of generations
+        and distinct designs, and the mean duration of each recorded phase
+        """
+        summaries = []
+        for run in self.runs():
+            if run_ids is not None and run["run_id"] not in run_ids:
+                continue
+            summary = self.query("SELECT MIN(distance) AS best_distance, COUNT(DISTINCT generation) AS "
+                                 "num_generations, COUNT(DISTINCT sentence_hash) AS num_designs FROM individuals "
+                                 "WHERE run_id = ?", (run["run_id"],))[0]
+            summary.update(run)
+            summary["settings"] = json.loads(run["settings"])
+
+            # The phase durations of each design (by sentence) are only counted once, survivors appear in several
+            # generations (under the numbers of each generation), therefore the row of its latest generation is used
+            # (SQLite takes the timings of a MAX() query from the row with the maximum)
+            durations = {}
+            for row in self.query("SELECT sentence_hash, MAX(generation) AS generation, timings FROM individuals "
+                                  "WHERE run_id = ? GROUP BY sentence_hash", (run["run_id"],)):
+                for phase, duration in json.loads(row["timings"] or "{}").items():
+                    durations.setdefault(phase, []).append(duration)
+            summary["mean_timings"] = {phase: sum(values) / len(values) for phase, values in durations.items()}
+            summaries.append(summary)
+        return summaries
+
+    def close(self):
+        """
+        Closes the database connection
+        """
+        with self.lock:
+            self.connection.close()
+
+
+if __name__ == '__main__':
+    # Prints a comparison of all runs and the best designs of a database (python run_database.py <database path>)
+    database = RunDatabase(sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "runs.sqlite"))
+    for summary in database.compare_runs():
+        print(summary["run_id"] + ": best distance " + str(summary["best_distance"]) + " after " +
+              str(summary["num_generations"]) + " generations (" + str(summary["num_designs"]) + " designs)")
+    for design in database.best_designs():
+        print(design["run_id"] + " Individual_" + str(design["pop_number"]) + "_" + str(design["gen_number"]) +
+              ": angle " + str(round(design["angle"], 2)) + " (" + str(design["fidelity"]) + ")")
+    database.close()
@@ -0,0 +1,130 @@
+# Jacques Terblanche
+# 22548602
+
+# Spool directory protocol between the evolution (client) and resident evaluation workers. The module is also run by
+# the Abaqus CAE server (Abaqus/Abaqus_server.py), therefore it remains compatible with Abaqus's Python 2 kernel.
+#
+# Layout of a spool directory:
+#   queue/<ticket>.job    Submitted jobs, each containing the absolute path of a job directory
+#   active/<ticket>.job   Jobs claimed by a worker (a ticket is claimed by moving it, which only one worker can do)
+#   done/<ticket>.json    Results posted by a worker ({"angle": float, "error": str or null})
+#   stop                  Workers exit (after their current job) once this file exists
+#
+# The stand-in worker (python spool.py <spool path>) speaks the same protocol and evaluates each job with the
+# analytical beam model, allowing the client to be used without Abaqus
+
+import os
+import sys
+import json
+import time
+import uuid
+import traceback
+
+
+def make_spool(path):
+    """
+    Creates the folders of a spool directory (if they do not exist) and removes a previous stop request
+    """
+    for name in ('queue', 'active', 'done'):
+        folder = os.path.join(path, name)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+    if os.path.exists(os.path.join(path, 'stop')):
+        os.remove(os.path.join(path, 'stop'))
+
+
+def write_atomic(path, folder, name, content):
+    """
+    Writes the content to a temporary file in the spool directory and then moves it into the folder, a reader
+    therefore never sees a partially written file
+    """
+    temp_path = os.path.join(path, name + '.tmp')
+    with open(temp_path, 'w') as f:
+        f.write(content)
+    os.rename(temp_path, os.path.join(path, folder, name))
+
+
+def submit(path, job_dir):
+    """
+    Submits a job directory to the spool and returns its ticket. Tickets start with the submission time (in
+    microseconds), therefore the jobs are claimed in the order in which they were submitted
+    """
+    ticket = '%017d' % int(time.time() * 1e6) + '_' + os.path.basename(os.path.normpath(job_dir)) + '_' + \
+        uuid.uuid4().hex[:8]
+    write_atomic(path, 'queue', ticket + '.job', os.path.abspath(job_dir))
+    return ticket
+
+
+def claim(path):
+    """
+    Claims the oldest submitted job and returns its ticket and job directory (None if no job is waiting)
+    """
+    queue = os.path.join(path, 'queue')
+    for name in sorted(os.listdir(queue)):
+        if not name.endswith('.job'):
+            continue
+        active_path = os.path.join(path, 'active', name)
+        # Another worker may claim (move) the same ticket first
+        try:
+            os.rename(os.path.join(queue, name), active_path)
+        except OSError:
+            continue
+        with open(active_path, 'r') as f:
+            job_dir = f.read().strip()
+        return name[:-len('.job')], job_dir
+    return None
+
+
+def post(path, ticket, angle, error=None):
+    """
+    Posts the result of a claimed job and releases its ticket
+    """
+    write_atomic(path, 'done', ticket + '.json', json.dumps({'angle': angle, 'error': error}))
+    active_path = os.path.join(path, 'active', ticket + '.job')
+    if os.path.exists(active_path):
+        os.remove(active_path)
+
+
+def collect(path, ticket):
+    """
+    Returns (and removes) the posted result of a ticket, or None if the job has not completed
+    """
+    done_path = os.path.join(path, 'done', ticket + '.json')
+    if not os.path.exists(done_path):
+        return None
+    with open(done_path, 'r') as f:
+        result = json.load(f)
+    os.remove(done_path)
+    return result
+
+
+def stop(path):
+    """
+    Requests all workers of the spool to exit after their current job
+    """
+    with open(os.path.join(path, 'stop'), 'w') as f:
+        f.write('stop')
+
+
+def serve(path, evaluate, poll=0.5):
+    """
+    Repeatedly claims jobs from the spool, evaluates them and posts their results until a stop is requested. A failed
+    evaluation is posted with a placeholder angle of 0 along with its error
+    """
+    while not os.path.exists(os.path.join(path, 'stop')):
+        job = claim(path)
+        if job is None:
+            time.sleep(poll)
+            continue
+        ticket, job_dir = job
+        try:
+            angle = evaluate(job_dir)
+            post(path, ticket, angle)
+        except Exception:
+            post(path, ticket, 0.0, traceback.format_exc())
+
+
+if __name__ == '__main__':
+    # Stand-in worker, evaluating each job with the analytical beam model
+    from beam_model import evaluate_analytical
+    serve(sys.argv[1], evaluate_analytical, poll=0.05)
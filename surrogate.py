@@ -0,0 +1,120 @@
+# Jacques Terblanche
+# 22548602
+
+import numpy as np
+
+
+class RidgeSurrogate:
+    """
+    A RidgeSurrogate class that predicts the bending angle of a cross-section from its geometric features, using a
+    ridge regression fitted on all previously solved designs
+
+    Attributes
+    ----------
+    alpha : float
+        The regularisation strength of the ridge regression
+    min_samples : int
+        The minimum number of solved designs before predictions are made
+    features : list
+        The feature vectors of all solved designs
+    angles : list
+        The FEM angles of all solved designs
+    weights : numpy.ndarray
+        The fitted regression weights (None if not fitted)
+
+    Methods
+    ----------
+    add(features, angle)
+        Adds a solved design to the training data
+    ready()
+        Determines if enough designs have been solved to make predictions
+    fit()
+        Fits the regression to all solved designs
+    predict(features)
+        Predicts the angles of the provided feature vectors
+    """
+
+    def __init__(self, alpha=1.0, min_samples=10):
+        """
+        Parameters
+        ----------
+        alpha : float, optional
+            The regularisation strength of the ridge regression (Default is 1.0)
+        min_samples : int, optional
+            The minimum number of solved designs before predictions are made (Default is 10)
+        """
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.features = []
+        self.angles = []
+        self.weights = None
+        self.mean = None
+        self.scale = None
+
+    def add(self, features, angle):
+        """
+        Adds a solved design to the training data
+        """
+        self.features.append(np.asarray(features, dtype=float))
+        self.angles.append(float(angle))
+
+    def ready(self):
+        """
+        Determines if enough designs have been solved to make predictions
+        """
+        return len(self.angles) >= self.min_samples
+
+    def fit(self):
+        """
+        Fits the ridge regression (on standardised features) to all solved designs
+        """
+        x = np.vstack(self.features)
+        y = np.asarray(self.angles)
+
+        # Features are standardised so that a single regularisation strength suits all features
+        self.mean = x.mean(axis=0)
+        self.scale = x.std(axis=0)
+        self.scale[self.scale == 0] = 1
+        x = np.hstack([np.ones((len(x), 1)), (x - self.mean) / self.scale])
+
+        # The intercept is not regularised
+        penalty = self.alpha * np.eye(x.shape[1])
+        penalty[0, 0] = 0
+        self.weights = np.linalg.solve(x.T.dot(x) + penalty, x.T.dot(y))
+
+    def predict(self, features):
+        """
+        Predicts the angles of the provided feature vectors
+        """
+        x = (np.atleast_2d(np.asarray(features, dtype=float)) - self.mean) / self.scale
+        return np.hstack([np.ones((len(x), 1)), x]).dot(self.weights)
+
+
+def extract_features(coords, target):
+    """
+    Determines the geometric features of an interpreted cross-section: the number of points, the enclosed area, the
+    wall height profile, the cavity width, the curvature and the joint height (all normalised by the target)
+    """
+    positions = np.asarray(coords, dtype=float)
+    width, height = float(target[0]), float(target[1])
+
+    # The wall height profile is the highest pixel of each column (every column is visited by the interpretation)
+    columns = np.clip(positions[:, 0].astype(int), 0, int(target[0]) - 1)
+    profile = np.zeros(int(target[0]))
+    np.maximum.at(profile, columns, positions[:, 1])
+    profile = profile / height
+
+    # Profile heights at evenly spaced positions along the half cross-section
+    samples = np.interp(np.linspace(0, 1, 5), np.linspace(0, 1, len(profile)), profile)
+    peak = profile.max()
+    # The cavity width is the fraction of the half width where the profile is above half of its peak
+    cavity_width = np.mean(profile > 0.5 * peak) if peak > 0 else 0.0
+
+    # The curvature is measured through the turning of consecutive steps and the second difference of the profile
+    steps = np.diff(positions, axis=0)
+    steps = steps[np.any(steps != 0, axis=1)]
+    turning = np.abs(np.diff(np.arctan2(steps[:, 1], steps[:, 0]))).mean() if len(steps) > 1 else 0.0
+    roughness = np.abs(np.diff(profile, 2)).mean() if len(profile) > 2 else 0.0
+
+    return np.hstack([[len(positions) / (width + height), profile.mean(), peak, cavity_width, turning, roughness,
+                       profile[-1]], samples])
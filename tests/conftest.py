@@ -0,0 +1,9 @@
+# Jacques Terblanche
+# 22548602
+
+# The modules are imported from the repository root (as main.py does)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
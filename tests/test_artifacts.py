@@ -0,0 +1,63 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the background artifact writer
+
+import os
+import threading
+import pytest
+from artifacts import ArtifactWriter
+
+
+def flush_within(writer, timeout=10):
+    """
+    Flushes the writer on another thread and returns the raised error (the writer fails the test if it does not
+    finish within the timeout)
+    """
+    outcome = {}
+
+    def target():
+        try:
+            writer.flush()
+        except Exception as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "flush did not return"
+    return outcome.get("error")
+
+
+def test_background_writes_are_combined(tmp_path):
+    writer = ArtifactWriter(background=True, max_pending=4, batch_size=3)
+    path = os.path.join(str(tmp_path), 'log.txt')
+    writer.write(path, "")
+    for k in range(20):
+        writer.append(path, str(k) + "\n")
+    writer.close()
+
+    with open(path, 'r') as f:
+        assert f.read() == "".join(str(k) + "\n" for k in range(20))
+
+
+def test_failed_write_is_raised_and_the_writer_continues(tmp_path):
+    writer = ArtifactWriter(background=True, max_pending=2, batch_size=1)
+    path = os.path.join(str(tmp_path), 'data.bin')
+
+    # A write that raises something other than an OSError (data that is not bytes)
+    writer.append(path, 12)
+    assert isinstance(flush_within(writer), TypeError)
+    assert flush_within(writer) is None
+
+    # The thread keeps performing the writes (more than the queue holds) after an error
+    writer.append(os.path.join(str(tmp_path), 'missing', 'data.bin'), b"x")
+    for k in range(5):
+        writer.append(path, b"y")
+    assert isinstance(flush_within(writer), OSError)
+    with open(path, 'rb') as f:
+        assert f.read() == b"yyyyy"
+
+    writer.append(path, [b"z"])
+    with pytest.raises(TypeError):
+        writer.close()
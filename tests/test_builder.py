@@ -0,0 +1,94 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the batched population builder
+
+import numpy as np
+from l_syst import Lsystem
+from builder import PopulationBuilder
+
+
+def test_worker_results_match_the_calling_process():
+    target = [80, 160]
+    existing = Lsystem("A", 7)
+    items = [("A", 1000 + k, None, None, target) for k in range(6)]
+    items.append(("A", 0, existing.rules, existing.sentence, target))
+
+    builder = PopulationBuilder(3, chunk_size=2)
+    builder.start()
+    try:
+        results = builder.build(items)
+    finally:
+        builder.close()
+    expected = PopulationBuilder().build(items)
+
+    for result, reference in zip(results, expected):
+        assert result["rules"] == reference["rules"]
+        assert result["sentence"] == reference["sentence"]
+        assert np.array_equal(result["positions"], reference["positions"])
+
+
+def test_individuals_are_not_rewritten():
+    target = [80, 160]
+    result = PopulationBuilder().build([("A", 1000, None, None, target)])[0]
+    individual = Lsystem("A", 1000)
+    assert result["sentence"] == individual.sentence and result["num_f"] == individual.num_f
+
+    # The individual is re-created from the worker's sentence (its rules are not analysed or applied again)
+    rebuilt = Lsystem("A", 1000, result["rules"], sentence=result["sentence"])
+    assert rebuilt.analysis is None
+    assert rebuilt.num_f == individual.num_f
+
+    # Existing individuals are only interpreted, their sentence is not returned
+    existing = PopulationBuilder().build([("A", 0, individual.rules, individual.sentence, target)])[0]
+    assert existing["sentence"] is None
+    assert np.array_equal(existing["positions"], result["positions"])
+
+
+def test_spawned_workers_build_bred_individuals():
+    target = [80, 160]
+    parent = Lsystem("A", 7)
+    items = [("A", 2000 + k, parent.rules[:k] + Lsystem("A", 9).rules[k:], None, target) for k in range(6)]
+
+    # Spawned workers import the modules again (as on Windows) rather than inheriting them
+    builder = PopulationBuilder(2, chunk_size=2, start_method="spawn")
+    builder.start()
+    try:
+        results = builder.build(items)
+    finally:
+        builder.close()
+
+    # A bred individual is generated from its rules (or its seed if the rules are not viable) in the worker
+    for (axiom, seed, rules, sentence, target), result in zip(items, results):
+        reference = Lsystem(axiom, seed, rules)
+        assert result["rules"] == reference.rules and result["sentence"] == reference.sentence
+
+
+def test_worker_spans_are_labelled_and_profiles_written(tmp_path):
+    import os
+    import glob
+    import json
+    import tracing
+    target = [80, 160]
+    parent = Lsystem("A", 7)
+    trace_path = os.path.join(str(tmp_path), 'trace.jsonl')
+    tracing.configure(trace_path, "rewriting", os.path.join(str(tmp_path), 'trace.prof'))
+    items = [("A", 3000 + k, list(parent.rules), None, target) for k in range(4)]
+    builder = PopulationBuilder(2, chunk_size=1, start_method="spawn")
+    try:
+        builder.start()
+        builder.build(items, pop_number=5)
+    finally:
+        builder.close()
+        tracing.configure()
+
+    # The spans of the workers carry the population and individual numbers of their work item
+    with open(trace_path, 'r') as f:
+        spans = [json.loads(line) for line in f]
+    rewriting = [span for span in spans if span["name"] == "rewriting"]
+    assert len(rewriting) >= 4 and all(span["pid"] != os.getpid() for span in rewriting)
+    assert all(span["args"]["pop_number"] == 5 for span in rewriting)
+    assert sorted(set(span["args"]["gen_number"] for span in rewriting)) == [0, 1, 2, 3]
+
+    # Each worker writes its profile when the pool is shut down
+    assert glob.glob(os.path.join(str(tmp_path), 'trace_*.prof'))
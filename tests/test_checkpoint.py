@@ -0,0 +1,80 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the checkpoint and its results journal
+
+import os
+import sys
+import subprocess
+import pytest
+from l_syst import Lsystem
+from evolve import Evolution
+from checkpoint import save_checkpoint
+from checkpoint import load_checkpoint
+from checkpoint import append_result
+from checkpoint import clear_results
+from checkpoint import load_results
+from checkpoint import results_path
+from checkpoint import individual_state
+
+
+def test_results_journal_round_trip(tmp_path):
+    path = os.path.join(str(tmp_path), 'checkpoint.json')
+    save_checkpoint(path, {"generation": 1})
+    assert load_checkpoint(path) == {"generation": 1}
+
+    individual = Lsystem("A", 1)
+    individual.pop_number, individual.gen_number = 1, 3
+    individual.angle, individual.fidelity, individual.mesh = 12.5, "fem", "fine"
+    append_result(path, individual)
+    individual.pop_number = 0
+    append_result(path, individual)
+    # An interrupted write leaves a partial last line
+    with open(results_path(path), 'a') as f:
+        f.write('{"generation": 1, "gen')
+
+    results = load_results(path, 1)
+    assert list(results) == [3]
+    assert results[3]["angle"] == 12.5 and results[3]["mesh"] == "fine"
+
+    clear_results(path)
+    assert load_results(path, 1) == {}
+
+
+def test_steady_state_rejects_checkpoints(tmp_path):
+    evo = Evolution(2, 1, [80, 160], 40, "A", 0.1, 0.2, render_mode="off",
+                    checkpoint_path=os.path.join(str(tmp_path), 'checkpoint.json'))
+    with pytest.raises(ValueError):
+        evo.evolve_steady_state(4)
+
+
+def test_journal_survives_an_abrupt_exit(tmp_path):
+    # The process exits (without draining the background artifact writer) right after the result is journaled
+    path = os.path.join(str(tmp_path), 'checkpoint.json')
+    script = ("import os, sys, artifacts\n"
+              "from l_syst import Lsystem\n"
+              "from checkpoint import append_result\n"
+              "artifacts.configure(True)\n"
+              "individual = Lsystem('A', 1)\n"
+              "individual.pop_number, individual.gen_number, individual.angle = 2, 5, 30.0\n"
+              "append_result(sys.argv[1], individual)\n"
+              "os._exit(1)\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, path], cwd=root)
+
+    assert load_results(path, 2)[5]["angle"] == 30.0
+
+
+def test_restore_does_not_rewrite(tmp_path, monkeypatch):
+    evo = Evolution(2, 1, [80, 160], 40, "A", 0.1, 0.2, render_mode="off")
+    individual = Lsystem("A", 7)
+    individual.angle, individual.fidelity, individual.mesh = 35.0, "fem", "fine"
+    state = individual_state(individual)
+
+    def rewrite(*args):
+        raise AssertionError("the rules were applied again")
+
+    monkeypatch.setattr(Lsystem, "generate", rewrite)
+    restored = evo.restore_individual(state)
+    assert restored.sentence == individual.sentence and restored.rules == individual.rules
+    assert restored.angle == 35.0 and restored.coords
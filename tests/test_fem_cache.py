@@ -0,0 +1,70 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the eviction and concurrent use of the FEM result cache
+
+import os
+import time
+import threading
+import fem_cache
+from fem_cache import ResultCache
+
+
+def test_age_is_measured_from_when_the_result_was_stored(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_age=60)
+    now = time.time()
+    monkeypatch.setattr(fem_cache.time, "time", lambda: now - 120)
+    cache.put("old", 10.0)
+    monkeypatch.setattr(fem_cache.time, "time", lambda: now)
+    cache.put("new", 20.0)
+
+    # A recently accessed result is still evicted once it is too old
+    assert cache.get("old") == 10.0
+    cache.evict()
+    assert cache.get("old") is None
+    assert cache.get("new") == 20.0
+
+
+def test_least_recently_used_results_are_evicted_above_the_limit(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    for k, key in enumerate(["a", "b", "c"]):
+        cache.put(key, float(k))
+        os.utime(os.path.join(str(tmp_path), key + ".json"), (1000 + k, 1000 + k))
+
+    # Reading the first result makes the second the least recently used
+    assert cache.get("a") == 0.0
+    cache.evict()
+    assert cache.get("b") is None
+    assert cache.get("a") == 0.0 and cache.get("c") == 2.0
+
+
+def test_concurrent_puts_and_gets_never_see_partial_results(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=5)
+    keys = ["key" + str(k) for k in range(10)]
+    errors = []
+
+    def writer():
+        for repeat in range(20):
+            for k, key in enumerate(keys):
+                cache.put(key, float(k))
+
+    def reader():
+        for repeat in range(20):
+            for k, key in enumerate(keys):
+                angle = cache.get(key)
+                # A result is either missing (not yet written or evicted) or complete
+                if angle is not None and angle != float(k):
+                    errors.append((key, angle))
+            cache.evict()
+
+    threads = [threading.Thread(target=writer) for _ in range(2)] + [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    # No temporary files are left behind, and the size limit holds once the cache is evicted
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+    cache.evict()
+    assert len(os.listdir(str(tmp_path))) == 5
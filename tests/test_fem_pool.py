@@ -0,0 +1,138 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the concurrent FEM evaluations, using a stand-in solver in place of Abaqus
+
+import os
+import sys
+import json
+import pytest
+import evolve
+from fem_pool import EvaluationPool
+from fem_results import read_angle
+
+
+def stub_solver(job_dir):
+    """
+    Writes the number of points of the job's design as its angle, except for designs with a single point, for which
+    nothing is written (identical to Abaqus failing to start)
+    """
+    with open(os.path.join(job_dir, 'input_data.json'), 'r', encoding='utf-8') as f:
+        coords = json.load(f)
+    if len(coords) > 1:
+        with open(os.path.join(job_dir, 'angle.txt'), 'w') as f:
+            f.write(str(float(len(coords))))
+    return read_angle(job_dir)
+
+
+def make_pool(tmp_path, num_workers):
+    parameters_path = os.path.join(str(tmp_path), 'input_parameters.json')
+    with open(parameters_path, 'w', encoding='utf-8') as f:
+        json.dump([20, 1.4, 8, 6, 3, 0.04, 9810.0], f)
+    return EvaluationPool(stub_solver, num_workers, os.path.join(str(tmp_path), 'Jobs'), parameters_path)
+
+
+def test_results_are_returned_in_job_order(tmp_path):
+    pool = make_pool(tmp_path, 3)
+    job_dirs = [pool.job_dir(0, k, [[0, 0]] * (k + 2)) for k in range(6)]
+    completed = []
+    angles = pool.run(job_dirs, lambda index, angle: completed.append(index))
+
+    assert angles == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    assert sorted(completed) == list(range(6))
+    # Every job has its own directory with its own copy of the parameters
+    assert len(set(job_dirs)) == 6
+    for path in job_dirs:
+        assert os.path.exists(os.path.join(path, 'input_parameters.json'))
+
+
+def test_job_without_results_is_failed_without_stopping_the_generation(tmp_path):
+    for num_workers in (1, 2):
+        pool = make_pool(tmp_path, num_workers)
+        job_dirs = [pool.job_dir(0, 0, [[0, 0], [1, 0]]), pool.job_dir(0, 1, [[0, 0]]),
+                    pool.job_dir(0, 2, [[0, 0], [1, 0], [1, 1]])]
+
+        assert pool.run(job_dirs) == [2.0, 0.0, 3.0]
+
+
+def test_job_directory_is_cleared_and_mesh_settings_appended(tmp_path):
+    pool = make_pool(tmp_path, 1)
+    path = pool.job_dir(1, 0, [[0, 0]])
+    with open(os.path.join(path, 'angle.txt'), 'w') as f:
+        f.write("12.0")
+
+    # A stale result of a previous run is never read
+    path = pool.job_dir(1, 0, [[0, 0]], mesh_settings=(1.0, 0.5))
+    assert not os.path.exists(os.path.join(path, 'angle.txt'))
+    assert read_angle(path) == 0.0
+    with open(os.path.join(path, 'input_parameters.json'), 'r', encoding='utf-8') as f:
+        assert json.load(f)[7:] == [1.0, 0.5]
+
+
+def test_lean_output_is_only_requested_by_the_pool(tmp_path):
+    pool = make_pool(tmp_path, 1)
+    with open(os.path.join(pool.job_dir(1, 0, [[0, 0]]), 'input_parameters.json'), 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 7
+
+    # Jobs without mesh settings keep the script's own mesh settings
+    pool.lean_output = True
+    with open(os.path.join(pool.job_dir(1, 0, [[0, 0]]), 'input_parameters.json'), 'r', encoding='utf-8') as f:
+        assert json.load(f)[7:] == [None, None, True]
+    path = pool.job_dir(1, 1, [[0, 0]], mesh_settings=(1.0, 0.5))
+    with open(os.path.join(path, 'input_parameters.json'), 'r', encoding='utf-8') as f:
+        assert json.load(f)[7:] == [1.0, 0.5, True]
+
+
+def test_incomplete_or_unreadable_trajectory_is_a_failed_job(tmp_path):
+    pool = make_pool(tmp_path, 1)
+    path = pool.job_dir(1, 0, [[0, 0]])
+    with open(os.path.join(path, 'angle.txt'), 'w') as f:
+        f.write("0")
+
+    # A solve that did not complete is failed, unless it was aborted with a bound of its final angle
+    trajectory = {'time': [0.5, 1.5], 'angle': [2.0, 25.0], 'step': ['Gravity', 'Pressure'], 'completed': False}
+    with open(os.path.join(path, 'trajectory.json'), 'w') as f:
+        json.dump(trajectory, f)
+    assert read_angle(path) == 0.0
+    trajectory['bound'] = {'angle': 31.0, 'side': 'upper', 'load_fraction': 0.5}
+    with open(os.path.join(path, 'trajectory.json'), 'w') as f:
+        json.dump(trajectory, f)
+    assert read_angle(path) == 31.0
+
+    # A truncated trajectory falls back to angle.txt
+    with open(os.path.join(path, 'trajectory.json'), 'w') as f:
+        f.write('{"time": [0.5, 1.5], "angle": [2.0')
+    assert read_angle(path) == 0.0
+
+
+stub_abaqus = """#!{python}
+# Stand-in for the abaqus command: records its arguments and writes the number of points of the design as its angle
+import sys
+import json
+with open('arguments.json', 'w') as f:
+    json.dump(sys.argv[1:], f)
+with open('input_data.json', 'r') as f:
+    coords = json.load(f)
+with open('angle.txt', 'w') as f:
+    f.write(str(float(len(coords))))
+"""
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="the stand-in abaqus command is a POSIX script")
+def test_jobs_are_solved_through_the_abaqus_command(tmp_path, monkeypatch):
+    bin_path = os.path.join(str(tmp_path), 'bin')
+    os.makedirs(bin_path)
+    with open(os.path.join(bin_path, 'abaqus'), 'w') as f:
+        f.write(stub_abaqus.format(python=sys.executable))
+    os.chmod(os.path.join(bin_path, 'abaqus'), 0o755)
+    monkeypatch.setenv('PATH', bin_path + os.pathsep + os.environ.get('PATH', ''))
+
+    pool = make_pool(tmp_path, 2)
+    pool.evaluator = evolve.evaluate
+    job_dirs = [pool.job_dir(0, k, [[0, 0]] * (k + 2)) for k in range(3)]
+
+    assert pool.run(job_dirs) == [2.0, 3.0, 4.0]
+    # Every job started Abaqus CAE (without its GUI) on the FEM script within its own directory
+    for path in job_dirs:
+        with open(os.path.join(path, 'arguments.json'), 'r') as f:
+            assert json.load(f) == ['cae', '-noGUI', os.path.join(evolve.abs_file_path, 'Abaqus_script.py')]
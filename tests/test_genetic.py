@@ -0,0 +1,24 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the ranking of evaluated individuals
+
+from genetic import rank
+from l_syst import Lsystem
+
+
+def evaluated(angle, fidelity="fem"):
+    individual = Lsystem("A", 1)
+    individual.angle = angle
+    individual.fidelity = fidelity
+    return individual
+
+
+def test_infeasible_designs_are_ranked_last():
+    # The placeholder angle of an infeasible design would otherwise be closer to a small target than any solved design
+    individuals = [evaluated(0.0, "infeasible"), evaluated(30.0), evaluated(12.0), evaluated(0.0)]
+    ranked = rank(list(individuals), 5.0)
+
+    assert ranked == [individuals[3], individuals[2], individuals[1], individuals[0]]
+    assert ranked[0].fitness > ranked[-1].fitness
+    assert abs(sum(individual.fitness for individual in ranked) - 1) < 1e-9
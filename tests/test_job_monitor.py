@@ -0,0 +1,114 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the early abort of FEM jobs (job_monitor.py), where a fake .sta file is written as the job progresses
+
+import os
+import pytest
+from job_monitor import JobMonitor
+from job_monitor import predict_angle
+from job_monitor import write_settings
+from job_monitor import read_settings
+
+sta_header = (" SUMMARY OF JOB INFORMATION:\n"
+              " STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF\n"
+              "               DISCON ITERS ITERS  TIME/      TIME/LPF   TIME/LPF     MONITOR RIKS\n"
+              "                                   FREQ\n"
+              "   1     1   1     0     3     3  1.00       1.00       1.000\n")
+
+
+def sta_line(increment, step_time, attempt='1'):
+    """Returns the .sta line of an increment of the Pressure step (step 2)"""
+    return ("   2 " + str(increment).rjust(5) + " " + attempt.rjust(3) + "     0     4     4  " +
+            str(1 + step_time) + "       " + str(step_time) + "      0.1000\n")
+
+
+class FakeJob:
+    """A job whose .sta file and recorded angles are written by the test, increment by increment"""
+
+    def __init__(self, job_dir, angle):
+        self.job_dir = job_dir
+        self.angle = angle
+        self.samples = []
+        self.killed = False
+        with open(os.path.join(job_dir, 'Job-1.sta'), 'w') as f:
+            f.write(sta_header)
+
+    def converge(self, increment, step_time):
+        self.samples.append((step_time, self.angle(step_time)))
+        self.write(sta_line(increment, step_time))
+
+    def write(self, text):
+        with open(os.path.join(self.job_dir, 'Job-1.sta'), 'a') as f:
+            f.write(text)
+
+    def read_angles(self):
+        return list(self.samples)
+
+    def kill(self):
+        self.killed = True
+
+
+def test_predict_angle():
+    # A linear growth is extrapolated exactly, and completed or non-growing samples are returned as they are
+    assert predict_angle([(0.1, 2.0), (0.3, 6.0)]) == pytest.approx(20.0)
+    assert predict_angle([(0.5, 10.0), (1.0, 30.0)]) == 30.0
+    assert predict_angle([(0.1, 5.0), (0.3, 5.0)]) == 5.0
+
+    # A quadratic growth is fitted through the last two samples, the exponent is limited to [1, max_exponent]
+    quadratic = [(f, 40.0 * f ** 2) for f in (0.1, 0.2, 0.4)]
+    assert predict_angle(quadratic) > predict_angle(quadratic[::2])
+    assert predict_angle(quadratic, max_exponent=1.0) == predict_angle(quadratic[::2])
+
+    # The angle cannot exceed 90 degrees
+    assert predict_angle([(0.1, 10.0), (0.2, 30.0)]) == 90.0
+
+
+def test_settings(tmp_path):
+    assert read_settings(str(tmp_path)) is None
+    write_settings(str(tmp_path), 60.0, 10.0)
+    settings = read_settings(str(tmp_path))
+    assert settings['target_angle'] == 60.0 and settings['worst_distance'] == 10.0
+    # The monitor is imported by Abaqus_script.py from the recorded folder
+    assert os.path.exists(os.path.join(settings['monitor_path'], 'job_monitor.py'))
+
+
+def test_short_job_is_bounded_from_above(tmp_path):
+    job = FakeJob(str(tmp_path), lambda fraction: 20.0 * fraction)
+    monitor = JobMonitor(str(tmp_path), {'target_angle': 60.0, 'worst_distance': 10.0}, job.read_angles, poll=0)
+
+    # Nothing is decided before min_fraction of the load has been applied
+    job.converge(1, 0.1)
+    assert monitor.check() is None
+    # Attempts that were cut back and partially written lines are not converged increments
+    job.write(sta_line(2, 0.3, attempt='1U'))
+    job.write(sta_line(2, 0.3)[:20])
+    assert monitor.check() is None
+    assert len(monitor.increments) == 2
+
+    job.samples.append((0.3, 6.0))
+    job.write(sta_line(2, 0.3)[20:])
+    bound = monitor.check()
+    assert bound == {'angle': pytest.approx(20.0), 'side': 'upper', 'load_fraction': 0.3}
+
+
+def test_overshooting_job_is_killed(tmp_path):
+    job = FakeJob(str(tmp_path), lambda fraction: 150.0 * fraction)
+    monitor = JobMonitor(str(tmp_path), {'target_angle': 30.0, 'worst_distance': 5.0}, job.read_angles, poll=0)
+    job.converge(1, 0.1)
+    job.converge(2, 0.25)
+
+    assert monitor.watch(job.kill) == {'angle': 37.5, 'side': 'lower', 'load_fraction': 0.25}
+    assert job.killed and monitor.bound['side'] == 'lower'
+
+
+def test_promising_job_completes(tmp_path):
+    job = FakeJob(str(tmp_path), lambda fraction: 60.0 * fraction)
+    monitor = JobMonitor(str(tmp_path), {'target_angle': 55.0, 'worst_distance': 10.0}, job.read_angles, poll=0)
+    for increment, fraction in enumerate((0.1, 0.3, 0.6, 1.0)):
+        job.converge(increment + 1, fraction)
+        assert monitor.check() is None
+    job.write(" THE ANALYSIS HAS COMPLETED SUCCESSFULLY\n")
+
+    assert monitor.watch(job.kill) is None
+    assert not job.killed and monitor.status == 'completed' and monitor.bound is None
@@ -0,0 +1,56 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the symbolic rule analysis and the sentence budget
+
+from l_syst import Lsystem
+from l_syst import RuleAnalysis
+from l_syst import get_repeated
+from l_syst import repeated_length
+
+
+def matched_depth(sentence):
+    """
+    Returns the nesting depth of the matched curly brackets of a sentence (the brackets that are repeated)
+    """
+    stack = []
+    events = []
+    for i, c in enumerate(sentence):
+        if c == "{":
+            stack.append(i)
+        elif c == "}" and stack:
+            events += [(stack.pop(), 1), (i, -1)]
+    depth = 0
+    level = 0
+    for _, change in sorted(events):
+        level += change
+        depth = max(depth, level)
+    return depth
+
+
+def test_analysis_matches_the_built_sentence():
+    for seed in range(200):
+        individual = Lsystem("A", seed)
+        analysis = RuleAnalysis(individual.rules, "A", 7)
+        assert analysis.length + 1 == len(individual.sentence)
+        assert analysis.count("F") + 1 == individual.sentence.count("F")
+        assert analysis.depth >= matched_depth(individual.sentence)
+        assert analysis.repeated_bound(3) + 1 >= repeated_length(individual.sentence, 3)
+
+
+def test_repeated_length_bounds_the_repeated_sentence():
+    for sentence in ["F", "{F}", "F{F{FF}}+", "}{F}{", "{{}F}", "{F}{F}"]:
+        assert repeated_length(sentence, 3) >= len(get_repeated(sentence, 3))
+    assert repeated_length("F{F{FF}}+", 3) == len(get_repeated("F{F{FF}}+", 3)) == 1 + 3 + 18 + 1
+
+
+def test_budget_applies_to_the_repeated_sentence():
+    # Rules whose repeated sentence exceeds the budget are re-generated, even if the sentence itself is within it
+    rules = [["A", "{AF}"], ["B", "F"], ["C", "F"], ["D", "F"], ["E", "F"], ["G", "F"]]
+    assert len(Lsystem("A", 1, [list(rule) for rule in rules]).sentence) < 100
+    individual = Lsystem("A", 1, [list(rule) for rule in rules], max_length=1000)
+    assert individual.rules != rules
+    assert repeated_length(individual.sentence, 3) <= 1000
+
+    individual = Lsystem("A", 1, [list(rule) for rule in rules], max_depth=3)
+    assert individual.analysis.depth <= 3
@@ -0,0 +1,77 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the mesh schedule, where a stand-in solver records the mesh level of every job in place of Abaqus
+
+import os
+import json
+import evolve
+from evolve import Evolution
+from evolve import mesh_levels
+from fem_pool import EvaluationPool
+
+
+def make_evolution(tmp_path, monkeypatch, mesh_schedule):
+    """
+    Returns an evolution whose FEM jobs are solved by a stand-in solver, which writes the number of points of the
+    design as its angle, together with the list of (generation, individual, mesh level) of each solved job
+    """
+    # The coordinate archive is kept out of the repository's storage folder
+    monkeypatch.setattr(evolve, "abs_storage_path", str(tmp_path))
+    jobs = []
+
+    def stub_solver(job_dir):
+        with open(os.path.join(job_dir, 'input_data.json'), 'r', encoding='utf-8') as f:
+            coords = json.load(f)
+        with open(os.path.join(job_dir, 'input_parameters.json'), 'r', encoding='utf-8') as f:
+            settings = json.load(f)[7:]
+        level = [name for name in mesh_levels if mesh_levels[name] == settings][0]
+        pop_number, gen_number = os.path.basename(job_dir)[len("Individual"):].split("_")
+        jobs.append((int(pop_number), int(gen_number), level))
+        return float(len(coords))
+
+    evo = Evolution(3, 1, [80, 160], 40, "A", 0.4, 0.2, render_mode="off", mesh_schedule=mesh_schedule)
+    parameters_path = os.path.join(str(tmp_path), 'input_parameters.json')
+    with open(parameters_path, 'w', encoding='utf-8') as f:
+        json.dump([20, 1.4, 8, 6, 3, 0.04, 9810.0], f)
+    evo.pool = EvaluationPool(stub_solver, 1, os.path.join(str(tmp_path), 'Jobs'), parameters_path)
+    return evo, jobs
+
+
+def levels(jobs, pop_number):
+    return [level for generation, gen_number, level in jobs if generation == pop_number]
+
+
+def test_survivors_are_escalated_to_the_full_mesh(tmp_path, monkeypatch):
+    evo, jobs = make_evolution(tmp_path, monkeypatch, ["coarse", "coarse", "fine"])
+    individuals = evo.generate_initial_population(5, "A", 1, evo.target, evo.renderer, evo.builder)
+    generation = evo.evaluate_pop_fitness(individuals, evo.target, 0)
+    assert levels(jobs, 0) == ["coarse"] * 5
+    assert all(individual.mesh == "coarse" for individual in generation)
+
+    # The elite individuals (2 of 5) survive, and are solved again at the full level, while the new individuals of
+    # the generation are solved at the scheduled level
+    next_gen = evo.generate_next_gen(generation, 1)
+    survivors = [individual for individual in next_gen if individual.survivor]
+    assert survivors == generation[:2]
+    next_gen = evo.evaluate_pop_fitness(next_gen, evo.target, 1)
+    assert sorted(levels(jobs, 1)) == ["coarse"] * (5 - len(survivors)) + ["fine"] * len(survivors)
+    assert all(individual.mesh == "fine" for individual in survivors)
+
+    # Survivors already solved at the full level are not solved again, the new individuals are solved at the full
+    # level once the schedule reaches it
+    third_gen = evo.generate_next_gen(next_gen, 2)
+    new = [individual for individual in third_gen if not individual.survivor or individual.mesh != "fine"]
+    evo.evaluate_pop_fitness(third_gen, evo.target, 2)
+    assert levels(jobs, 2) == ["fine"] * len(new)
+
+
+def test_default_schedule_solves_every_job_at_the_full_mesh(tmp_path, monkeypatch):
+    evo, jobs = make_evolution(tmp_path, monkeypatch, None)
+    individuals = evo.generate_initial_population(5, "A", 1, evo.target, evo.renderer, evo.builder)
+    generation = evo.evaluate_pop_fitness(individuals, evo.target, 0)
+    evo.evaluate_pop_fitness(evo.generate_next_gen(generation, 1), evo.target, 1)
+
+    assert set(level for pop_number, gen_number, level in jobs) == {"fine"}
+    # Survivors keep their result of the full level
+    assert len(levels(jobs, 1)) < 5
@@ -0,0 +1,115 @@
+# Jacques Terblanche
+# 22548602
+
+# Tests of the spool protocol and the SpoolClient, using the stand-in worker (python spool.py <spool path>)
+
+import os
+import sys
+import json
+import time
+import pytest
+import spool
+from fem_pool import SpoolClient
+from fem_pool import EvaluationPool
+from beam_model import estimate_angle
+from evolve import Evolution
+
+spool_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spool.py')
+worker_command = '"' + sys.executable + '" "' + spool_script + '"'
+parameters = [20, 1.4, 8, 6, 3, 0.04, 9810.0]
+designs = [[[0, 0], [0, 4], [2, 6], [4, 6], [6, 4], [6, 0]],
+           [[0, 0], [0, 3], [3, 5], [6, 3], [6, 0]],
+           [[0, 0], [0, 6], [6, 6], [6, 0]]]
+
+
+def make_pool(tmp_path, client, num_workers):
+    parameters_path = os.path.join(str(tmp_path), 'input_parameters.json')
+    with open(parameters_path, 'w', encoding='utf-8') as f:
+        json.dump(parameters, f)
+    return EvaluationPool(client, num_workers, os.path.join(str(tmp_path), 'Jobs'), parameters_path)
+
+
+def spool_files(path):
+    return {name: sorted(os.listdir(os.path.join(path, name))) for name in ('queue', 'active', 'done')}
+
+
+def test_round_trip_on_stand_in_workers(tmp_path):
+    path = os.path.join(str(tmp_path), 'Spool')
+    client = SpoolClient(path, poll=0.02, timeout=60)
+    pool = make_pool(tmp_path, client, 2)
+    client.start(2, worker_command)
+    try:
+        job_dirs = [pool.job_dir(0, k, design) for k, design in enumerate(designs)]
+        angles = pool.run(job_dirs)
+    finally:
+        client.close()
+
+    assert angles == pytest.approx([estimate_angle(design, parameters) for design in designs])
+    # Every ticket has been claimed, posted and collected, and the workers exited on the stop request
+    assert spool_files(path) == {'queue': [], 'active': [], 'done': []}
+    assert os.path.exists(os.path.join(path, 'stop'))
+    assert client.processes == []
+
+
+def test_claim_post_collect(tmp_path):
+    path = os.path.join(str(tmp_path), 'Spool')
+    spool.make_spool(path)
+    first = spool.submit(path, os.path.join(str(tmp_path), 'Individual0_0'))
+    time.sleep(0.001)
+    second = spool.submit(path, os.path.join(str(tmp_path), 'Individual0_1'))
+
+    # Jobs are claimed in submission order, and a claimed job moves from the queue to the active folder
+    ticket, job_dir = spool.claim(path)
+    assert ticket == first and job_dir.endswith('Individual0_0')
+    assert spool_files(path) == {'queue': [second + '.job'], 'active': [first + '.job'], 'done': []}
+
+    assert spool.collect(path, first) is None
+    spool.post(path, first, 12.5)
+    assert spool_files(path)['active'] == []
+    assert spool.collect(path, first) == {'angle': 12.5, 'error': None}
+    assert spool.collect(path, first) is None
+
+    # A worker started after the stop request exits without claiming the remaining job
+    spool.stop(path)
+    spool.serve(path, lambda job_dir: 0.0)
+    assert spool_files(path)['queue'] == [second + '.job']
+
+
+def test_failed_evaluation_is_posted_with_its_error(tmp_path):
+    path = os.path.join(str(tmp_path), 'Spool')
+    spool.make_spool(path)
+    ticket = spool.submit(path, os.path.join(str(tmp_path), 'missing'))
+
+    def evaluate(job_dir):
+        # The stop request is made during the job, the worker exits once the job's result is posted
+        spool.stop(path)
+        raise IOError("no input data")
+
+    spool.serve(path, evaluate, poll=0.01)
+    result = spool.collect(path, ticket)
+    assert result['angle'] == 0.0 and 'no input data' in result['error']
+
+
+def test_timeout_withdraws_unclaimed_job(tmp_path):
+    client = SpoolClient(os.path.join(str(tmp_path), 'Spool'), poll=0.01, timeout=0.05)
+    pool = make_pool(tmp_path, client, 1)
+
+    # No worker is running, therefore the job is never claimed
+    assert pool.run([pool.job_dir(0, 0, designs[0])]) == [0.0]
+    assert spool_files(client.path) == {'queue': [], 'active': [], 'done': []}
+
+
+def test_exited_workers_fail_the_job(tmp_path):
+    client = SpoolClient(os.path.join(str(tmp_path), 'Spool'), poll=0.01)
+    pool = make_pool(tmp_path, client, 1)
+    # The workers exit immediately (e.g. after a license failure)
+    client.start(2, '"' + sys.executable + '" -c "import sys; sys.exit(1)"')
+
+    assert pool.run([pool.job_dir(0, 0, designs[0])]) == [0.0]
+    client.close()
+
+
+def test_resident_workers_require_the_fem_tier():
+    # The resident workers run Abaqus_script.py, which would silently replace the analytical evaluator
+    with pytest.raises(ValueError):
+        Evolution(2, 1, [80, 160], 40, "A", 0.1, 0.2, render_mode="off", fidelity="analytical", use_server=True)
@@ -0,0 +1,203 @@
+# Jacques Terblanche
+# 22548602
+
+import os
+import json
+import time
+import cProfile
+import threading
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    A Tracer class that records the duration of each phase of an individual's lifecycle (or of a generation) as a
+    span. Spans are written as JSON lines, where each line is a complete Chrome trace event (see chrome_trace).
+
+    Attributes
+    ----------
+    path : str
+        The absolute path to the JSON lines file to which spans are appended (None if tracing is disabled)
+    profile_phase : str
+        The phase that is profiled with cProfile (None if no phase is profiled)
+    profile_path : str
+        The absolute path to which the profile statistics of profile_phase are written
+    profiler : cProfile.Profile
+        The profiler of profile_phase (None if no phase is profiled)
+
+    Methods
+    ----------
+    span(phase, **args)
+        Context manager that records the enclosed code as a span of the phase
+    record(phase, start, end, **args)
+        Records a span that was timed elsewhere (e.g. within Abaqus)
+    context(**args)
+        Context manager that adds the provided arguments (e.g. pop_number and gen_number) to all spans of the thread
+    write(line)
+        Appends a line to the trace file
+    close()
+        Writes the profile statistics and closes the trace file
+    """
+
+    def __init__(self, path=None, profile_phase=None, profile_path=None):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            The path to the JSON lines file to which spans are appended (Default is no tracing)
+        profile_phase : str, optional
+            The phase that is profiled with cProfile (Default is no profiling)
+        profile_path : str, optional
+            The path to which the profile statistics are written (Default is the trace path with a .prof extension)
+        """
+        self.path = os.path.abspath(path) if path else None
+        self.profile_phase = profile_phase
+        self.profile_path = profile_path
+        if profile_path is None and self.path is not None:
+            self.profile_path = os.path.splitext(self.path)[0] + '.prof'
+        self.profiler = cProfile.Profile() if profile_phase else None
+
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.profile_lock = threading.Lock()
+        self.file = None
+        self.pid = None
+
+    @contextmanager
+    def span(self, phase, **args):
+        """
+        Records the enclosed code as a span of the phase (nothing is recorded if tracing is disabled)
+        """
+        if self.path is None and self.profiler is None:
+            yield
+            return
+
+        # Only a single thread can be profiled at once (the other threads' spans of the phase are not profiled)
+        profiling = False
+        if phase == self.profile_phase and self.profile_lock.acquire(blocking=False):
+            profiling = True
+            self.profiler.enable()
+        start = time.time()
+        try:
+            yield
+        finally:
+            end = time.time()
+            if profiling:
+                self.profiler.disable()
+                self.profile_lock.release()
+            self.record(phase, start, end, **args)
+
+    def record(self, phase, start, end, **args):
+        """
+        Records a span of the phase from start to end (in seconds since the epoch)
+        """
+        if self.path is None:
+            return
+        event_args = dict(getattr(self.local, 'args', {}))
+        event_args.update(args)
+        event = {"name": phase,
+                 "ph": "X",
+                 "ts": round(start * 1e6),
+                 "dur": round((end - start) * 1e6),
+                 "pid": os.getpid(),
+                 "tid": threading.get_ident(),
+                 "args": event_args}
+        self.write(json.dumps(event) + '\n')
+
+    @contextmanager
+    def context(self, **args):
+        """
+        Adds the provided arguments to all spans recorded by the current thread within the context
+        """
+        previous = getattr(self.local, 'args', {})
+        self.local.args = dict(previous, **args)
+        try:
+            yield
+        finally:
+            self.local.args = previous
+
+    def write(self, line):
+        """
+        Appends a line to the trace file. Every process (e.g. the population builder's workers) opens its own
+        handle, and each line is written and flushed in a single call
+        """
+        with self.lock:
+            if self.file is None or self.pid != os.getpid():
+                self.file = open(self.path, 'a', encoding='utf-8')
+                self.pid = os.getpid()
+            self.file.write(line)
+            self.file.flush()
+
+    def close(self):
+        """
+        Writes the profile statistics (if a phase was profiled) and closes the trace file
+        """
+        if self.profiler is not None and self.profile_path is not None:
+            self.profiler.dump_stats(self.profile_path)
+        if self.file is not None and self.pid == os.getpid():
+            self.file.close()
+        self.file = None
+
+
+def chrome_trace(path, output_path):
+    """
+    Converts a JSON lines trace into the Chrome trace format (viewable in chrome://tracing or Perfetto)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def configure(path=None, profile_phase=None, profile_path=None):
+    """
+    Replaces the tracer used by all modules and returns it
+    """
+    global tracer
+    tracer.close()
+    tracer = Tracer(path, profile_phase, profile_path)
+    return tracer
+
+
+def configure_worker(path=None, profile_phase=None, profile_path=None):
+    """
+    Replaces the tracer of a worker process (e.g. of the population builder), which traces to the same file as the
+    calling process. The tracer inherited by a forked worker is not closed (it belongs to the calling process). The
+    worker's profile is written to a file of its own (the profile path with the worker's process id appended) when
+    the worker exits, i.e. when its pool is shut down
+    """
+    global tracer
+    from multiprocessing.util import Finalize
+    if profile_phase and profile_path is None and path:
+        profile_path = os.path.splitext(os.path.abspath(path))[0] + '.prof'
+    if profile_path is not None:
+        stem, extension = os.path.splitext(profile_path)
+        profile_path = stem + '_' + str(os.getpid()) + extension
+    tracer = Tracer(path, profile_phase, profile_path)
+    # Finalizers with an exit priority are run by a worker process once its target (the pool's worker loop) returns
+    Finalize(tracer, tracer.close, exitpriority=10)
+
+
+def span(phase, **args):
+    """
+    Records the enclosed code as a span of the phase using the configured tracer
+    """
+    return tracer.span(phase, **args)
+
+
+def record(phase, start, end, **args):
+    """
+    Records a span that was timed elsewhere using the configured tracer
+    """
+    tracer.record(phase, start, end, **args)
+
+
+def context(**args):
+    """
+    Adds the provided arguments to all spans of the current thread using the configured tracer
+    """
+    return tracer.context(**args)
+
+
+# The tracer used by all modules (disabled until configured)
+tracer = Tracer()